@@ -15,87 +15,28 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import io
-import altair as alt
+from credittracker import core, derived, export, importer, schema, search, table
 
 st.set_page_config(page_title="Credit & Tradeline Manager", layout="wide")
 
 # --------------------------- Demo data ---------------------------
 @st.cache_data
 def load_demo_data():
-    today = pd.Timestamp(datetime.now().date())
-    demo = pd.DataFrame([
-        {
-            "id": 1,
-            "account_name": "Chase Sapphire Preferred",
-            "type": "Credit Card",
-            "balance": 450.00,
-            "credit_limit": 5000.00,
-            "payment_date": (today + pd.Timedelta(days=7)).strftime('%Y-%m-%d'),
-            "reporting_date": (today - pd.Timedelta(days=8)).strftime('%Y-%m-%d'),
-            "points": 12000,
-            "interest_rate": 20.24,
-            "status": "Open",
-            "notes": "Rotating travel card"
-        },
-        {
-            "id": 2,
-            "account_name": "Citi Double Cash",
-            "type": "Credit Card",
-            "balance": 1200.50,
-            "credit_limit": 6000.00,
-            "payment_date": (today + pd.Timedelta(days=20)).strftime('%Y-%m-%d'),
-            "reporting_date": (today - pd.Timedelta(days=22)).strftime('%Y-%m-%d'),
-            "points": 2400,
-            "interest_rate": 18.99,
-            "status": "Open",
-            "notes": "Cashback card"
-        },
-        {
-            "id": 3,
-            "account_name": "Auto Loan - Wells Fargo",
-            "type": "Installment",
-            "balance": 9500.00,
-            "credit_limit": 9500.00,
-            "payment_date": (today + pd.Timedelta(days=15)).strftime('%Y-%m-%d'),
-            "reporting_date": (today - pd.Timedelta(days=30)).strftime('%Y-%m-%d'),
-            "points": 0,
-            "interest_rate": 6.5,
-            "status": "Open",
-            "notes": "60-month loan"
-        },
-    ])
-    return demo
-
-# --------------------------- Utilities ---------------------------
-
-def calculate_utilization(balance, limit):
-    try:
-        return round((float(balance) / float(limit)) * 100, 2) if float(limit) > 0 else np.nan
-    except Exception:
-        return np.nan
-
-
-def days_until(date_str):
-    try:
-        d = pd.to_datetime(date_str).normalize()
-        return (d - pd.Timestamp(datetime.now().date())).days
-    except Exception:
-        return None
-
-
-def days_since(date_str):
-    try:
-        d = pd.to_datetime(date_str).normalize()
-        return (pd.Timestamp(datetime.now().date()) - d).days
-    except Exception:
-        return None
+    return core.load_simple_demo_data()
 
 # --------------------------- Data management ---------------------------
 
+def reset_accounts():
+    st.session_state.accounts = table.AccountTable(load_demo_data(), id_column='id')
+    st.session_state.df = st.session_state.accounts.frame
+    # Kept current by the add, edit, delete and import paths
+    st.session_state.search_index = search.SearchIndex.from_frame(st.session_state.df, search.SIMPLE_SEARCH_FIELDS)
+    # Bumped on every write; downloads are built on click and cached per version
+    st.session_state.data_version = 0
+    st.session_state.export_cache = export.ExportCache()
+
 if 'df' not in st.session_state:
-    st.session_state.df = load_demo_data()
-    st.session_state.next_id = int(st.session_state.df['id'].max()) + 1
+    reset_accounts()
 
 # Sidebar controls
 with st.sidebar:
@@ -106,14 +47,13 @@ with st.sidebar:
     df_stats = st.session_state.df.copy()
     total_balance = df_stats['balance'].sum()
     total_limit = df_stats['credit_limit'].sum()
-    avg_util = calculate_utilization(total_balance, total_limit)
+    avg_util = core.calculate_utilization(total_balance, total_limit, empty=np.nan)
     st.metric("Total balance", f"${total_balance:,.2f}")
     st.metric("Total limit", f"${total_limit:,.2f}")
     st.metric("Avg utilization", f"{avg_util}%")
     st.markdown("---")
     if st.button("Reset demo data"):
-        st.session_state.df = load_demo_data()
-        st.session_state.next_id = int(st.session_state.df['id'].max()) + 1
+        reset_accounts()
         st.success("Demo data restored")
 
 # --------------------------- Import CSV ---------------------------
@@ -123,13 +63,20 @@ if action == "Import CSV":
     uploaded = st.file_uploader("Upload CSV", type=['csv'])
     if uploaded is not None:
         try:
-            new = pd.read_csv(uploaded)
-            # ensure id
-            if 'id' not in new.columns:
-                new.insert(0, 'id', range(st.session_state.next_id, st.session_state.next_id + len(new)))
-                st.session_state.next_id += len(new)
-            st.session_state.df = pd.concat([st.session_state.df, new], ignore_index=True)
-            st.success("CSV imported")
+            progress_bar = st.progress(0.0, text="Importing...")
+            def append_chunk(chunk):
+                # imported rows always get fresh ids so the id index stays unique
+                st.session_state.search_index.add(st.session_state.accounts.insert(chunk))
+                st.session_state.data_version += 1
+
+            result = importer.stream_csv(uploaded, append_chunk, importer.SIMPLE_SCHEMA,
+                                         total_bytes=uploaded.size,
+                                         progress=lambda fraction, r: progress_bar.progress(fraction or 0.0))
+            st.session_state.df = st.session_state.accounts.frame
+            st.success(f"CSV imported: {result.accepted} rows")
+            if result.rejected:
+                st.warning(f"{result.rejected} rows rejected")
+                st.dataframe(result.rejected_rows)
         except Exception as e:
             st.error(f"CSV import failed: {e}")
 
@@ -150,20 +97,21 @@ elif action == "Add Account":
         submitted = st.form_submit_button("Add account")
         if submitted:
             new_row = {
-                'id': st.session_state.next_id,
                 'account_name': name,
                 'type': acc_type,
                 'balance': float(balance),
                 'credit_limit': float(credit_limit),
-                'payment_date': pd.to_datetime(payment_date).strftime('%Y-%m-%d'),
-                'reporting_date': pd.to_datetime(reporting_date).strftime('%Y-%m-%d'),
+                'payment_date': schema.to_date(payment_date),
+                'reporting_date': schema.to_date(reporting_date),
                 'points': int(points),
                 'interest_rate': float(interest_rate),
                 'status': status,
                 'notes': notes
             }
-            st.session_state.next_id += 1
-            st.session_state.df = pd.concat([st.session_state.df, pd.DataFrame([new_row])], ignore_index=True)
+            inserted = st.session_state.accounts.insert(schema.parse_dates(pd.DataFrame([new_row]), schema.SIMPLE_DATE_COLUMNS))
+            st.session_state.search_index.add(inserted)
+            st.session_state.data_version += 1
+            st.session_state.df = st.session_state.accounts.frame
             st.success("Account added")
 
 # --------------------------- View / Filter ---------------------------
@@ -172,20 +120,20 @@ else:
     df = st.session_state.df.copy()
 
     # Derived columns
-    df['utilization_%'] = df.apply(lambda r: calculate_utilization(r['balance'], r['credit_limit']), axis=1)
-    df['days_until_payment'] = df['payment_date'].apply(days_until)
-    df['days_since_reporting'] = df['reporting_date'].apply(days_since)
+    df['utilization_%'] = derived.utilization(df['balance'], df['credit_limit'], empty=np.nan)
+    df['days_until_payment'] = derived.days_until(df['payment_date'])
+    df['days_since_reporting'] = derived.days_since(df['reporting_date'])
 
     # Filters
     with st.expander("Filters", expanded=True):
         cols = st.columns(4)
-        name_filter = cols[0].text_input("Search name")
+        name_filter = cols[0].text_input("Search name or notes", help="Every word must match; typos are tolerated")
         type_filter = cols[1].multiselect("Type", options=df['type'].unique().tolist(), default=df['type'].unique().tolist())
         status_filter = cols[2].multiselect("Status", options=df['status'].unique().tolist(), default=df['status'].unique().tolist())
         util_max = cols[3].slider("Max utilization %", min_value=0, max_value=200, value=100)
 
     if name_filter:
-        df = df[df['account_name'].str.contains(name_filter, case=False, na=False)]
+        df = df[st.session_state.search_index.matches(name_filter, df['id'])]
     df = df[df['type'].isin(type_filter) & df['status'].isin(status_filter)]
     df = df[df['utilization_%'] <= util_max]
 
@@ -199,18 +147,17 @@ else:
         st.markdown("---")
         st.subheader("Edit / Delete an account")
         edit_id = st.number_input("Account ID to edit/delete (use table 'id')", min_value=int(df['id'].min()), value=int(df['id'].min()))
-        selected = st.session_state.df[st.session_state.df['id'] == edit_id]
-        if selected.empty:
+        if edit_id not in st.session_state.accounts:
             st.warning("No account found with that ID")
         else:
-            r = selected.iloc[0]
+            r = st.session_state.accounts.get(edit_id)
             with st.form("edit_form"):
                 name = st.text_input("Account name", value=r['account_name'])
                 acc_type = st.selectbox("Type", ["Credit Card", "Installment", "Charge Card", "Store Card", "Other"], index=0 if r['type']=="Credit Card" else 1)
                 balance = st.number_input("Balance", min_value=0.0, value=float(r['balance']), format="%.2f")
                 credit_limit = st.number_input("Credit limit", min_value=0.0, value=float(r['credit_limit']), format="%.2f")
-                payment_date = st.date_input("Next payment date", value=pd.to_datetime(r['payment_date']).date())
-                reporting_date = st.date_input("Last reporting date", value=pd.to_datetime(r['reporting_date']).date())
+                payment_date = st.date_input("Next payment date", value=r['payment_date'].date())
+                reporting_date = st.date_input("Last reporting date", value=r['reporting_date'].date())
                 points = st.number_input("Points / Rewards", min_value=0, value=int(r['points']))
                 interest_rate = st.number_input("Interest rate (APR)", min_value=0.0, value=float(r['interest_rate']), format="%.2f")
                 status = st.selectbox("Status", ["Open", "Closed", "Frozen", "Charge-off"], index=0 if r['status']=="Open" else 1)
@@ -218,20 +165,25 @@ else:
                 update = st.form_submit_button("Save changes")
                 delete = st.form_submit_button("Delete account")
                 if update:
-                    idx = st.session_state.df[st.session_state.df['id'] == edit_id].index[0]
-                    st.session_state.df.at[idx, 'account_name'] = name
-                    st.session_state.df.at[idx, 'type'] = acc_type
-                    st.session_state.df.at[idx, 'balance'] = float(balance)
-                    st.session_state.df.at[idx, 'credit_limit'] = float(credit_limit)
-                    st.session_state.df.at[idx, 'payment_date'] = pd.to_datetime(payment_date).strftime('%Y-%m-%d')
-                    st.session_state.df.at[idx, 'reporting_date'] = pd.to_datetime(reporting_date).strftime('%Y-%m-%d')
-                    st.session_state.df.at[idx, 'points'] = int(points)
-                    st.session_state.df.at[idx, 'interest_rate'] = float(interest_rate)
-                    st.session_state.df.at[idx, 'status'] = status
-                    st.session_state.df.at[idx, 'notes'] = notes
+                    old_row, new_row = st.session_state.accounts.update(edit_id, {
+                        'account_name': name,
+                        'type': acc_type,
+                        'balance': float(balance),
+                        'credit_limit': float(credit_limit),
+                        'payment_date': schema.to_date(payment_date),
+                        'reporting_date': schema.to_date(reporting_date),
+                        'points': int(points),
+                        'interest_rate': float(interest_rate),
+                        'status': status,
+                        'notes': notes,
+                    })
+                    st.session_state.search_index.replace(old_row, new_row)
+                    st.session_state.data_version += 1
                     st.success("Account updated")
                 if delete:
-                    st.session_state.df = st.session_state.df[st.session_state.df['id'] != edit_id].reset_index(drop=True)
+                    st.session_state.search_index.remove(st.session_state.accounts.delete(edit_id))
+                    st.session_state.data_version += 1
+                    st.session_state.df = st.session_state.accounts.frame
                     st.success("Account deleted")
 
     with right:
@@ -239,6 +191,7 @@ else:
         # Utilization bar
         chart_df = df.copy()
         if not chart_df.empty:
+            import altair as alt  # only loaded once there is a chart to draw
             chart_df = chart_df.nlargest(10, 'utilization_%')
             bar = alt.Chart(chart_df).mark_bar().encode(
                 x=alt.X('utilization_%:Q', title='Utilization %'),
@@ -265,16 +218,18 @@ else:
     # Export
     st.markdown("---")
     st.subheader("Export / Download")
-    csv_buf = io.StringIO()
-    st.session_state.df.to_csv(csv_buf, index=False)
-    st.download_button("Download full CSV", data=csv_buf.getvalue(), file_name="accounts_export.csv", mime='text/csv')
+    export_format = st.selectbox("Format", export.available_formats(), format_func=lambda fmt: export.FORMATS[fmt][0])
+    st.download_button("Download all accounts",
+                       data=st.session_state.export_cache.deferred('full', export_format, st.session_state.data_version,
+                                                                   st.session_state.df),
+                       file_name=export.file_name("accounts_export", export_format), mime=export.mime(export_format))
 
     # Quick calculations and tips
     st.markdown("---")
     st.subheader("Quick calculations")
     tot_bal = st.session_state.df['balance'].sum()
     tot_limit = st.session_state.df['credit_limit'].sum()
-    tot_util = calculate_utilization(tot_bal, tot_limit)
+    tot_util = core.calculate_utilization(tot_bal, tot_limit, empty=np.nan)
     st.write(f"Total balance: ${tot_bal:,.2f}")
     st.write(f"Total credit limit: ${tot_limit:,.2f}")
     st.write(f"Aggregate utilization: {tot_util}%")
@@ -1,14 +1,25 @@
+import os
+import threading
+import time
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
-import io
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from credittracker import aggregates, alerts, core, derived, export, figures, forecast, history, importer, ledger, optimizer, paging, payoff, portfolios, profiling, schedule, schema, search, storage, table
+
+run_started = time.perf_counter()
 
 # Page configuration
 st.set_page_config(page_title="Credit & Trade Line Manager Pro", layout="wide", page_icon="💳")
 
+# Section timings for every rerun; the debug panel at the bottom shows them
+# (open the app with ?debug=1 or set CREDITTRACKER_DEBUG=1)
+if 'profiler' not in st.session_state:
+    st.session_state.profiler = profiling.Profiler()
+profiler = st.session_state.profiler
+profiler.start_run(run_started)
+profiler.mark('page_setup')
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -86,148 +97,257 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize session state for data with comprehensive demo data
-if 'accounts' not in st.session_state:
-    st.session_state.accounts = pd.DataFrame({
-        'Account Name': [
-            'Chase Sapphire Reserve',
-            'American Express Gold',
-            'Capital One Venture X',
-            'Citi Double Cash',
-            'Discover It Cash Back',
-            'Bank of America Premium Rewards',
-            'Wells Fargo Active Cash',
-            'Auto Loan - Toyota Camry',
-            'Home Mortgage - Primary',
-            'Personal Loan - Consolidation',
-            'Chase Freedom Unlimited',
-            'Apple Card',
-            'Amazon Prime Visa',
-            'Target RedCard',
-            'Best Buy Credit Card'
-        ],
-        'Account Type': [
-            'Credit Card', 'Credit Card', 'Credit Card', 'Credit Card', 'Credit Card',
-            'Credit Card', 'Credit Card', 'Installment Loan', 'Mortgage', 'Personal Loan',
-            'Credit Card', 'Credit Card', 'Credit Card', 'Credit Card', 'Credit Card'
-        ],
-        'Institution': [
-            'Chase Bank', 'American Express', 'Capital One', 'Citibank', 'Discover',
-            'Bank of America', 'Wells Fargo', 'Toyota Financial', 'Quicken Loans', 'SoFi',
-            'Chase Bank', 'Goldman Sachs', 'Chase Bank', 'TD Bank', 'Citibank'
-        ],
-        'Credit Limit': [10000, 15000, 10000, 8000, 5000, 12000, 7500, 28000, 350000, 25000, 6000, 4000, 8500, 3000, 5000],
-        'Current Balance': [2500, 4200, 3500, 1200, 800, 5500, 1100, 15600, 287000, 18500, 1800, 650, 2100, 450, 1200],
-        'Statement Balance': [2800, 4500, 3800, 1350, 950, 5800, 1250, 15600, 287000, 18500, 2000, 750, 2300, 500, 1350],
-        'Minimum Payment': [84, 135, 105, 40, 29, 165, 35, 485, 1847, 567, 60, 25, 69, 25, 38],
-        'Due Date': [
-            '2025-11-05', '2025-11-10', '2025-11-08', '2025-11-15', '2025-11-12',
-            '2025-11-07', '2025-11-20', '2025-11-01', '2025-11-01', '2025-11-05',
-            '2025-11-18', '2025-11-22', '2025-11-14', '2025-11-25', '2025-11-28'
-        ],
-        'Statement Date': [
-            '2025-10-15', '2025-10-20', '2025-10-18', '2025-10-25', '2025-10-22',
-            '2025-10-17', '2025-10-30', '2025-10-01', '2025-10-01', '2025-10-05',
-            '2025-10-28', '2025-11-01', '2025-10-24', '2025-11-05', '2025-11-08'
-        ],
-        'Reporting Date': [
-            '2025-10-20', '2025-10-25', '2025-10-23', '2025-10-28', '2025-10-27',
-            '2025-10-22', '2025-11-02', '2025-10-05', '2025-10-05', '2025-10-08',
-            '2025-11-01', '2025-11-04', '2025-10-28', '2025-11-08', '2025-11-11'
-        ],
-        'Last Payment Date': [
-            '2025-09-28', '2025-10-05', '2025-10-02', '2025-09-20', '2025-09-25',
-            '2025-09-30', '2025-10-10', '2025-10-01', '2025-10-01', '2025-10-01',
-            '2025-10-08', '2025-10-15', '2025-10-05', '2025-10-12', '2025-10-18'
-        ],
-        'Last Payment Amount': [3200, 4100, 3900, 1500, 1100, 6000, 1400, 485, 1847, 567, 2200, 800, 2500, 600, 1400],
-        'APR': [19.99, 21.24, 18.99, 15.99, 14.99, 17.49, 16.99, 4.29, 3.75, 9.99, 18.24, 13.99, 16.49, 24.99, 22.49],
-        'Rewards Points': [45000, 82000, 38000, 0, 12500, 28000, 0, 0, 0, 0, 18000, 4200, 15000, 2800, 6500],
-        'Points Value': [0.015, 0.012, 0.020, 0.0, 0.010, 0.010, 0.0, 0.0, 0.0, 0.0, 0.015, 0.010, 0.010, 0.010, 0.010],
-        'Annual Fee': [550, 250, 395, 0, 0, 95, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        'Status': ['Active'] * 15,
-        'Open Date': [
-            '2020-03-15', '2019-06-22', '2021-08-05', '2018-11-10', '2017-05-18',
-            '2022-01-20', '2023-03-12', '2023-02-10', '2018-07-15', '2022-09-01',
-            '2019-12-03', '2021-09-20', '2020-06-08', '2016-04-25', '2019-10-30'
-        ],
-        'Account Number': [
-            '****1234', '****5678', '****9012', '****3456', '****7890',
-            '****2345', '****6789', '****0123', '****4567', '****8901',
-            '****2468', '****1357', '****9753', '****1593', '****7531'
-        ],
-        'Credit Bureau': [
-            'All 3', 'All 3', 'All 3', 'All 3', 'All 3',
-            'All 3', 'All 3', 'All 3', 'All 3', 'All 3',
-            'All 3', 'All 3', 'All 3', 'All 3', 'All 3'
-        ],
-        'Payment History': [
-            '100%', '100%', '100%', '98%', '100%',
-            '100%', '100%', '100%', '100%', '100%',
-            '100%', '97%', '100%', '95%', '100%'
-        ],
-        'Account Age (Months)': [
-            68, 76, 50, 84, 101,
-            46, 31, 32, 87, 37,
-            70, 49, 64, 114, 72
-        ],
-        'Autopay Enabled': [
-            'Yes', 'Yes', 'Yes', 'No', 'Yes',
-            'Yes', 'No', 'Yes', 'Yes', 'Yes',
-            'No', 'Yes', 'Yes', 'No', 'No'
-        ],
-        'Cashback Rate': [
-            '0%', '0%', '0%', '2%', '5% rotating',
-            '1.5-2.5%', '2%', '0%', '0%', '0%',
-            '1.5%', '2% Apple/3% Apple', '3% Amazon', '5% Target', '5-6% Best Buy'
-        ],
-        'Notes': [
-            'Primary travel card, TSA PreCheck credit',
-            'Excellent for dining, 4x at restaurants',
-            'New travel card with lounge access',
-            'Simple cashback, no annual fee',
-            'Rotating categories, good for groceries',
-            'Premium banking rewards card',
-            'Simple 2% cashback on everything',
-            '60-month loan, excellent rate',
-            '30-year fixed, refinanced 2021',
-            'Debt consolidation, 5-year term',
-            'Everyday spending card',
-            'Apple purchases and Apple Pay bonus',
-            'Amazon Prime benefits included',
-            'Store card, occasional promotions',
-            'Store card for electronics'
-        ]
-    })
-
-# Calculate utilization
-def calculate_utilization(balance, limit):
-    if limit > 0:
-        return round((balance / limit) * 100, 2)
-    return 0
-
-# Calculate credit age
-def calculate_age_years(open_date):
+profiler.mark('load_book')
+# Multi-portfolio mode: CREDITTRACKER_PORTFOLIOS is a store URL template such as
+# sqlite:///books/{portfolio}.db, one book per client. Each portfolio is loaded once
+# per process and its frame shared by every session viewing it. Without it there is
+# a single book (CREDITTRACKER_STORE, defaulting to in-memory) as before; a persistent
+# one is loaded and shared the same way, an in-memory one is each session's own.
+portfolio_template = os.environ.get('CREDITTRACKER_PORTFOLIOS')
+
+# Account store shared by every session in this process (set CREDITTRACKER_STORE
+# to sqlite:///... or parquet:///... to persist; defaults to in-memory)
+@st.cache_resource
+def get_account_store(portfolio_id=None):
+    if portfolio_id is None:
+        return storage.open_store(os.environ.get('CREDITTRACKER_STORE'))
+    return storage.open_store(portfolios.store_url(portfolio_template, portfolio_id))
+
+def add_derived_columns(accounts):
+    # Add utilization column
+    accounts['Utilization %'] = derived.utilization(accounts['Current Balance'], accounts['Credit Limit'])
+    
+    # Calculate points value in dollars
+    accounts['Points Dollar Value'] = derived.points_dollar_value(accounts['Rewards Points'], accounts['Points Value'])
+    return accounts
+
+def load_portfolio(portfolio_id):
+    store = get_account_store(portfolio_id)
+    accounts = store.load()
+    if accounts is None:
+        accounts = core.load_demo_data()
+        store.replace(accounts)
+    return add_derived_columns(accounts)
+
+# LRU of loaded portfolios, capped by count and memory (CREDITTRACKER_CACHE_PORTFOLIOS,
+# CREDITTRACKER_CACHE_MB)
+@st.cache_resource
+def get_portfolio_cache():
+    return portfolios.PortfolioCache(
+        load_portfolio,
+        max_portfolios=int(os.environ.get('CREDITTRACKER_CACHE_PORTFOLIOS', portfolios.DEFAULT_MAX_PORTFOLIOS)),
+        max_bytes=int(os.environ.get('CREDITTRACKER_CACHE_MB', portfolios.DEFAULT_MAX_BYTES // 2**20)) * 2**20,
+    )
+
+def reset_session_book():
+    # Drop everything built from the current book so the next run reloads it
+    for key in ('accounts', 'totals', 'account_table', 'ledger', 'search_index', 'data_version',
+                'published_version', 'portfolio_version', 'figure_cache', 'export_cache', 'history_version',
+                'forecast', 'payoff', 'payment_calendar', 'memory_report', 'last_import', 'ledger_mismatch'):
+        st.session_state.pop(key, None)
+
+def reload_after_conflict(error, saved=False):
+    # The store refused a write because another session changed the same accounts (or,
+    # with saved=True, the write was stored but another session published first); drop
+    # this session's copy and start again from what the store holds
+    st.session_state['store_conflict'] = (str(error), saved)
+    if shared_book:
+        portfolio_cache.evict(portfolio_id)
+    reset_session_book()
+    st.rerun()
+
+def save_row(account_id, old_row, new_row):
+    # The balance is written as an increment, so payments from two sessions on the same
+    # account both count; if the stored result shows another session's change too, the
+    # write stands and the book is reloaded to show both
+    change = float(new_row['Current Balance'] - old_row['Current Balance'])
     try:
-        open = pd.to_datetime(open_date)
-        today = pd.Timestamp.now()
-        return round((today - open).days / 365.25, 1)
-    except:
-        return 0
-
-# Add utilization column
-st.session_state.accounts['Utilization %'] = st.session_state.accounts.apply(
-    lambda row: calculate_utilization(row['Current Balance'], row['Credit Limit']), axis=1
-)
+        stored = account_store.update(account_id, new_row, increments={'Current Balance': change})
+    except storage.ConflictError as e:
+        reload_after_conflict(e)
+    st.session_state.ledger.save()
+    if not np.isclose(stored['Current Balance'], new_row['Current Balance']):
+        reload_after_conflict(storage.ConflictError(f"Account {account_id}'s balance was also changed by "
+                                                    f"another session"), saved=True)
+
+def payment_form(idx, row, state_key, form_key):
+    # Shown under an account when its Pay button sets state_key; the All Accounts list
+    # and the Payment Calendar each have their own, since the list is paginated
+    if not st.session_state.get(state_key, False):
+        return
+    st.markdown("---")
+    st.markdown("**💳 Record Payment**")
+    with st.form(key=form_key):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            payment_amount = st.number_input("Payment Amount", min_value=0.0, 
+                                            value=float(row['Minimum Payment']), step=10.0)
+        with col2:
+            payment_date = st.date_input("Payment Date", value=datetime.now())
+        with col3:
+            payment_type = st.selectbox("Payment Type", ["Minimum Payment", "Statement Balance", "Full Balance", "Custom"])
 
-# Calculate points value in dollars
-st.session_state.accounts['Points Dollar Value'] = st.session_state.accounts['Rewards Points'] * st.session_state.accounts['Points Value']
+        if st.form_submit_button("💾 Record Payment"):
+            new_balance = row['Current Balance'] - payment_amount
+            # Overpayments stop at a zero balance
+            applied = max(0.0, min(payment_amount, row['Current Balance']))
+            payment_ledger.record(idx, 'payment', -applied, schema.to_date(payment_date))
+            old_row, new_row = account_table.update(idx, {
+                'Current Balance': row['Current Balance'] - applied,
+                'Last Payment Date': schema.to_date(payment_date),
+                'Last Payment Amount': payment_amount,
+                'Utilization %': core.calculate_utilization(row['Current Balance'] - applied, row['Credit Limit']),
+            })
+            totals.replace(old_row, new_row)
+            search_index.replace(old_row, new_row)
+            st.session_state.data_version += 1
+            st.session_state.accounts = account_table.frame
+            save_row(idx, old_row, new_row)
+            st.session_state[state_key] = False
+            st.success(f"Payment of ${payment_amount:.2f} recorded! New balance: ${new_balance:.2f}")
+            st.rerun()
 
+portfolio_id = None
+if portfolio_template:
+    portfolio_id = st.sidebar.text_input("📁 Portfolio", value=st.query_params.get('portfolio', 'default'),
+                                         key='portfolio_input').strip()
+    if not portfolios.PORTFOLIO_ID.match(portfolio_id):
+        st.sidebar.error("Portfolio ids may only contain letters, digits, '-' and '_'.")
+        st.stop()
+    st.query_params['portfolio'] = portfolio_id
+    if st.session_state.get('portfolio_id') != portfolio_id:
+        reset_session_book()
+        st.session_state.portfolio_id = portfolio_id
+
+account_store = get_account_store(portfolio_id)
+
+# Sessions hold a reference to the book's cached frame and copy it on their first edit,
+# so memory does not grow with the number of sessions viewing it
+shared_book = bool(portfolio_template) or account_store.persistent
+if shared_book:
+    portfolio_cache = get_portfolio_cache()
+
+# Serializes loading and reconciling the stored ledger events, so two sessions starting
+# at once do not both record opening events for the same accounts
+@st.cache_resource
+def get_ledger_lock(portfolio_id=None):
+    return threading.Lock()
+
+# Daily balance history, also process-wide (CREDITTRACKER_HISTORY=parquet:///... to persist;
+# in multi-portfolio mode it is kept per portfolio and the URL may contain {portfolio})
+@st.cache_resource
+def get_history_store(portfolio_id=None):
+    url = os.environ.get('CREDITTRACKER_HISTORY')
+    if url and portfolio_id is not None:
+        url = portfolios.store_url(url if '{portfolio}' in url else url.rstrip('/') + '/{portfolio}', portfolio_id)
+    return history.open_history(url)
+
+if shared_book:
+    history_store = get_history_store(portfolio_id)
+else:
+    # Otherwise every session has its own in-memory demo book, keyed by the same
+    # account ids, so its history is kept with the session rather than shared
+    if 'history_store' not in st.session_state:
+        st.session_state.history_store = history.open_history()
+    history_store = st.session_state.history_store
+
+if shared_book and 'account_table' in st.session_state:
+    if st.session_state.data_version != st.session_state.published_version:
+        # Hand this session's writes to the other sessions; its table copies again on the next edit
+        st.session_state.accounts = st.session_state.account_table.frame
+        try:
+            st.session_state.portfolio_version = portfolio_cache.publish(
+                portfolio_id, st.session_state.accounts, st.session_state.portfolio_version)
+        except storage.ConflictError as e:
+            reload_after_conflict(e, saved=True)
+        st.session_state.account_table.mark_shared()
+        st.session_state.published_version = st.session_state.data_version
+    elif portfolio_cache.version(portfolio_id) not in (None, st.session_state.portfolio_version):
+        # Another session has published a newer version of this book
+        reset_session_book()
+
+# Load the persisted book once per session
+if 'accounts' not in st.session_state:
+    if shared_book:
+        st.session_state.accounts, st.session_state.portfolio_version = portfolio_cache.get(portfolio_id)
+    else:
+        st.session_state.accounts = account_store.load()
+
+# Initialize session state for data with comprehensive demo data
+if st.session_state.accounts is None:
+    st.session_state.accounts = core.load_demo_data()
+    account_store.replace(st.session_state.accounts)
+
+# Derived columns, running totals and the search index are built once per session;
+# the add, edit, payment, delete and import paths keep them up to date from then on
+if 'totals' not in st.session_state:
+    if not shared_book:
+        with profiler.span('derived_columns'):
+            add_derived_columns(st.session_state.accounts)
+    
+    st.session_state.totals = aggregates.PortfolioTotals.from_frame(st.session_state.accounts)
+    # Writes go through the id-keyed table; st.session_state.accounts is its current frame.
+    # A shared portfolio frame is copied by the table on its first edit.
+    st.session_state.account_table = table.AccountTable(st.session_state.accounts, shared=shared_book,
+                                                        allocate_ids=account_store.next_ids)
+    # Balance changes are recorded as events and written to the store as the same increments.
+    # Events are saved in the account store and replayed here (from its latest snapshot), so
+    # payment history survives a reload; stored balances that disagree with them are reported.
+    with get_ledger_lock(portfolio_id):
+        st.session_state.ledger = ledger.Ledger.load(account_store)
+        st.session_state.ledger_mismatch = st.session_state.ledger.reconcile(st.session_state.account_table.frame)
+        st.session_state.ledger.save()
+    with profiler.span('search_index'):
+        st.session_state.search_index = search.SearchIndex.from_frame(st.session_state.accounts)
+    # Bumped on every write; cached figures are keyed on it
+    st.session_state.data_version = 0
+    st.session_state.published_version = 0
+    st.session_state.figure_cache = figures.FigureCache(maxsize=32)
+    # Export files are only built when a download is clicked, then reused until the data changes
+    st.session_state.export_cache = export.ExportCache()
+
+totals = st.session_state.totals
+account_table = st.session_state.account_table
+payment_ledger = st.session_state.ledger
+search_index = st.session_state.search_index
+figure_cache = st.session_state.figure_cache
+export_cache = st.session_state.export_cache
+
+profiler.mark('history_snapshot')
+# Today's snapshot is taken on load and on the first run of each day, and rewritten after
+# writes at most every CREDITTRACKER_HISTORY_EVERY seconds, so a burst of edits costs one
+# snapshot rather than one per rerun
+history_every = pd.Timedelta(seconds=float(os.environ.get('CREDITTRACKER_HISTORY_EVERY', 60)))
+snapshot_now = pd.Timestamp.now()
+recorded_version, recorded_at = st.session_state.get('history_version', (None, None))
+if (recorded_at is None or recorded_at.normalize() != snapshot_now.normalize()
+        or (recorded_version != st.session_state.data_version and snapshot_now - recorded_at >= history_every)):
+    history_store.record_snapshot(st.session_state.accounts, snapshot_now)
+    st.session_state.history_version = (st.session_state.data_version, snapshot_now)
+
+profiler.mark('header_sidebar')
 # Title and description
 st.title("💳 Credit & Trade Line Manager Pro")
 st.markdown("**Comprehensive credit account tracking with payment scheduling, reporting dates, and rewards optimization**")
 st.divider()
 
+if 'store_conflict' in st.session_state:
+    conflict, saved = st.session_state.pop('store_conflict')
+    if saved:
+        st.info(f"ℹ️ Another session changed this book at the same time. Your last change was saved and the "
+                f"book has been reloaded with both sessions' changes. ({conflict})")
+    else:
+        st.warning(f"⚠️ Another session changed these accounts, so your last change was not saved. The book has "
+                   f"been reloaded; please make the change again. ({conflict})")
+
+ledger_mismatch = st.session_state.ledger_mismatch
+if len(ledger_mismatch):
+    st.warning(f"⚠️ {len(ledger_mismatch):,} stored balances differ from their payment ledger, which can mean a "
+               f"write was lost. They are shown as stored; check them against your statements.")
+    with st.expander("Balances that differ from the ledger"):
+        st.dataframe(ledger_mismatch.join(st.session_state.accounts['Account Name']).rename(columns=str.title),
+                     use_container_width=True)
+
 # Sidebar for navigation and quick actions
 with st.sidebar:
     st.header("⚙️ Quick Actions")
@@ -244,13 +364,13 @@ with st.sidebar:
     st.divider()
     
     st.header("📈 Quick Stats")
-    active_count = len(st.session_state.accounts[st.session_state.accounts['Status'] == 'Active'])
+    active_count = totals.active_count
     st.metric("Active Accounts", active_count)
     
-    avg_age = st.session_state.accounts['Account Age (Months)'].mean()
+    avg_age = totals.avg_age_months
     st.metric("Avg Account Age", f"{avg_age:.0f} months")
     
-    autopay_count = len(st.session_state.accounts[st.session_state.accounts['Autopay Enabled'] == 'Yes'])
+    autopay_count = totals.autopay_count
     st.metric("Autopay Enabled", f"{autopay_count}/{active_count}")
     
     st.divider()
@@ -259,17 +379,18 @@ with st.sidebar:
     st.success("Pay before reporting date to lower reported balance")
     st.warning("Set up autopay to never miss a payment")
 
+profiler.mark('dashboard_metrics')
 # Dashboard Statistics
 st.header("📊 Dashboard Overview")
 
 col1, col2, col3, col4, col5, col6 = st.columns(6)
 
-total_limit = st.session_state.accounts['Credit Limit'].sum()
-total_balance = st.session_state.accounts['Current Balance'].sum()
-total_points = st.session_state.accounts['Rewards Points'].sum()
-total_points_value = st.session_state.accounts['Points Dollar Value'].sum()
-avg_utilization = calculate_utilization(total_balance, total_limit)
-total_min_payments = st.session_state.accounts['Minimum Payment'].sum()
+total_limit = totals.total_limit
+total_balance = totals.total_balance
+total_points = totals.total_points
+total_points_value = totals.total_points_value
+avg_utilization = totals.utilization
+total_min_payments = totals.total_min_payments
 
 with col1:
     st.metric("Total Credit Limit", f"${total_limit:,.0f}", help="Combined credit limit across all accounts")
@@ -288,23 +409,18 @@ with col6:
 # Additional metrics row
 col1, col2, col3, col4 = st.columns(4)
 
-credit_cards = st.session_state.accounts[st.session_state.accounts['Account Type'] == 'Credit Card']
-cc_limit = credit_cards['Credit Limit'].sum()
-cc_balance = credit_cards['Current Balance'].sum()
-cc_util = calculate_utilization(cc_balance, cc_limit)
-
-loans = st.session_state.accounts[st.session_state.accounts['Account Type'].isin(['Installment Loan', 'Mortgage', 'Personal Loan'])]
-total_loan_balance = loans['Current Balance'].sum()
+cc_util = totals.cc_utilization
+total_loan_balance = totals.total_loan_balance
 
 with col1:
     st.metric("Credit Card Utilization", f"{cc_util:.1f}%", help="Utilization for credit cards only")
 with col2:
     st.metric("Total Loan Balance", f"${total_loan_balance:,.0f}", help="Combined balance of all loans")
 with col3:
-    avg_apr = st.session_state.accounts[st.session_state.accounts['Current Balance'] > 0]['APR'].mean()
+    avg_apr = totals.avg_apr
     st.metric("Weighted Avg APR", f"{avg_apr:.2f}%", help="Average APR across accounts with balance")
 with col4:
-    total_annual_fees = st.session_state.accounts['Annual Fee'].sum()
+    total_annual_fees = totals.total_annual_fees
     st.metric("Annual Fees", f"${total_annual_fees:,.0f}", help="Total annual fees across all accounts")
 
 st.divider()
@@ -314,97 +430,64 @@ st.header("📈 Analytics & Insights")
 
 tab_viz1, tab_viz2, tab_viz3, tab_viz4 = st.tabs(["Utilization Analysis", "Balance Distribution", "Payment Timeline", "Rewards Tracking"])
 
+profiler.mark('charts.utilization')
 with tab_viz1:
     col1, col2 = st.columns(2)
     
     with col1:
         # Utilization by account
-        util_df = st.session_state.accounts[st.session_state.accounts['Account Type'] == 'Credit Card'].copy()
-        util_df = util_df.sort_values('Utilization %', ascending=True)
-        
-        fig_util = px.bar(util_df, 
-                         x='Utilization %', 
-                         y='Account Name',
-                         title='Credit Card Utilization by Account',
-                         color='Utilization %',
-                         color_continuous_scale=['green', 'yellow', 'red'],
-                         range_color=[0, 100])
-        fig_util.add_vline(x=30, line_dash="dash", line_color="orange", annotation_text="30% Threshold")
+        fig_util = figure_cache.get('utilization_bar', st.session_state.data_version,
+                                    figures.utilization_bar, st.session_state.accounts)
         st.plotly_chart(fig_util, use_container_width=True)
     
     with col2:
         # Credit utilization gauge
-        fig_gauge = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=avg_utilization,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Overall Credit Utilization"},
-            delta={'reference': 30},
-            gauge={
-                'axis': {'range': [None, 100]},
-                'bar': {'color': "darkblue"},
-                'steps': [
-                    {'range': [0, 30], 'color': "lightgreen"},
-                    {'range': [30, 70], 'color': "lightyellow"},
-                    {'range': [70, 100], 'color': "lightcoral"}],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 70}}))
+        fig_gauge = figure_cache.get('utilization_gauge', st.session_state.data_version,
+                                     figures.utilization_gauge, avg_utilization)
         st.plotly_chart(fig_gauge, use_container_width=True)
 
+profiler.mark('charts.balances')
 with tab_viz2:
     col1, col2 = st.columns(2)
     
     with col1:
         # Balance by account type
-        type_summary = st.session_state.accounts.groupby('Account Type').agg({
-            'Current Balance': 'sum',
-            'Account Name': 'count'
-        }).reset_index()
-        type_summary.columns = ['Account Type', 'Total Balance', 'Count']
-        
-        fig_pie = px.pie(type_summary, 
-                        values='Total Balance', 
-                        names='Account Type',
-                        title='Balance Distribution by Account Type',
-                        hole=0.4)
+        fig_pie = figure_cache.get('balance_pie', st.session_state.data_version,
+                                   figures.balance_pie, st.session_state.accounts)
         st.plotly_chart(fig_pie, use_container_width=True)
     
     with col2:
         # Top 10 accounts by balance
-        top_accounts = st.session_state.accounts.nlargest(10, 'Current Balance')
-        fig_bar = px.bar(top_accounts,
-                        x='Current Balance',
-                        y='Account Name',
-                        title='Top 10 Accounts by Balance',
-                        orientation='h',
-                        color='Account Type')
+        fig_bar = figure_cache.get('top_balances_bar', st.session_state.data_version,
+                                   figures.top_balances_bar, st.session_state.accounts)
         st.plotly_chart(fig_bar, use_container_width=True)
 
+profiler.mark('charts.payment_timeline')
 with tab_viz3:
     # Payment timeline
-    timeline_df = st.session_state.accounts[['Account Name', 'Due Date', 'Minimum Payment', 'Current Balance']].copy()
-    timeline_df['Due Date'] = pd.to_datetime(timeline_df['Due Date'])
+    timeline_df = st.session_state.accounts[['Account Name', 'Account Type', 'Due Date', 'Minimum Payment', 'Current Balance']].copy()
     timeline_df = timeline_df.sort_values('Due Date')
     
-    fig_timeline = px.scatter(timeline_df,
-                             x='Due Date',
-                             y='Minimum Payment',
-                             size='Current Balance',
-                             color='Account Name',
-                             title='Payment Timeline (size = current balance)',
-                             hover_data=['Account Name', 'Minimum Payment', 'Current Balance'])
+    timeline_mode = st.radio("Timeline detail", figures.TIMELINE_MODES, horizontal=True,
+                             help=f"Auto shows one point per account up to {figures.TIMELINE_DETAIL_LIMIT} accounts, "
+                                  "then daily or weekly totals")
+    drawn_mode = figures.timeline_mode(timeline_df, timeline_mode)
+    if timeline_mode == 'Per account' and drawn_mode != timeline_mode:
+        st.info(f"Showing {drawn_mode.lower()} totals: one point per account is only drawn for up to "
+                f"{figures.TIMELINE_PER_ACCOUNT_MAX:,} accounts ({len(timeline_df):,} here).")
+    fig_timeline = figure_cache.get('payment_timeline', st.session_state.data_version,
+                                    figures.payment_timeline, timeline_df, params=(drawn_mode,))
     st.plotly_chart(fig_timeline, use_container_width=True)
     
     # Payment calendar table
     st.subheader("Detailed Payment Schedule")
     display_df = timeline_df[['Account Name', 'Due Date', 'Minimum Payment', 'Current Balance']].copy()
-    display_df['Due Date'] = display_df['Due Date'].dt.strftime('%Y-%m-%d')
+    display_df['Due Date'] = display_df['Due Date'].dt.strftime(schema.DATE_FORMAT)
     display_df['Minimum Payment'] = display_df['Minimum Payment'].apply(lambda x: f"${x:,.2f}")
     display_df['Current Balance'] = display_df['Current Balance'].apply(lambda x: f"${x:,.2f}")
     st.dataframe(display_df, use_container_width=True, hide_index=True)
 
+profiler.mark('charts.rewards')
 with tab_viz4:
     # Check if there are any rewards accounts
     rewards_df = st.session_state.accounts[st.session_state.accounts['Rewards Points'] > 0].copy()
@@ -416,24 +499,14 @@ with tab_viz4:
             # Rewards points by account
             rewards_df_sorted = rewards_df.sort_values('Rewards Points', ascending=False)
             
-            fig_rewards = px.bar(rewards_df_sorted,
-                                x='Account Name',
-                                y='Rewards Points',
-                                title='Rewards Points by Account',
-                                color='Points Dollar Value',
-                                color_continuous_scale='Blues')
-            fig_rewards.update_layout(xaxis_tickangle=-45)
+            fig_rewards = figure_cache.get('rewards_points_bar', st.session_state.data_version,
+                                           figures.rewards_points_bar, rewards_df_sorted)
             st.plotly_chart(fig_rewards, use_container_width=True)
         
         with col2:
             # Points value comparison
-            fig_value = px.bar(rewards_df_sorted,
-                              x='Account Name',
-                              y='Points Dollar Value',
-                              title='Estimated Cash Value of Points',
-                              color='Points Value',
-                              color_continuous_scale='Greens')
-            fig_value.update_layout(xaxis_tickangle=-45)
+            fig_value = figure_cache.get('rewards_value_bar', st.session_state.data_version,
+                                         figures.rewards_value_bar, rewards_df_sorted)
             st.plotly_chart(fig_value, use_container_width=True)
         
         # Rewards summary
@@ -456,8 +529,9 @@ with tab_viz4:
 st.divider()
 
 # Main Tabs
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["📋 All Accounts", "➕ Add Account", "📅 Payment Calendar", "⚠️ Alerts & Reminders", "📊 Credit Score Insights", "💾 Import/Export"])
+tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs(["📋 All Accounts", "➕ Add Account", "📅 Payment Calendar", "⚠️ Alerts & Reminders", "📊 Credit Score Insights", "💾 Import/Export", "💸 Payoff Planner", "📈 Trends"])
 
+profiler.mark('tabs.all_accounts')
 # Tab 1: Display All Accounts
 with tab1:
     st.header("All Accounts")
@@ -479,7 +553,10 @@ with tab1:
                                            'Rewards Points', 'APR', 'Account Age (Months)'])
     
     # Search functionality
-    search_term = st.text_input("🔍 Search accounts", placeholder="Search by account name, institution, or notes...")
+    search_term = st.text_input("🔍 Search accounts", placeholder="Search by account name, institution, account number, or notes...",
+                                help="Every word must match, anywhere in a word (one or two letters match word starts); "
+                                     "close misspellings are found when nothing matches exactly. Prefix a word with "
+                                     "name:, inst:, number: or notes: to search one field.")
     
     # Apply filters
     filtered_df = st.session_state.accounts[
@@ -488,25 +565,36 @@ with tab1:
     ]
     
     if filter_autopay != 'All':
-        autopay_val = 'Yes' if filter_autopay == 'Enabled' else 'No'
-        filtered_df = filtered_df[filtered_df['Autopay Enabled'] == autopay_val]
+        filtered_df = filtered_df[filtered_df['Autopay Enabled'] == (filter_autopay == 'Enabled')]
     
     if search_term:
-        filtered_df = filtered_df[
-            filtered_df['Account Name'].str.contains(search_term, case=False, na=False) |
-            filtered_df['Institution'].str.contains(search_term, case=False, na=False) |
-            filtered_df['Notes'].str.contains(search_term, case=False, na=False)
-        ]
+        filtered_df = filtered_df[search_index.matches(search_term, filtered_df.index)]
     
-    filtered_df = filtered_df.sort_values(by=sort_by)
+    filtered_df = filtered_df.sort_values(by=sort_by, kind='stable')
     
-    st.write(f"Showing **{len(filtered_df)}** of **{len(st.session_state.accounts)}** accounts")
+    # Pagination - only the rows on the current page get expanders and widgets
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page_size = st.selectbox("Accounts per page", paging.PAGE_SIZES, index=1, key='accounts_page_size')
+    total_pages = paging.page_count(len(filtered_df), page_size)
+    if st.session_state.get('accounts_page', 1) > total_pages:
+        st.session_state['accounts_page'] = total_pages
+    with col2:
+        page = st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages, step=1, key='accounts_page')
+    page_df = paging.page_slice(filtered_df, page, page_size)
+    
+    if len(page_df) > 0:
+        first_row = (paging.clamp_page(page, len(filtered_df), page_size) - 1) * page_size + 1
+        st.write(f"Showing **{first_row}-{first_row + len(page_df) - 1}** of **{len(filtered_df)}** matching "
+                 f"(**{len(st.session_state.accounts)}** accounts total)")
+    else:
+        st.write(f"Showing **0** of **{len(st.session_state.accounts)}** accounts")
     
     # Display accounts with enhanced details
-    if len(filtered_df) > 0:
-        for idx, row in filtered_df.iterrows():
+    if len(page_df) > 0:
+        for idx, row in page_df.iterrows():
             util_color = "🟢" if row['Utilization %'] < 30 else "🟡" if row['Utilization %'] < 70 else "🔴"
-            autopay_icon = "✅" if row['Autopay Enabled'] == 'Yes' else "❌"
+            autopay_icon = "✅" if row['Autopay Enabled'] else "❌"
             
             with st.expander(f"**{row['Account Name']}** - {row['Institution']} ({row['Account Type']}) {util_color} {autopay_icon}", expanded=False):
                 # Main account information in columns
@@ -516,10 +604,10 @@ with tab1:
                     st.markdown("**💼 Account Details**")
                     st.write(f"**Status:** {row['Status']}")
                     st.write(f"**Account #:** {row['Account Number']}")
-                    st.write(f"**Open Date:** {row['Open Date']}")
+                    st.write(f"**Open Date:** {schema.format_date(row['Open Date'])}")
                     st.write(f"**Account Age:** {row['Account Age (Months)']} months")
                     st.write(f"**Credit Bureau:** {row['Credit Bureau']}")
-                    st.write(f"**Payment History:** {row['Payment History']}")
+                    st.write(f"**Payment History:** {schema.format_percent(row['Payment History'])}")
                 
                 with col2:
                     st.markdown("**💰 Balance Information**")
@@ -534,11 +622,11 @@ with tab1:
                 with col3:
                     st.markdown("**📅 Payment & Dates**")
                     st.write(f"**Minimum Payment:** ${row['Minimum Payment']:.2f}")
-                    st.write(f"**Due Date:** {row['Due Date']}")
-                    st.write(f"**Statement Date:** {row['Statement Date']}")
-                    st.write(f"**Reporting Date:** {row['Reporting Date']}")
+                    st.write(f"**Due Date:** {schema.format_date(row['Due Date'])}")
+                    st.write(f"**Statement Date:** {schema.format_date(row['Statement Date'])}")
+                    st.write(f"**Reporting Date:** {schema.format_date(row['Reporting Date'])}")
                     st.write(f"**Last Payment:** ${row['Last Payment Amount']:.2f}")
-                    st.write(f"**Last Payment Date:** {row['Last Payment Date']}")
+                    st.write(f"**Last Payment Date:** {schema.format_date(row['Last Payment Date'])}")
                     st.write(f"**APR:** {row['APR']:.2f}%")
                 
                 with col4:
@@ -550,15 +638,27 @@ with tab1:
                     else:
                         st.write(f"**Points:** N/A")
                     st.write(f"**Cashback:** {row['Cashback Rate']}")
-                    st.write(f"**Autopay:** {row['Autopay Enabled']}")
+                    st.write(f"**Autopay:** {schema.format_bool(row['Autopay Enabled'])}")
                 
                 # Notes section
                 if row['Notes']:
                     st.markdown("**📝 Notes**")
                     st.info(row['Notes'])
                 
+                # Balance history from the ledger (only once something has changed)
+                account_history = payment_ledger.history(idx)
+                if len(account_history) > 1:
+                    st.markdown("**📜 Balance History**")
+                    history_view = account_history.drop(columns='seq').rename(columns=str.title)
+                    history_view['Date'] = history_view['Date'].dt.strftime(schema.DATE_FORMAT)
+                    st.dataframe(history_view, use_container_width=True, hide_index=True,
+                                 column_config={
+                                     'Amount': st.column_config.NumberColumn(format="$%.2f"),
+                                     'Balance': st.column_config.NumberColumn(format="$%.2f"),
+                                 })
+                
                 # Calculate days until due
-                days_until_due = (pd.to_datetime(row['Due Date']) - pd.Timestamp.now()).days
+                days_until_due = (row['Due Date'] - pd.Timestamp.now()).days
                 if days_until_due <= 7 and days_until_due >= 0:
                     st.warning(f"⚠️ Payment due in {days_until_due} days!")
                 elif days_until_due < 0:
@@ -575,7 +675,16 @@ with tab1:
                 with col3:
                     if st.button(f"🗑️ Delete", key=f"delete_{idx}"):
                         if st.session_state.get(f'confirm_delete_{idx}', False):
-                            st.session_state.accounts = st.session_state.accounts.drop(idx).reset_index(drop=True)
+                            payment_ledger.record(idx, 'close', -payment_ledger.balance(idx))
+                            deleted_row = account_table.delete(idx)
+                            totals.remove(deleted_row)
+                            search_index.remove(deleted_row)
+                            st.session_state.data_version += 1
+                            st.session_state.accounts = account_table.frame
+                            account_store.delete(idx)
+                            payment_ledger.save()
+                            for state_key in (f'editing_{idx}', f'paying_{idx}', f'paying_cal_{idx}', f'confirm_delete_{idx}'):
+                                st.session_state.pop(state_key, None)
                             st.success(f"Account '{row['Account Name']}' deleted!")
                             st.rerun()
                         else:
@@ -583,28 +692,7 @@ with tab1:
                             st.warning("Click delete again to confirm")
                 
                 # Payment form
-                if st.session_state.get(f'paying_{idx}', False):
-                    st.markdown("---")
-                    st.markdown("**💳 Record Payment**")
-                    with st.form(key=f"payment_form_{idx}"):
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            payment_amount = st.number_input("Payment Amount", min_value=0.0, 
-                                                            value=float(row['Minimum Payment']), step=10.0)
-                        with col2:
-                            payment_date = st.date_input("Payment Date", value=datetime.now())
-                        with col3:
-                            payment_type = st.selectbox("Payment Type", ["Minimum Payment", "Statement Balance", "Full Balance", "Custom"])
-                        
-                        if st.form_submit_button("💾 Record Payment"):
-                            new_balance = row['Current Balance'] - payment_amount
-                            st.session_state.accounts.loc[idx, 'Current Balance'] = max(0, new_balance)
-                            st.session_state.accounts.loc[idx, 'Last Payment Date'] = payment_date.strftime('%Y-%m-%d')
-                            st.session_state.accounts.loc[idx, 'Last Payment Amount'] = payment_amount
-                            st.session_state.accounts.loc[idx, 'Utilization %'] = calculate_utilization(new_balance, row['Credit Limit'])
-                            st.session_state[f'paying_{idx}'] = False
-                            st.success(f"Payment of ${payment_amount:.2f} recorded! New balance: ${new_balance:.2f}")
-                            st.rerun()
+                payment_form(idx, row, f'paying_{idx}', f"payment_form_{idx}")
                 
                 # Edit form
                 if st.session_state.get(f'editing_{idx}', False):
@@ -617,9 +705,9 @@ with tab1:
                             new_limit = st.number_input("Credit Limit", value=float(row['Credit Limit']))
                             new_min_pay = st.number_input("Minimum Payment", value=float(row['Minimum Payment']))
                         with col2:
-                            new_due_date = st.date_input("Due Date", value=pd.to_datetime(row['Due Date']))
-                            new_statement_date = st.date_input("Statement Date", value=pd.to_datetime(row['Statement Date']))
-                            new_reporting_date = st.date_input("Reporting Date", value=pd.to_datetime(row['Reporting Date']))
+                            new_due_date = st.date_input("Due Date", value=row['Due Date'])
+                            new_statement_date = st.date_input("Statement Date", value=row['Statement Date'])
+                            new_reporting_date = st.date_input("Reporting Date", value=row['Reporting Date'])
                         with col3:
                             new_points = st.number_input("Rewards Points", value=int(row['Rewards Points']))
                             new_apr = st.number_input("APR %", value=float(row['APR']))
@@ -628,26 +716,35 @@ with tab1:
                             new_status = st.selectbox("Status", ['Active', 'Closed', 'Frozen'], 
                                                      index=['Active', 'Closed', 'Frozen'].index(row['Status']))
                             new_autopay = st.selectbox("Autopay", ['Yes', 'No'], 
-                                                      index=['Yes', 'No'].index(row['Autopay Enabled']))
+                                                      index=0 if row['Autopay Enabled'] else 1)
                             new_notes = st.text_area("Notes", value=row['Notes'])
                         
                         col1, col2 = st.columns(2)
                         with col1:
                             if st.form_submit_button("💾 Save Changes", use_container_width=True):
-                                st.session_state.accounts.loc[idx, 'Current Balance'] = new_balance
-                                st.session_state.accounts.loc[idx, 'Credit Limit'] = new_limit
-                                st.session_state.accounts.loc[idx, 'Minimum Payment'] = new_min_pay
-                                st.session_state.accounts.loc[idx, 'Due Date'] = new_due_date.strftime('%Y-%m-%d')
-                                st.session_state.accounts.loc[idx, 'Statement Date'] = new_statement_date.strftime('%Y-%m-%d')
-                                st.session_state.accounts.loc[idx, 'Reporting Date'] = new_reporting_date.strftime('%Y-%m-%d')
-                                st.session_state.accounts.loc[idx, 'Rewards Points'] = new_points
-                                st.session_state.accounts.loc[idx, 'APR'] = new_apr
-                                st.session_state.accounts.loc[idx, 'Annual Fee'] = new_annual_fee
-                                st.session_state.accounts.loc[idx, 'Status'] = new_status
-                                st.session_state.accounts.loc[idx, 'Autopay Enabled'] = new_autopay
-                                st.session_state.accounts.loc[idx, 'Notes'] = new_notes
-                                st.session_state.accounts.loc[idx, 'Utilization %'] = calculate_utilization(new_balance, new_limit)
-                                st.session_state.accounts.loc[idx, 'Points Dollar Value'] = new_points * row['Points Value']
+                                if new_balance != row['Current Balance']:
+                                    payment_ledger.record(idx, 'adjustment', new_balance - row['Current Balance'])
+                                old_row, new_row = account_table.update(idx, {
+                                    'Current Balance': new_balance,
+                                    'Credit Limit': new_limit,
+                                    'Minimum Payment': new_min_pay,
+                                    'Due Date': schema.to_date(new_due_date),
+                                    'Statement Date': schema.to_date(new_statement_date),
+                                    'Reporting Date': schema.to_date(new_reporting_date),
+                                    'Rewards Points': new_points,
+                                    'APR': new_apr,
+                                    'Annual Fee': new_annual_fee,
+                                    'Status': new_status,
+                                    'Autopay Enabled': new_autopay == 'Yes',
+                                    'Notes': new_notes,
+                                    'Utilization %': core.calculate_utilization(new_balance, new_limit),
+                                    'Points Dollar Value': new_points * row['Points Value'],
+                                })
+                                totals.replace(old_row, new_row)
+                                search_index.replace(old_row, new_row)
+                                st.session_state.data_version += 1
+                                st.session_state.accounts = account_table.frame
+                                save_row(idx, old_row, new_row)
                                 st.session_state[f'editing_{idx}'] = False
                                 st.success("Account updated successfully!")
                                 st.rerun()
@@ -658,6 +755,7 @@ with tab1:
     else:
         st.info("No accounts match the current filters.")
 
+profiler.mark('tabs.add_account')
 # Tab 2: Add New Account
 with tab2:
     st.header("Add New Account")
@@ -733,7 +831,7 @@ with tab2:
                 # Calculate account age
                 account_age_months = round((datetime.now() - pd.to_datetime(open_date)).days / 30.44, 0)
                 
-                new_account = pd.DataFrame({
+                new_account = schema.compact(schema.parse_dates(pd.DataFrame({
                     'Account Name': [account_name],
                     'Account Type': [account_type],
                     'Institution': [institution],
@@ -741,18 +839,18 @@ with tab2:
                     'Current Balance': [current_balance],
                     'Statement Balance': [statement_balance],
                     'Minimum Payment': [minimum_payment],
-                    'Due Date': [due_date.strftime('%Y-%m-%d')],
-                    'Statement Date': [statement_date.strftime('%Y-%m-%d')],
-                    'Reporting Date': [reporting_date.strftime('%Y-%m-%d')],
-                    'Last Payment Date': [last_payment_date.strftime('%Y-%m-%d')],
+                    'Due Date': [schema.to_date(due_date)],
+                    'Statement Date': [schema.to_date(statement_date)],
+                    'Reporting Date': [schema.to_date(reporting_date)],
+                    'Last Payment Date': [schema.to_date(last_payment_date)],
                     'Last Payment Amount': [last_payment_amount],
                     'APR': [apr],
                     'Rewards Points': [rewards_points],
                     'Points Value': [points_value],
                     'Annual Fee': [annual_fee],
                     'Status': [status],
-                    'Open Date': [open_date.strftime('%Y-%m-%d')],
-                    'Utilization %': [calculate_utilization(current_balance, credit_limit)],
+                    'Open Date': [schema.to_date(open_date)],
+                    'Utilization %': [core.calculate_utilization(current_balance, credit_limit)],
                     'Points Dollar Value': [rewards_points * points_value],
                     'Account Number': [account_number if account_number else '****0000'],
                     'Credit Bureau': [credit_bureau],
@@ -761,26 +859,41 @@ with tab2:
                     'Autopay Enabled': [autopay_enabled],
                     'Cashback Rate': [cashback_rate],
                     'Notes': [notes]
-                })
+                })))
                 
-                st.session_state.accounts = pd.concat([st.session_state.accounts, new_account], ignore_index=True)
+                new_account = account_table.insert(new_account)
+                payment_ledger.record(new_account.index[0], 'open', current_balance)
+                # The views read the whole frame, so this compacts the one-row buffer (a full concat)
+                st.session_state.accounts = account_table.frame
+                totals.add(new_account)
+                search_index.add(new_account)
+                st.session_state.data_version += 1
+                try:
+                    account_store.insert(new_account)
+                except storage.ConflictError as e:
+                    reload_after_conflict(e)
+                payment_ledger.save()
                 st.success(f"✅ Account '{account_name}' added successfully!")
                 st.balloons()
                 st.rerun()
             else:
                 st.error("Please fill in all required fields (marked with *).")
 
+profiler.mark('tabs.payment_calendar')
 # Tab 3: Payment Calendar
 with tab3:
     st.header("📅 Payment Calendar & Schedule")
     
     # Filter options
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     with col1:
         calendar_view = st.selectbox("View", ["Upcoming Payments", "All Active", "This Month", "Next Month"])
     with col2:
         sort_calendar = st.selectbox("Sort By", ["Due Date", "Amount", "Account Name"])
     with col3:
+        calendar_months = st.slider("Months Ahead", min_value=1, max_value=24, value=3, key='calendar_months',
+                                    help="How far ahead recurring due, statement and reporting dates are projected")
+    with col4:
         show_paid = st.checkbox("Show Accounts with $0 Balance", value=False)
     
     # Filter active accounts and sort by due date
@@ -789,15 +902,23 @@ with tab3:
     if not show_paid:
         active_accounts = active_accounts[active_accounts['Current Balance'] > 0]
     
-    active_accounts['Due Date'] = pd.to_datetime(active_accounts['Due Date'])
-    
     today = pd.Timestamp.now()
     
-    if calendar_view == "This Month":
-        active_accounts = active_accounts[active_accounts['Due Date'].dt.month == today.month]
-    elif calendar_view == "Next Month":
-        next_month = today + pd.DateOffset(months=1)
-        active_accounts = active_accounts[active_accounts['Due Date'].dt.month == next_month.month]
+    # Monthly recurrences of every account's dates, from the first of this month
+    month_start = today.normalize().replace(day=1)
+    calendar_key = (st.session_state.data_version, month_start, calendar_months)
+    if st.session_state.get('payment_calendar', (None,))[0] != calendar_key:
+        st.session_state.payment_calendar = (calendar_key, schedule.PaymentCalendar.from_accounts(
+            st.session_state.accounts, month_start, max(calendar_months, 2)))
+    _, payment_calendar = st.session_state.payment_calendar
+    
+    if calendar_view in ("This Month", "Next Month"):
+        # The month's due dates, including bills that recur into it from earlier months
+        shown_month = month_start if calendar_view == "This Month" else month_start + pd.DateOffset(months=1)
+        due_in_month = payment_calendar.month(shown_month.year, shown_month.month, kinds=['due'], details=False)
+        due_in_month = due_in_month[due_in_month['account_id'].isin(active_accounts.index)]
+        active_accounts = active_accounts.loc[due_in_month['account_id']].assign(
+            **{'Due Date': due_in_month['date'].to_numpy()})
     elif calendar_view == "Upcoming Payments":
         active_accounts = active_accounts[active_accounts['Due Date'] >= today]
     
@@ -828,30 +949,18 @@ with tab3:
     
     # Payment timeline
     if len(active_accounts) > 0:
-        for idx, row in active_accounts.iterrows():
-            days_until_due = (row['Due Date'] - today).days
-            
-            if days_until_due < 0:
-                color = "🔴"
-                status_text = f"OVERDUE by {abs(days_until_due)} days"
-                status_color = "error"
-            elif days_until_due <= 3:
-                color = "🔴"
-                status_text = f"Due in {days_until_due} days - URGENT"
-                status_color = "error"
-            elif days_until_due <= 7:
-                color = "🟠"
-                status_text = f"Due in {days_until_due} days"
-                status_color = "warning"
-            elif days_until_due <= 14:
-                color = "🟡"
-                status_text = f"Due in {days_until_due} days"
-                status_color = "info"
-            else:
-                color = "🟢"
-                status_text = f"Due in {days_until_due} days"
-                status_color = "success"
-            
+        # Days and urgency for every card at once; the loop below only renders
+        days_until_due = (active_accounts['Due Date'] - today).dt.days.to_numpy()
+        urgency = np.select([days_until_due < 0, days_until_due <= 3, days_until_due <= 7, days_until_due <= 14],
+                            [0, 1, 2, 3], default=4)
+        colors = np.array(["🔴", "🔴", "🟠", "🟡", "🟢"])[urgency]
+        status_colors = np.array(["error", "error", "warning", "info", "success"])[urgency]
+        status_texts = np.where(days_until_due < 0, [f"OVERDUE by {abs(d)} days" for d in days_until_due],
+                                np.where(urgency == 1, [f"Due in {d} days - URGENT" for d in days_until_due],
+                                         [f"Due in {d} days" for d in days_until_due]))
+        
+        for idx, row, color, status_text, status_color in zip(active_accounts.index, active_accounts.to_dict('records'),
+                                                              colors, status_texts, status_colors):
             with st.container():
                 col1, col2, col3, col4, col5, col6 = st.columns([3, 2, 2, 2, 2, 1])
                 
@@ -861,7 +970,7 @@ with tab3:
                 
                 with col2:
                     st.write("**Due Date**")
-                    st.write(row['Due Date'].strftime('%Y-%m-%d'))
+                    st.write(schema.format_date(row['Due Date']))
                 
                 with col3:
                     st.write("**Min Payment**")
@@ -884,107 +993,106 @@ with tab3:
                 
                 with col6:
                     if st.button("💳 Pay", key=f"pay_cal_{idx}"):
-                        st.session_state[f'paying_{idx}'] = True
+                        st.session_state[f'paying_cal_{idx}'] = True
                         st.rerun()
                 
+                # The account may not be on the All Accounts page being shown, so pay here
+                payment_form(idx, st.session_state.accounts.loc[idx], f'paying_cal_{idx}', f"payment_form_cal_{idx}")
+                
                 st.divider()
     else:
         st.info("No payments scheduled for the selected view.")
+    
+    # Projected due, statement and reporting dates over the chosen horizon
+    st.subheader("🗓️ Projected Schedule")
+    col1, col2 = st.columns(2)
+    with col1:
+        schedule_range = st.date_input("Date Range", value=(today.date(), (today + timedelta(days=30)).date()),
+                                       min_value=payment_calendar.start.date(), max_value=payment_calendar.end.date(),
+                                       key='schedule_range')
+    with col2:
+        schedule_labels = st.multiselect("Show", list(schedule.EVENT_LABELS.values()),
+                                         default=list(schedule.EVENT_LABELS.values()), key='schedule_kinds')
+    
+    if len(schedule_range) == 2:
+        schedule_kinds = [kind for kind, label in schedule.EVENT_LABELS.items() if label in schedule_labels]
+        upcoming = payment_calendar.between(schedule_range[0], schedule_range[1], kinds=schedule_kinds)
+        # Every active account's dates, whatever the view and $0-balance filters above show
+        is_active = st.session_state.accounts['Status'] == 'Active'
+        upcoming = upcoming[upcoming['account_id'].isin(st.session_state.accounts.index[is_active])]
+        st.caption(f"{len(upcoming):,} dates between {schema.format_date(schedule_range[0])} and "
+                   f"{schema.format_date(schedule_range[1])}")
+        shown = pd.DataFrame({
+            'Date': upcoming['date'].dt.strftime(schema.DATE_FORMAT),
+            'Event': upcoming['kind'].map(schedule.EVENT_LABELS),
+            'Account Name': upcoming['Account Name'],
+            'Minimum Payment': upcoming['Minimum Payment'].where(upcoming['kind'] == 'due'),
+        })
+        st.dataframe(shown, use_container_width=True, hide_index=True,
+                     column_config={'Minimum Payment': st.column_config.NumberColumn(format="$%.2f")})
+        st.download_button(
+            label="📆 Download Calendar (.ics)",
+            data=payment_calendar.to_ical(upcoming),
+            file_name=f"credit_payments_{datetime.now().strftime('%Y%m%d')}.ics",
+            mime="text/calendar",
+            use_container_width=True,
+            help="Import into Google Calendar, Outlook or Apple Calendar"
+        )
 
+profiler.mark('tabs.alerts')
 # Tab 4: Alerts & Reminders
 with tab4:
     st.header("⚠️ Alerts & Reminders")
     
-    alerts = []
-    
-    # Check for overdue payments
-    overdue = st.session_state.accounts[
-        (pd.to_datetime(st.session_state.accounts['Due Date']) < pd.Timestamp.now()) &
-        (st.session_state.accounts['Status'] == 'Active') &
-        (st.session_state.accounts['Current Balance'] > 0)
-    ]
+    # Every rule is evaluated in one vectorized pass; the sections below only
+    # format the matching rows
+    alert_table = alerts.evaluate(st.session_state.accounts)
+    alert_counts = alerts.counts(alert_table)
+    alert_rows = {rule: group.to_dict('records') for rule, group in alert_table.groupby('rule', sort=False)}
     
-    if len(overdue) > 0:
-        st.error(f"🚨 **URGENT: {len(overdue)} Overdue Payments!**")
-        for idx, row in overdue.iterrows():
-            days_overdue = (pd.Timestamp.now() - pd.to_datetime(row['Due Date'])).days
-            st.write(f"- **{row['Account Name']}**: ${row['Minimum Payment']:,.2f} - Overdue by {days_overdue} days")
+    if alert_counts['overdue'] > 0:
+        st.error(f"🚨 **URGENT: {alert_counts['overdue']} Overdue Payments!**")
+        for row in alert_rows['overdue']:
+            st.write(f"- **{row['Account Name']}**: ${row['Minimum Payment']:,.2f} - Overdue by {-int(row['days_delta'])} days")
         st.divider()
     
-    # Check for payments due soon
-    due_soon = st.session_state.accounts[
-        (pd.to_datetime(st.session_state.accounts['Due Date']) >= pd.Timestamp.now()) &
-        (pd.to_datetime(st.session_state.accounts['Due Date']) <= pd.Timestamp.now() + timedelta(days=7)) &
-        (st.session_state.accounts['Status'] == 'Active') &
-        (st.session_state.accounts['Current Balance'] > 0)
-    ]
-    
-    if len(due_soon) > 0:
-        st.warning(f"⏰ **{len(due_soon)} Payments Due Within 7 Days**")
-        for idx, row in due_soon.iterrows():
-            days_until = (pd.to_datetime(row['Due Date']) - pd.Timestamp.now()).days
-            st.write(f"- **{row['Account Name']}**: ${row['Minimum Payment']:,.2f} - Due in {days_until} days ({row['Due Date']})")
+    if alert_counts['due_soon'] > 0:
+        st.warning(f"⏰ **{alert_counts['due_soon']} Payments Due Within {alerts.DEFAULT_THRESHOLDS['due_soon_days']} Days**")
+        for row in alert_rows['due_soon']:
+            st.write(f"- **{row['Account Name']}**: ${row['Minimum Payment']:,.2f} - Due in {int(row['days_delta'])} days ({schema.format_date(row['Due Date'])})")
         st.divider()
     
-    # Check for high utilization
-    high_util = st.session_state.accounts[
-        (st.session_state.accounts['Utilization %'] > 70) &
-        (st.session_state.accounts['Account Type'] == 'Credit Card') &
-        (st.session_state.accounts['Status'] == 'Active')
-    ]
-    
-    if len(high_util) > 0:
-        st.warning(f"📊 **{len(high_util)} Accounts with High Utilization (>70%)**")
-        for idx, row in high_util.iterrows():
+    if alert_counts['high_utilization'] > 0:
+        st.warning(f"📊 **{alert_counts['high_utilization']} Accounts with High Utilization (>{alerts.DEFAULT_THRESHOLDS['high_utilization']}%)**")
+        for row in alert_rows['high_utilization']:
             st.write(f"- **{row['Account Name']}**: {row['Utilization %']:.1f}% utilization - Consider paying down balance")
         st.divider()
     
-    # Check for reporting dates coming up
-    reporting_soon = st.session_state.accounts[
-        (pd.to_datetime(st.session_state.accounts['Reporting Date']) >= pd.Timestamp.now()) &
-        (pd.to_datetime(st.session_state.accounts['Reporting Date']) <= pd.Timestamp.now() + timedelta(days=5)) &
-        (st.session_state.accounts['Status'] == 'Active') &
-        (st.session_state.accounts['Utilization %'] > 30)
-    ]
-    
-    if len(reporting_soon) > 0:
-        st.info(f"📅 **{len(reporting_soon)} Accounts Reporting Soon (Pay Before Reporting Date to Lower Utilization)**")
-        for idx, row in reporting_soon.iterrows():
-            days_until = (pd.to_datetime(row['Reporting Date']) - pd.Timestamp.now()).days
-            st.write(f"- **{row['Account Name']}**: Reports in {days_until} days ({row['Reporting Date']}) - Current utilization: {row['Utilization %']:.1f}%")
+    if alert_counts['reporting_soon'] > 0:
+        st.info(f"📅 **{alert_counts['reporting_soon']} Accounts Reporting Soon (Pay Before Reporting Date to Lower Utilization)**")
+        for row in alert_rows['reporting_soon']:
+            st.write(f"- **{row['Account Name']}**: Reports in {int(row['days_delta'])} days ({schema.format_date(row['Reporting Date'])}) - Current utilization: {row['Utilization %']:.1f}%")
         st.divider()
     
-    # Check for accounts without autopay
-    no_autopay = st.session_state.accounts[
-        (st.session_state.accounts['Autopay Enabled'] == 'No') &
-        (st.session_state.accounts['Status'] == 'Active')
-    ]
-    
-    if len(no_autopay) > 0:
-        st.info(f"🔄 **{len(no_autopay)} Accounts Without Autopay Enabled**")
+    if alert_counts['no_autopay'] > 0:
+        st.info(f"🔄 **{alert_counts['no_autopay']} Accounts Without Autopay Enabled**")
         st.write("Consider enabling autopay to avoid missed payments:")
-        for idx, row in no_autopay.iterrows():
+        for row in alert_rows['no_autopay']:
             st.write(f"- **{row['Account Name']}** ({row['Institution']})")
         st.divider()
     
-    # Annual fee reminders
-    current_month = pd.Timestamp.now().month
-    annual_fee_accounts = st.session_state.accounts[
-        (st.session_state.accounts['Annual Fee'] > 0) &
-        (pd.to_datetime(st.session_state.accounts['Open Date']).dt.month == current_month)
-    ]
-    
-    if len(annual_fee_accounts) > 0:
-        st.info(f"💰 **Annual Fee Alert: {len(annual_fee_accounts)} Account(s)**")
+    if alert_counts['annual_fee'] > 0:
+        st.info(f"💰 **Annual Fee Alert: {alert_counts['annual_fee']} Account(s)**")
         st.write("These accounts may have annual fees posting this month:")
-        for idx, row in annual_fee_accounts.iterrows():
-            st.write(f"- **{row['Account Name']}**: ${row['Annual Fee']:.2f} annual fee (Opened {row['Open Date']})")
+        for row in alert_rows['annual_fee']:
+            st.write(f"- **{row['Account Name']}**: ${row['Annual Fee']:.2f} annual fee (Opened {schema.format_date(row['Open Date'])})")
         st.divider()
     
-    if len(overdue) == 0 and len(due_soon) == 0 and len(high_util) == 0:
+    if alert_counts[['overdue', 'due_soon', 'high_utilization']].sum() == 0:
         st.success("✅ **All Clear!** No urgent alerts at this time.")
         st.balloons()
 
+profiler.mark('tabs.credit_insights')
 # Tab 5: Credit Score Insights
 with tab5:
     st.header("📊 Credit Score Insights & Optimization")
@@ -1022,11 +1130,88 @@ with tab5:
         else:
             st.info(f"💡 Focus on paying down the {high_util_count} card(s) with high utilization.")
     
+    # Forecast of what each card will report, given spending and payment timing
+    st.subheader("🎲 Utilization at Next Reporting Date")
+    st.caption("Simulates spending until each card's next reporting date and whether this cycle's payment "
+               "posts before it. Ranges show the 5th-95th percentile of outcomes.")
+    col1, col2 = st.columns(2)
+    with col1:
+        forecast_scenarios = st.select_slider("Scenarios", options=[1_000, 10_000, 100_000], value=10_000,
+                                              key='forecast_scenarios')
+    with col2:
+        forecast_spread = st.slider("Spending variability", 0.1, 1.5, 0.5, 0.1, key='forecast_spread',
+                                    help="Coefficient of variation of spending before the reporting date")
+    
+    forecast_key = (st.session_state.data_version, forecast_scenarios, forecast_spread, str(datetime.now().date()))
+    if st.session_state.get('forecast', (None,))[0] != forecast_key:
+        forecast_inputs = forecast.ForecastInputs(st.session_state.accounts)
+        st.session_state.forecast = (forecast_key, *forecast.run(forecast_inputs, forecast_scenarios,
+                                                                 spend_cv=forecast_spread))
+    _, forecast_accounts, forecast_total = st.session_state.forecast
+    
+    if len(forecast_accounts) == 0:
+        st.info("No active credit cards with a limit to forecast.")
+    else:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Likely Reported Utilization (P50)", f"{forecast_total['P50']:.1f}%",
+                      delta=f"{forecast_total['P50'] - cc_util:+.1f}% vs cards today", delta_color="inverse")
+        with col2:
+            st.metric("Best Case (P5)", f"{forecast_total['P5']:.1f}%")
+        with col3:
+            st.metric("Worst Case (P95)", f"{forecast_total['P95']:.1f}%")
+        
+        fig_bands = figure_cache.get('utilization_bands', forecast_key, figures.utilization_bands, forecast_accounts)
+        st.plotly_chart(fig_bands, use_container_width=True)
+        
+        at_risk = forecast_accounts[forecast_accounts['P50'] > 30]
+        if len(at_risk) > 0:
+            st.warning(f"⚠️ {len(at_risk)} card(s) are likely to report over 30% utilization: "
+                       + ", ".join(at_risk['Account Name']) + ". Paying before the reporting date lowers what is reported.")
+    
+    # Turn "I have $X this month" into per-card payments before each reporting date
+    st.subheader("🧮 Payment Plan Before Reporting")
+    st.caption("Covers every minimum payment first, then pays the highest-utilization cards down to a common "
+               "level. Pay each card by its Pay By date so the payment posts before the balance is reported.")
+    plan_budget = st.number_input("Cash available this month ($)", min_value=0.0, value=1000.0, step=100.0,
+                                  key='plan_budget')
+    plan_table, plan_summary = optimizer.plan(st.session_state.accounts, plan_budget)
+    
+    if len(plan_table) == 0:
+        st.info("No active credit cards with a limit to plan payments for.")
+    else:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Reported Utilization", f"{plan_summary['aggregate_after']:.1f}%",
+                      delta=f"{plan_summary['aggregate_after'] - plan_summary['aggregate_before']:+.1f}%",
+                      delta_color="inverse")
+        with col2:
+            st.metric("Highest Card Utilization", f"{plan_summary['max_after']:.1f}%",
+                      delta=f"{plan_summary['max_after'] - plan_summary['max_before']:+.1f}%", delta_color="inverse")
+        with col3:
+            st.metric("Left Over", f"${plan_summary['unused']:,.2f}")
+        
+        if plan_summary['minimums_short'] > 0:
+            st.error(f"🚨 This budget is ${plan_summary['minimums_short']:,.2f} short of covering all minimum "
+                     "payments. Minimums are paid in due-date order.")
+        
+        shown = plan_table[plan_table['Total Payment'] > 0].sort_values('Pay By', kind='stable').copy()
+        shown['Pay By'] = shown['Pay By'].dt.strftime(schema.DATE_FORMAT)
+        st.dataframe(shown, use_container_width=True, hide_index=True,
+                     column_config={
+                         'Current Balance': st.column_config.NumberColumn(format="$%.2f"),
+                         'Minimum Payment': st.column_config.NumberColumn(format="$%.2f"),
+                         'Extra Payment': st.column_config.NumberColumn(format="$%.2f"),
+                         'Total Payment': st.column_config.NumberColumn(format="$%.2f"),
+                         'Utilization Before %': st.column_config.NumberColumn(format="%.1f%%"),
+                         'Utilization After %': st.column_config.NumberColumn(format="%.1f%%"),
+                     })
+    
     # Payment history
     st.subheader("📅 Payment History Impact")
     col1, col2, col3 = st.columns(3)
     
-    perfect_history = len(st.session_state.accounts[st.session_state.accounts['Payment History'] == '100%'])
+    perfect_history = int((st.session_state.accounts['Payment History'] >= 100).sum())
     total_accounts = len(st.session_state.accounts)
     
     with col1:
@@ -1049,9 +1234,8 @@ with tab5:
     
     col1, col2 = st.columns(2)
     with col1:
-        fig_mix = px.pie(values=credit_mix.values, names=credit_mix.index, 
-                        title='Account Type Distribution',
-                        hole=0.4)
+        fig_mix = figure_cache.get('credit_mix_pie', st.session_state.data_version,
+                                   figures.credit_mix_pie, credit_mix)
         st.plotly_chart(fig_mix, use_container_width=True)
     
     with col2:
@@ -1106,15 +1290,15 @@ with tab5:
         recommendations.append(f"💳 **Focus on {high_util_count} card(s)**: These have utilization over 30%")
     
     reporting_this_month = st.session_state.accounts[
-        (pd.to_datetime(st.session_state.accounts['Reporting Date']) >= pd.Timestamp.now()) &
-        (pd.to_datetime(st.session_state.accounts['Reporting Date']) <= pd.Timestamp.now() + timedelta(days=30))
+        (st.session_state.accounts['Reporting Date'] >= pd.Timestamp.now()) &
+        (st.session_state.accounts['Reporting Date'] <= pd.Timestamp.now() + timedelta(days=30))
     ]
     
     if len(reporting_this_month) > 0:
         recommendations.append(f"📅 **{len(reporting_this_month)} account(s) reporting soon**: Pay before reporting date to lower reported balance")
     
-    if no_autopay.shape[0] > 0:
-        recommendations.append(f"🔄 **Enable autopay on {len(no_autopay)} account(s)**: Never miss a payment")
+    if alert_counts['no_autopay'] > 0:
+        recommendations.append(f"🔄 **Enable autopay on {alert_counts['no_autopay']} account(s)**: Never miss a payment")
     
     if not has_installment and has_credit_card:
         recommendations.append("🎯 **Diversify credit mix**: Consider adding an installment loan when appropriate")
@@ -1128,6 +1312,7 @@ with tab5:
     else:
         st.success("🌟 Excellent credit management! Keep up the great work!")
 
+profiler.mark('tabs.import_export')
 # Tab 6: Import/Export
 with tab6:
     st.header("💾 Import & Export Data")
@@ -1145,61 +1330,52 @@ with tab6:
         
         if uploaded_file is not None:
             try:
-                imported_df = pd.read_csv(uploaded_file)
+                preview_df = importer.preview_csv(uploaded_file)
                 
                 st.write("**Preview of imported data:**")
-                st.dataframe(imported_df.head(10), use_container_width=True)
+                st.dataframe(preview_df, use_container_width=True)
                 
-                st.write(f"**Total rows to import:** {len(imported_df)}")
+                st.write(f"**File size:** {uploaded_file.size:,} bytes")
                 
                 # Validate required columns
-                required_cols = ['Account Name', 'Account Type', 'Institution', 'Credit Limit', 'Current Balance']
-                missing_cols = [col for col in required_cols if col not in imported_df.columns]
+                missing_cols = importer.missing_columns(preview_df.columns)
                 
                 if len(missing_cols) == 0:
                     col1, col2 = st.columns(2)
                     with col1:
                         if st.button("✅ Confirm Import", use_container_width=True):
-                            # Add missing columns with defaults if needed
-                            default_values = {
-                                'Statement Balance': 0,
-                                'Minimum Payment': 0,
-                                'Due Date': (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d'),
-                                'Statement Date': datetime.now().strftime('%Y-%m-%d'),
-                                'Reporting Date': (datetime.now() + timedelta(days=5)).strftime('%Y-%m-%d'),
-                                'Last Payment Date': datetime.now().strftime('%Y-%m-%d'),
-                                'Last Payment Amount': 0,
-                                'APR': 0,
-                                'Rewards Points': 0,
-                                'Points Value': 0,
-                                'Annual Fee': 0,
-                                'Status': 'Active',
-                                'Open Date': datetime.now().strftime('%Y-%m-%d'),
-                                'Account Number': '****0000',
-                                'Credit Bureau': 'Unknown',
-                                'Payment History': '100%',
-                                'Account Age (Months)': 0,
-                                'Autopay Enabled': 'No',
-                                'Cashback Rate': '0%',
-                                'Notes': ''
-                            }
+                            progress_bar = st.progress(0.0, text="Importing...")
                             
-                            for col, default in default_values.items():
-                                if col not in imported_df.columns:
-                                    imported_df[col] = default
+                            def append_chunk(chunk):
+                                # Calculate utilization
+                                chunk['Utilization %'] = derived.utilization(chunk['Current Balance'], chunk['Credit Limit'])
+                                
+                                # Calculate points dollar value
+                                if 'Points Dollar Value' not in chunk.columns:
+                                    chunk['Points Dollar Value'] = derived.points_dollar_value(
+                                        chunk['Rewards Points'], chunk['Points Value']
+                                    )
+                                
+                                chunk = account_table.insert(chunk)
+                                payment_ledger.record_many(chunk.index, 'open', chunk['Current Balance'])
+                                totals.add(chunk)
+                                search_index.add(chunk)
+                                st.session_state.data_version += 1
+                                try:
+                                    account_store.insert(chunk)
+                                except storage.ConflictError as e:
+                                    reload_after_conflict(e)
+                                payment_ledger.save()
                             
-                            # Calculate utilization
-                            imported_df['Utilization %'] = imported_df.apply(
-                                lambda row: calculate_utilization(row['Current Balance'], row['Credit Limit']), axis=1
-                            )
+                            def show_progress(fraction, result):
+                                progress_bar.progress(fraction or 0.0, text=f"Imported {result.accepted:,} rows "
+                                                                            f"({result.rejected:,} rejected)")
                             
-                            # Calculate points dollar value
-                            if 'Points Dollar Value' not in imported_df.columns:
-                                imported_df['Points Dollar Value'] = imported_df['Rewards Points'] * imported_df['Points Value']
+                            result = importer.stream_csv(uploaded_file, append_chunk, total_bytes=uploaded_file.size,
+                                                         progress=show_progress)
                             
-                            # Append to existing data
-                            st.session_state.accounts = pd.concat([st.session_state.accounts, imported_df], ignore_index=True)
-                            st.success(f"✅ Successfully imported {len(imported_df)} accounts!")
+                            st.session_state.accounts = account_table.frame
+                            st.session_state['last_import'] = result
                             st.balloons()
                             st.rerun()
                     
@@ -1213,31 +1389,42 @@ with tab6:
             except Exception as e:
                 st.error(f"Error reading CSV: {str(e)}")
                 st.info("Make sure your CSV is properly formatted with comma-separated values")
+        
+        # Summary of the most recent import, including rows that failed validation
+        last_import = st.session_state.get('last_import')
+        if last_import is not None:
+            st.success(f"✅ Successfully imported {last_import.accepted:,} accounts!")
+            if last_import.rejected > 0:
+                st.warning(f"⚠️ {last_import.rejected:,} row(s) were rejected")
+                st.dataframe(last_import.rejected_rows, use_container_width=True, hide_index=True)
     
     with col2:
-        st.subheader("📤 Export to CSV")
+        st.subheader("📤 Export Accounts")
         
         export_options = st.multiselect(
             "Select account types to export",
             options=st.session_state.accounts['Account Type'].unique(),
             default=st.session_state.accounts['Account Type'].unique()
         )
+        export_format = st.selectbox("File format", export.available_formats(), key='export_format',
+                                     format_func=lambda fmt: export.FORMATS[fmt][0],
+                                     help="CSV files can be edited in a spreadsheet and re-imported; Parquet "
+                                          "keeps column types and is the smallest for large books")
         
         export_df = st.session_state.accounts[st.session_state.accounts['Account Type'].isin(export_options)]
         
         st.write(f"**Total accounts to export:** {len(export_df)}")
         st.write(f"**Total columns:** {len(export_df.columns)}")
         
-        # Create CSV download
-        csv_buffer = io.StringIO()
-        export_df.to_csv(csv_buffer, index=False)
-        csv_data = csv_buffer.getvalue()
-        
+        # Files are written only when a button is clicked and cached until the data or selection changes
+        export_version = (st.session_state.data_version, tuple(export_options))
+        export_cache.retain(export_version)
+        export_stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         st.download_button(
-            label="⬇️ Download Full CSV",
-            data=csv_data,
-            file_name=f"credit_accounts_full_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv",
+            label="⬇️ Download Full Export",
+            data=export_cache.deferred('full', export_format, export_version, export_df),
+            file_name=export.file_name(f"credit_accounts_full_{export_stamp}", export_format),
+            mime=export.mime(export_format),
             use_container_width=True,
             help="Download all account data with all fields"
         )
@@ -1247,15 +1434,11 @@ with tab6:
                           'Current Balance', 'Due Date', 'APR', 'Status']
         simplified_df = export_df[simplified_cols]
         
-        csv_buffer_simple = io.StringIO()
-        simplified_df.to_csv(csv_buffer_simple, index=False)
-        csv_data_simple = csv_buffer_simple.getvalue()
-        
         st.download_button(
-            label="⬇️ Download Simplified CSV",
-            data=csv_data_simple,
-            file_name=f"credit_accounts_simple_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv",
+            label="⬇️ Download Simplified Export",
+            data=export_cache.deferred('simple', export_format, export_version, simplified_df),
+            file_name=export.file_name(f"credit_accounts_simple_{export_stamp}", export_format),
+            mime=export.mime(export_format),
             use_container_width=True,
             help="Download basic account information only"
         )
@@ -1273,10 +1456,148 @@ with tab6:
         st.markdown("### 📊 Export Statistics")
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("Total Export Size", f"{len(csv_data):,} bytes")
+            export_size = export_cache.size('full', export_format, export_version)
+            st.metric("Total Export Size", f"{export_size:,} bytes" if export_size is not None else "On download")
         with col2:
             st.metric("Rows × Columns", f"{len(export_df)} × {len(export_df.columns)}")
+        
+        with st.expander("🧠 Memory Usage"):
+            st.caption("Bytes per column held as plain text versus the compact categorical, boolean and "
+                       "percentage types the tracker uses")
+            if st.session_state.get('memory_report', (None,))[0] != st.session_state.data_version:
+                st.session_state.memory_report = (st.session_state.data_version,
+                                                  schema.memory_report(st.session_state.accounts))
+            _, memory = st.session_state.memory_report
+            st.dataframe(memory, use_container_width=True)
+
+profiler.mark('tabs.payoff_planner')
+# Tab 7: Payoff Planner
+with tab7:
+    st.header("💸 Debt Payoff Planner")
+    st.markdown("Project how long it takes to pay off every active balance and what it costs in interest. "
+                "Your monthly budget is the sum of today's minimum payments plus any extra you add; "
+                "as accounts are paid off, their minimums roll into the next target.")
+    
+    debts = st.session_state.accounts[
+        (st.session_state.accounts['Status'] == 'Active') &
+        (st.session_state.accounts['Current Balance'] > 0)
+    ]
+    
+    if len(debts) == 0:
+        st.info("No active balances to pay off.")
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            payoff_strategy = st.radio("Strategy", payoff.STRATEGIES, horizontal=True, key='payoff_strategy',
+                                       help="Avalanche: highest APR first. Snowball: smallest balance first. "
+                                            "Custom: your own order.")
+        with col2:
+            payoff_extra = st.number_input("Extra Monthly Payment ($)", min_value=0.0, value=0.0, step=50.0,
+                                           key='payoff_extra')
+        
+        payoff_order = None
+        if payoff_strategy == 'Custom':
+            payoff_order = st.multiselect("Pay these first (in order)", options=list(debts.index),
+                                          format_func=lambda i: debts.at[i, 'Account Name'], key='payoff_order',
+                                          help="Accounts you leave out follow in avalanche order")
+        
+        # Both runs are kept until the data or a strategy input changes (payoff months count from today)
+        payoff_version = (st.session_state.data_version, payoff_strategy, payoff_extra, tuple(payoff_order or ()))
+        payoff_key = payoff_version + (str(datetime.now().date()),)
+        if st.session_state.get('payoff', (None,))[0] != payoff_key:
+            result, payoff_table = payoff.simulate_frame(debts, extra=payoff_extra, strategy=payoff_strategy,
+                                                         order=payoff_order)
+            baseline = None
+            if payoff_extra > 0:
+                baseline, _ = payoff.simulate_frame(debts, strategy=payoff_strategy, order=payoff_order)
+            st.session_state.payoff = (payoff_key, result, payoff_table, baseline)
+        _, result, payoff_table, baseline = st.session_state.payoff
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            months = result.debt_free_months
+            st.metric("Debt-Free In", f"{months} months" if months is not None else f"> {payoff.MAX_MONTHS} months")
+        with col2:
+            st.metric("Total Interest", f"${result.total_interest:,.0f}",
+                      delta=f"-${baseline.total_interest - result.total_interest:,.0f}" if payoff_extra > 0 else None,
+                      delta_color="inverse")
+        with col3:
+            st.metric("Monthly Budget", f"${debts['Minimum Payment'].sum() + payoff_extra:,.0f}")
+        with col4:
+            never = int(np.isnan(result.months).sum())
+            st.metric("Not Paid Off", never, help=f"Accounts still owing after {payoff.MAX_MONTHS} months")
+        
+        # The strategy inputs are part of the version, not builder arguments
+        fig_payoff = figure_cache.get('payoff_curve', payoff_version, figures.payoff_curve, result.balance_curve())
+        st.plotly_chart(fig_payoff, use_container_width=True)
+        
+        shown = payoff_table.sort_values('Months to Payoff', kind='stable').copy()
+        shown['Payoff Month'] = shown['Payoff Month'].dt.strftime('%b %Y').fillna('Not within horizon')
+        st.dataframe(shown, use_container_width=True, hide_index=True,
+                     column_config={
+                         'APR': st.column_config.NumberColumn(format="%.2f%%"),
+                         'Current Balance': st.column_config.NumberColumn(format="$%.2f"),
+                         'Total Interest': st.column_config.NumberColumn(format="$%.2f"),
+                         'Total Paid': st.column_config.NumberColumn(format="$%.2f"),
+                     })
 
+profiler.mark('tabs.trends')
+# Tab 8: Trends
+with tab8:
+    st.header("📈 Balance & Utilization Trends")
+    
+    history_span = history_store.span()
+    if history_span is None or history_span[0] == history_span[1]:
+        st.info("History builds up one snapshot per day as you use the app. "
+                "Generate sample history to see how the trend charts look.")
+        if st.button("🧪 Generate 2 Years of Sample History", key='seed_history'):
+            history_store.record_rows(history.simulate_history(st.session_state.accounts, days=730), 'sample')
+            st.rerun()
+    else:
+        first_day, last_day = history_span
+        col1, col2 = st.columns(2)
+        with col1:
+            trend_range = st.radio("Range", ["3 Months", "1 Year", "All"], index=1, horizontal=True, key='trend_range')
+        with col2:
+            trend_freq = st.radio("Resolution", list(history.FREQUENCIES), index=1, horizontal=True, key='trend_freq')
+        
+        range_days = {"3 Months": 91, "1 Year": 365}.get(trend_range)
+        trend_start = max(first_day, last_day - pd.Timedelta(days=range_days)) if range_days else first_day
+        freq = history.FREQUENCIES[trend_freq]
+        # Portfolio lines come from the per-month rollups, not the per-account rows
+        trend_totals = history_store.totals(trend_start, last_day, freq)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Balance", f"${trend_totals['balance'].iloc[-1]:,.0f}",
+                      delta=f"${trend_totals['balance'].iloc[-1] - trend_totals['balance'].iloc[0]:+,.0f} over range",
+                      delta_color="inverse")
+        with col2:
+            st.metric("Credit Card Utilization", f"{trend_totals['card_utilization'].iloc[-1]:.1f}%",
+                      delta=f"{trend_totals['card_utilization'].iloc[-1] - trend_totals['card_utilization'].iloc[0]:+.1f}%",
+                      delta_color="inverse")
+        with col3:
+            st.metric("Days of History", f"{(last_day - first_day).days + 1:,}")
+        
+        trend_version = (st.session_state.data_version, str(trend_start), str(last_day), freq)
+        st.plotly_chart(figure_cache.get('portfolio_trend', trend_version, figures.portfolio_trend, trend_totals),
+                        use_container_width=True)
+        
+        # Per-account lines only load the months in range
+        top_accounts = st.session_state.accounts.nlargest(5, 'Current Balance').index
+        trend_accounts = st.multiselect("Accounts", options=list(st.session_state.accounts.index),
+                                        default=list(top_accounts), key='trend_accounts',
+                                        format_func=lambda i: st.session_state.accounts.at[i, 'Account Name'])
+        trend_value = st.radio("Show", ["Balance", "Utilization"], horizontal=True, key='trend_value')
+        if trend_accounts:
+            series = history_store.account_series(trend_start, last_day, trend_accounts,
+                                                  value=trend_value.lower(), freq=freq)
+            series.columns = [st.session_state.accounts.at[i, 'Account Name'] for i in series.columns]
+            st.plotly_chart(figure_cache.get('account_trend', trend_version + (trend_value, tuple(trend_accounts)),
+                                             figures.account_trend, series, trend_value),
+                            use_container_width=True)
+
+profiler.mark('demo_csv')
 # Demo CSV Download
 st.divider()
 st.header("📁 Demo CSV Template")
@@ -1298,6 +1619,7 @@ st.download_button(
     help="Download this template to see the expected CSV format with sample data"
 )
 
+profiler.mark('footer')
 # Footer with tips
 st.divider()
 
@@ -1340,10 +1662,43 @@ with col1:
     st.code(f"{len(st.session_state.accounts)} accounts")
 with col2:
     st.markdown("**💾 Data Storage**")
-    st.code("Session State (In-Memory)")
+    st.code(account_store.description)
+    if shared_book:
+        cache_stats = portfolio_cache.stats()
+        st.caption(f"{f'Portfolio `{portfolio_id}`' if portfolio_template else 'Shared book'} · "
+                   f"{cache_stats['portfolios']} cached "
+                   f"({cache_stats['bytes'] / 2**20:,.1f} MB), {cache_stats['hits']:,} hits / "
+                   f"{cache_stats['misses']:,} loads / {cache_stats['evictions']:,} evictions")
 with col3:
     st.markdown("**🔄 Last Updated**")
     st.code(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
 
 st.markdown("---")
 st.markdown("**Credit & Trade Line Manager Pro** | Professional credit account tracking and optimization | © 2025")
+
+# Performance panel, only shown in debug mode
+profiler.end_run()
+if st.query_params.get('debug') == '1' or os.environ.get('CREDITTRACKER_DEBUG') == '1':
+    with st.expander("🛠️ Performance (debug)"):
+        st.caption(f"{profiler.runs:,} reruns timed this session; last rerun took "
+                   f"{profiler.last_run.get('total', 0) * 1000:,.0f} ms")
+        st.dataframe(profiler.summary(), use_container_width=True, hide_index=True)
+        col1, col2 = st.columns(2)
+        with col1:
+            capture_mode = st.selectbox("Capture next rerun", profiling.CAPTURE_MODES, key='profile_capture')
+            if st.button("🔬 Capture Rerun", use_container_width=True):
+                profiler.capture_next = capture_mode
+                st.rerun()
+        with col2:
+            st.download_button(
+                label="⬇️ Download Timings (JSON)",
+                data=profiler.dump({'app': 'App.py', 'accounts': len(st.session_state.accounts)}),
+                file_name=f"credittracker_timings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                mime="application/json",
+                use_container_width=True,
+                help="Compare two dumps with: python -m credittracker.profiling before.json after.json"
+            )
+        if profiler.last_capture:
+            capture_kind, capture_report = profiler.last_capture
+            st.markdown(f"**Last {capture_kind} capture**")
+            st.code(capture_report)
@@ -0,0 +1,80 @@
+"""
+Running dashboard totals vs. full recompute.
+
+Times reading the dashboard metrics from a full recompute over the frame
+and from the incrementally maintained totals. That the running totals stay
+equal to a recompute under random writes is checked by
+tests/test_aggregates.py.
+
+Run: python benchmarks/bench_aggregates.py [rows]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker.aggregates import PortfolioTotals
+
+TYPES = ['Credit Card', 'Installment Loan', 'Mortgage', 'Personal Loan', 'Auto Loan']
+
+
+def make_rows(rng, n, start=0):
+    return pd.DataFrame({
+        'Account Type': rng.choice(TYPES, size=n, p=[0.7, 0.1, 0.05, 0.1, 0.05]),
+        'Credit Limit': rng.choice([0, 1000, 5000, 15000], size=n).astype(float),
+        'Current Balance': np.round(rng.random(n) * 6000, 2) * (rng.random(n) > 0.2),
+        'Rewards Points': rng.integers(0, 80000, size=n),
+        'Points Dollar Value': np.round(rng.random(n) * 500, 2),
+        'Minimum Payment': np.round(rng.random(n) * 200, 2),
+        'Annual Fee': rng.choice([0, 95, 250, 550], size=n),
+        'APR': np.round(rng.uniform(3, 30, size=n), 2),
+        'Status': rng.choice(['Active', 'Closed', 'Frozen'], size=n, p=[0.9, 0.05, 0.05]),
+        'Autopay Enabled': rng.choice(['Yes', 'No'], size=n),
+        'Account Age (Months)': rng.integers(0, 240, size=n),
+    }, index=pd.RangeIndex(start, start + n))
+
+
+def recompute(df):
+    cards = df[df['Account Type'] == 'Credit Card']
+    return (df['Credit Limit'].sum(), df['Current Balance'].sum(), df['Rewards Points'].sum(),
+            df['Points Dollar Value'].sum(), df['Minimum Payment'].sum(),
+            cards['Credit Limit'].sum(), cards['Current Balance'].sum(),
+            df[df['Account Type'].isin(['Installment Loan', 'Mortgage', 'Personal Loan'])]['Current Balance'].sum(),
+            df[df['Current Balance'] > 0]['APR'].mean(), df['Annual Fee'].sum(),
+            len(df[df['Status'] == 'Active']), len(df[df['Autopay Enabled'] == 'Yes']),
+            df['Account Age (Months)'].mean())
+
+
+def read_totals(totals):
+    return (totals.total_limit, totals.total_balance, totals.total_points, totals.total_points_value,
+            totals.total_min_payments, totals.cc_utilization, totals.total_loan_balance, totals.avg_apr,
+            totals.total_annual_fees, totals.active_count, totals.autopay_count, totals.avg_age_months)
+
+
+def best_of(fn, arg, repeat=20):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv):
+    n = int(argv[1]) if len(argv) > 1 else 50_000
+    df = make_rows(np.random.default_rng(0), n)
+    totals = PortfolioTotals.from_frame(df)
+    print(f"rows={len(df):,}")
+    t_full = best_of(recompute, df)
+    t_inc = best_of(read_totals, totals)
+    print(f"full recompute  {t_full * 1e3:10.3f} ms")
+    print(f"running totals  {t_inc * 1e3:10.3f} ms")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
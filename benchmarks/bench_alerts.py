@@ -0,0 +1,110 @@
+"""
+Alerts tab: per-rule masks with row-by-row day counts vs. the single-pass engine.
+
+The legacy path mirrors what the tab used to do: six boolean masks, each
+re-parsing the date strings, and an iterrows loop per rule computing the day
+counts. Both paths must agree on which accounts fire which rule and on the
+day counts before anything is timed.
+
+Run: python benchmarks/bench_alerts.py [rows]
+"""
+
+import os
+import sys
+import time
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import alerts, schema
+
+TYPES = ['Credit Card', 'Installment Loan', 'Mortgage', 'Personal Loan', 'Auto Loan']
+
+
+def make_accounts(rng, n, now):
+    today = now.normalize()
+    limit = rng.choice([0, 1000, 5000, 15000], size=n).astype(float)
+    balance = np.round(rng.random(n) * 12000, 2) * (rng.random(n) > 0.2)
+    util = np.where(limit > 0, np.round(balance / np.where(limit > 0, limit, 1) * 100, 2), 0.0)
+
+    def days(lo, hi):
+        return today + pd.to_timedelta(rng.integers(lo, hi, size=n), unit='D')
+
+    return pd.DataFrame({
+        'Account Name': [f'Account {i}' for i in range(n)],
+        'Account Type': rng.choice(TYPES, size=n, p=[0.7, 0.1, 0.05, 0.1, 0.05]),
+        'Institution': rng.choice(['Chase', 'Amex', 'Citi', 'Discover'], size=n),
+        'Credit Limit': limit,
+        'Current Balance': balance,
+        'Utilization %': util,
+        'Minimum Payment': np.round(rng.random(n) * 200, 2),
+        'Annual Fee': rng.choice([0, 95, 250, 550], size=n),
+        'Status': rng.choice(['Active', 'Closed', 'Frozen'], size=n, p=[0.9, 0.05, 0.05]),
+        'Autopay Enabled': rng.choice(['Yes', 'No'], size=n),
+        'Due Date': days(-20, 40),
+        'Reporting Date': days(-10, 30),
+        'Open Date': days(-3650, 0),
+    })
+
+
+def legacy(df, now):
+    """The old tab logic, on a frame whose dates are strings."""
+    due = pd.to_datetime(df['Due Date'])
+    active = df['Status'] == 'Active'
+    found = {}
+    overdue = df[(due < now) & active & (df['Current Balance'] > 0)]
+    found['overdue'] = {i: -(now - pd.to_datetime(r['Due Date'])).days for i, r in overdue.iterrows()}
+    due = pd.to_datetime(df['Due Date'])
+    due_soon = df[(due >= now) & (due <= now + timedelta(days=7)) & active & (df['Current Balance'] > 0)]
+    found['due_soon'] = {i: (pd.to_datetime(r['Due Date']) - now).days for i, r in due_soon.iterrows()}
+    high = df[(df['Utilization %'] > 70) & (df['Account Type'] == 'Credit Card') & active]
+    found['high_utilization'] = {i: None for i, r in high.iterrows()}
+    report = pd.to_datetime(df['Reporting Date'])
+    soon = df[(report >= now) & (report <= now + timedelta(days=5)) & active & (df['Utilization %'] > 30)]
+    found['reporting_soon'] = {i: (pd.to_datetime(r['Reporting Date']) - now).days for i, r in soon.iterrows()}
+    no_autopay = df[(df['Autopay Enabled'] == 'No') & active]
+    found['no_autopay'] = {i: None for i, r in no_autopay.iterrows()}
+    fee = df[(df['Annual Fee'] > 0) & (pd.to_datetime(df['Open Date']).dt.month == now.month)]
+    found['annual_fee'] = {i: None for i, r in fee.iterrows()}
+    return found
+
+
+def engine(df, now):
+    table = alerts.evaluate(df, now=now)
+    found = {rule: {} for rule in alerts.RULES}
+    for key, rule, days in zip(table.index, table['rule'], table['days_delta']):
+        found[rule][key] = None if np.isnan(days) else int(days)
+    return found
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main(argv):
+    n = int(argv[1]) if len(argv) > 1 else 100_000
+    rng = np.random.default_rng(11)
+    now = pd.Timestamp.now()
+    typed = make_accounts(rng, n, now)
+    as_strings = typed.copy()
+    for col in ['Due Date', 'Reporting Date', 'Open Date']:
+        as_strings[col] = as_strings[col].dt.strftime(schema.DATE_FORMAT)
+
+    old, old_s = timed(legacy, as_strings, now)
+    new, new_s = timed(engine, typed, now)
+    assert old == new, "engine and legacy disagree"
+    _, eval_s = timed(alerts.evaluate, typed, now)
+
+    hits = sum(len(v) for v in new.values())
+    print(f"{n:,} accounts, {hits:,} alerts")
+    print(f"  legacy masks + iterrows : {old_s * 1000:10.1f} ms")
+    print(f"  alerts.evaluate         : {eval_s * 1000:10.1f} ms  ({old_s / eval_s:,.0f}x)")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,75 @@
+"""
+Sequential account adds: pd.concat per add vs. AccountTable's append buffer.
+
+"read every add" is how the Add Account form uses the table: every view
+reads the whole frame on the rerun after each add, so the buffer is
+compacted each time and saves nothing over pd.concat. The buffer pays off
+when many inserts land between reads ("no reads", "read every 100"), as in
+the chunked CSV import.
+
+Run: python benchmarks/bench_append.py [adds]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker.table import AccountTable
+
+
+def new_account(i):
+    # One-row frame shaped like the Add Account form's
+    return pd.DataFrame({
+        'Account Name': [f'Account {i}'],
+        'Account Type': ['Credit Card'],
+        'Institution': ['Bank'],
+        'Credit Limit': [5000.0],
+        'Current Balance': [float(i % 5000)],
+        'Due Date': [pd.Timestamp('2025-11-05')],
+        'APR': [19.99],
+        'Notes': [''],
+    })
+
+
+def concat_each(rows):
+    df = rows[0]
+    for row in rows[1:]:
+        df = pd.concat([df, row], ignore_index=True)
+    return df
+
+
+def buffered(rows, read_every=None):
+    table = AccountTable(rows[0])
+    for i, row in enumerate(rows[1:], 1):
+        table.insert(row)
+        if read_every and i % read_every == 0:
+            table.frame
+    return table.frame
+
+
+def timed(label, fn, *args):
+    start = time.perf_counter()
+    df = fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:32s} {elapsed * 1000:10.1f} ms  ({len(df):,} rows)")
+    return df
+
+
+def main(argv):
+    n = int(argv[1]) if len(argv) > 1 else 10_000
+    rows = [new_account(i) for i in range(n)]
+    print(f"adds={n:,}")
+    old = timed("pd.concat per add", concat_each, rows)
+    new = timed("append buffer, no reads", buffered, rows)
+    timed("append buffer, read every 100", buffered, rows, 100)
+    timed("append buffer, read every add", buffered, rows, 1)
+    np.testing.assert_array_equal(old['Current Balance'].to_numpy(), new['Current Balance'].to_numpy())
+
+
+if __name__ == '__main__':
+    main(sys.argv)
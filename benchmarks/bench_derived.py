@@ -0,0 +1,101 @@
+"""
+Derived-column benchmark: per-row ``apply`` vs. whole-column NumPy.
+
+Run: python benchmarks/bench_derived.py [rows]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import derived
+
+
+# Row-at-a-time helpers as they appear in App.py / 5App.py
+def calculate_utilization(balance, limit):
+    if limit > 0:
+        return round((balance / limit) * 100, 2)
+    return 0
+
+
+def days_until(date_str):
+    try:
+        d = pd.to_datetime(date_str).normalize()
+        return (d - pd.Timestamp(datetime.now().date())).days
+    except Exception:
+        return None
+
+
+def days_since(date_str):
+    try:
+        d = pd.to_datetime(date_str).normalize()
+        return (pd.Timestamp(datetime.now().date()) - d).days
+    except Exception:
+        return None
+
+
+def make_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp.now().normalize()
+    limit = rng.choice([0, 500, 1000, 5000, 10000, 25000], size=n).astype(float)
+    limit[rng.random(n) < 0.01] = np.nan
+    offsets = pd.to_timedelta(rng.integers(-60, 60, size=n), unit='D')
+    return pd.DataFrame({
+        'Credit Limit': limit,
+        'Current Balance': np.round(rng.random(n) * 8000, 2),
+        'Due Date': (today + offsets).strftime('%Y-%m-%d'),
+        'Reporting Date': (today - offsets).strftime('%Y-%m-%d'),
+        'Rewards Points': rng.integers(0, 100000, size=n),
+        'Points Value': rng.choice([0.0, 0.01, 0.015, 0.02], size=n),
+    })
+
+
+def run_apply(df):
+    return pd.DataFrame({
+        'util': df.apply(lambda row: calculate_utilization(row['Current Balance'], row['Credit Limit']), axis=1),
+        'due': df['Due Date'].apply(days_until),
+        'since': df['Reporting Date'].apply(days_since),
+        'points': df['Rewards Points'] * df['Points Value'],
+    })
+
+
+def run_vectorized(df):
+    return pd.DataFrame({
+        'util': derived.utilization(df['Current Balance'], df['Credit Limit']),
+        'due': derived.days_until(df['Due Date']),
+        'since': derived.days_since(df['Reporting Date']),
+        'points': derived.points_dollar_value(df['Rewards Points'], df['Points Value']),
+    })
+
+
+def timed(fn, df, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(df)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv):
+    n = int(argv[1]) if len(argv) > 1 else 50_000
+    df = make_frame(n)
+    t_apply, slow = timed(run_apply, df, 1)
+    t_vec, fast = timed(run_vectorized, df, 5)
+    # np.round and round() can disagree by one cent on half-cent ties
+    np.testing.assert_allclose(slow.astype(float).to_numpy(), fast.astype(float).to_numpy(), atol=0.01)
+    print(f"rows={n:,}")
+    print(f"apply      {t_apply * 1000:10.1f} ms")
+    print(f"vectorized {t_vec * 1000:10.1f} ms")
+    print(f"speedup    {t_apply / t_vec:10.1f}x")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
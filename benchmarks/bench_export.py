@@ -0,0 +1,56 @@
+"""
+Export formats: time, file size and peak memory per format.
+
+Builds a synthetic book and writes it once the old way (the whole frame
+into an ``io.StringIO``, then encoded for the download) and once per
+``export`` format in ``chunk_rows`` slices (a tenth of the book by
+default). Each is timed on its own, then run again under tracemalloc for
+its peak Python allocations, which is much slower. Excel is skipped when
+xlsxwriter is not installed.
+
+Run: python benchmarks/bench_export.py [rows] [chunk_rows]
+"""
+
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import export, schema, synthetic
+
+
+def measure(fn):
+    start = time.perf_counter()
+    data = fn()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, len(data), peak
+
+
+def string_csv(accounts):
+    buffer = io.StringIO()
+    schema.for_export(accounts).to_csv(buffer, index=False, date_format=schema.DATE_FORMAT)
+    return buffer.getvalue().encode('utf-8')
+
+
+def main(argv):
+    n = int(argv[1]) if len(argv) > 1 else 50_000
+    chunk_rows = int(argv[2]) if len(argv) > 2 else max(n // 10, 1)
+    accounts = synthetic.generate_portfolio(n, seed=0, today='2025-10-15')
+    print(f"{n:,} accounts, {chunk_rows:,} rows per chunk")
+    cases = [('StringIO csv', lambda: string_csv(accounts))]
+    cases += [(fmt, lambda fmt=fmt: export.to_bytes(accounts, fmt, chunk_rows)) for fmt in export.available_formats()]
+    for label, fn in cases:
+        seconds, size, peak = measure(fn)
+        print(f"  {label:<21}: {seconds * 1000:10.1f} ms, {size / 2**20:8.2f} MiB file, "
+              f"{peak / 2**20:8.2f} MiB peak")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,62 @@
+"""
+Utilization-at-reporting forecast: scenarios per second, in process and
+across a process pool.
+
+Checks that the pooled run returns exactly the in-process result (each
+account block has its own seed) and prints the timings.
+
+Run: python benchmarks/bench_forecast.py [cards] [scenarios] [workers]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import forecast
+
+
+def make_cards(rng, n):
+    today = pd.Timestamp.now().normalize()
+    limit = rng.choice([1000, 5000, 15000, 30000], size=n).astype(float)
+    balance = np.round(limit * rng.uniform(0, 0.9, n), 2)
+    return pd.DataFrame({
+        'Account Name': [f'Card {i}' for i in range(n)],
+        'Account Type': 'Credit Card',
+        'Status': 'Active',
+        'Credit Limit': limit,
+        'Current Balance': balance,
+        'Statement Balance': np.round(balance * rng.uniform(0.8, 1.2, n), 2),
+        'Minimum Payment': np.round(np.maximum(balance * 0.03, 25), 2),
+        'Last Payment Amount': np.round(balance * rng.uniform(0, 1.2, n), 2),
+        'Reporting Date': today + pd.to_timedelta(rng.integers(-30, 30, n), unit='D'),
+        'Due Date': today + pd.to_timedelta(rng.integers(-30, 30, n), unit='D'),
+    })
+
+
+def main(argv):
+    n = int(argv[1]) if len(argv) > 1 else 500
+    scenarios = int(argv[2]) if len(argv) > 2 else 100_000
+    workers = int(argv[3]) if len(argv) > 3 else (os.cpu_count() or 1)
+    inputs = forecast.ForecastInputs(make_cards(np.random.default_rng(15), n))
+
+    start = time.perf_counter()
+    serial = forecast.run(inputs, scenarios)
+    serial_s = time.perf_counter() - start
+    start = time.perf_counter()
+    pooled = forecast.run(inputs, scenarios, workers=workers)
+    pooled_s = time.perf_counter() - start
+
+    assert serial[1] == pooled[1] and serial[0].equals(pooled[0]), "pooled result differs"
+    draws = n * scenarios
+    print(f"{n:,} cards x {scenarios:,} scenarios, aggregate bands {serial[1]}")
+    print(f"  in process      : {serial_s:7.2f} s  ({draws / serial_s / 1e6:6.1f} M draws/s)")
+    print(f"  {workers:2d} workers      : {pooled_s:7.2f} s  ({draws / pooled_s / 1e6:6.1f} M draws/s)")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,66 @@
+"""
+History store: rollup-backed trend queries vs. aggregating the raw rows.
+
+Builds a multi-year daily history for a large book (in memory and as
+month-partitioned Parquet in a temporary directory), checks that the rollup
+totals match a groupby over the raw rows, then times the portfolio trend,
+a per-account range query and weekly/monthly resampling.
+
+Run: python benchmarks/bench_history.py [accounts] [days]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import history
+
+
+def make_accounts(rng, n):
+    limit = rng.choice([0, 1000, 5000, 15000], size=n).astype(float)
+    return pd.DataFrame({
+        'Account Type': rng.choice(['Credit Card', 'Installment Loan', 'Mortgage'], size=n, p=[0.8, 0.15, 0.05]),
+        'Credit Limit': limit,
+        'Current Balance': np.round(rng.random(n) * np.where(limit > 0, limit, 20000), 2),
+    })
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main(argv):
+    n = int(argv[1]) if len(argv) > 1 else 5_000
+    days = int(argv[2]) if len(argv) > 2 else 3 * 365
+    rng = np.random.default_rng(18)
+    accounts = make_accounts(rng, n)
+    rows = history.simulate_history(accounts, days=days, seed=18)
+    end = rows['date'].max()
+    start = end - pd.Timedelta(days=days - 1)
+    some = accounts.index[:10]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, store in [('memory', history.open_history()), ('parquet', history.open_history(f'parquet://{tmp}'))]:
+            _, write_ms = timed(store.record_rows, rows, 'sample')
+            totals, totals_ms = timed(store.totals, start, end, 'W')
+            raw, raw_ms = timed(lambda: history.daily_rollup(store.query(start, end)).resample('W').last())
+            assert np.allclose(totals['balance'].to_numpy(), raw['balance'].to_numpy())
+            _, query_ms = timed(store.account_series, end - pd.Timedelta(days=365), end, some, freq='D')
+            _, monthly_ms = timed(store.account_series, start, end, some, value='utilization', freq='MS')
+            print(f"{name}: {n:,} accounts x {days:,} days = {len(rows):,} rows (write {write_ms:,.0f} ms)")
+            print(f"  weekly totals from rollups   : {totals_ms:9.1f} ms")
+            print(f"  weekly totals from raw rows  : {raw_ms:9.1f} ms")
+            print(f"  10 accounts, 1 year, daily   : {query_ms:9.1f} ms")
+            print(f"  10 accounts, all, monthly    : {monthly_ms:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,57 @@
+"""
+Cold import time of the core modules vs. the UI stack.
+
+Each module is imported in a fresh interpreter (best of ``repeat`` runs);
+pandas is listed first since every core module pays for it. The script
+fails if importing any credittracker module drags in Streamlit, Plotly or
+Altair.
+
+Run: python benchmarks/bench_import_time.py [repeat]
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BASELINE = ['pandas']
+CORE_MODULES = ['credittracker.core', 'credittracker.alerts', 'credittracker.scan', 'credittracker.figures']
+UI_MODULES = ['plotly.express', 'altair', 'streamlit']
+HEAVY = ('streamlit', 'plotly', 'altair')
+
+PROBE = '''
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted({{m.split('.')[0] for m in sys.modules}} & set({heavy!r}))
+print(elapsed, ','.join(heavy))
+'''
+
+
+def measure(module, repeat):
+    best, heavy = None, ''
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY)],
+                             cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()
+        elapsed = float(out[0])
+        heavy = out[1] if len(out) > 1 else ''
+        best = elapsed if best is None else min(best, elapsed)
+    return best, heavy
+
+
+def main(argv):
+    repeat = int(argv[1]) if len(argv) > 1 else 5
+    leaks = []
+    for module in BASELINE + CORE_MODULES + UI_MODULES:
+        seconds, heavy = measure(module, repeat)
+        print(f"  {module:24s} {seconds * 1000:8.1f} ms  {heavy}")
+        if module in CORE_MODULES and heavy:
+            leaks.append(module)
+    if leaks:
+        sys.exit(f"heavy UI imports pulled in by: {', '.join(leaks)}")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
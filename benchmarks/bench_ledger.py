@@ -0,0 +1,58 @@
+"""
+Payment ledger: event append rate and snapshot vs. full-replay rebuilds.
+
+Opens a large book, records a random stream of payments, charges and
+adjustments, checks the incrementally maintained balances against a replay,
+then times rebuilding the view from the latest snapshot versus from the
+first event.
+
+Run: python benchmarks/bench_ledger.py [accounts] [events]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker.ledger import Ledger
+
+
+def main(argv):
+    n = int(argv[1]) if len(argv) > 1 else 100_000
+    events = int(argv[2]) if len(argv) > 2 else 1_000_000
+    rng = np.random.default_rng(17)
+    accounts = pd.DataFrame({'Current Balance': np.round(rng.uniform(0, 10_000, n), 2)})
+    ledger = Ledger.from_frame(accounts, snapshot_every=50_000)
+    ids = rng.integers(0, n, events)
+    kinds = rng.choice(['payment', 'charge', 'adjustment'], events, p=[0.5, 0.4, 0.1])
+    amounts = np.round(rng.uniform(1, 500, events), 2) * np.where(kinds == 'payment', -1, 1)
+
+    start = time.perf_counter()
+    for account_id, kind, amount in zip(ids.tolist(), kinds.tolist(), amounts.tolist()):
+        ledger.record(account_id, kind, amount)
+    append_s = time.perf_counter() - start
+    assert ledger.verify(), "materialized balances differ from replay"
+
+    start = time.perf_counter()
+    ledger.rebuild()
+    snapshot_s = time.perf_counter() - start
+    start = time.perf_counter()
+    ledger.rebuild(use_snapshots=False)
+    replay_s = time.perf_counter() - start
+    start = time.perf_counter()
+    ledger.history(int(ids[0]))
+    history_s = time.perf_counter() - start
+
+    print(f"{n:,} accounts, {len(ledger):,} events")
+    print(f"  record()               : {events / append_s:12,.0f} events/s")
+    print(f"  rebuild from snapshot  : {snapshot_s * 1000:10.1f} ms")
+    print(f"  rebuild from event 0   : {replay_s * 1000:10.1f} ms")
+    print(f"  one account's history  : {history_s * 1000:10.1f} ms")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
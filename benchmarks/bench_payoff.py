@@ -0,0 +1,87 @@
+"""
+Payoff simulator: per-account Python loop vs. the array engine.
+
+Both paths must give the same payoff month and interest per account for
+every strategy before the engine is timed on a large book over the full
+360-month horizon.
+
+Run: python benchmarks/bench_payoff.py [rows]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import payoff
+
+
+def make_debts(rng, n):
+    balances = np.round(rng.uniform(100, 20000, n), 2)
+    aprs = np.round(rng.uniform(3, 30, n), 2)
+    minimums = np.round(np.maximum(balances * 0.02, 25), 2)
+    return balances, aprs, minimums
+
+
+def reference(balances, aprs, minimums, extra, rank, max_months=payoff.MAX_MONTHS):
+    """Month-by-month, account-by-account version of payoff.simulate."""
+    bal = list(balances)
+    n = len(bal)
+    budget = sum(m for m, b in zip(minimums, bal) if b > 0) + extra
+    months = [0 if b <= 0 else None for b in bal]
+    interest = [0.0] * n
+    for month in range(1, max_months + 1):
+        if all(b <= 0 for b in bal):
+            break
+        for i in range(n):
+            accrued = bal[i] * aprs[i] / 1200
+            interest[i] += accrued
+            bal[i] += accrued
+        pay = [min(minimums[i], bal[i]) for i in range(n)]
+        left = budget - sum(pay)
+        for i in rank:
+            if left <= 0:
+                break
+            amount = min(left, bal[i] - pay[i])
+            pay[i] += amount
+            left -= amount
+        for i in range(n):
+            bal[i] -= pay[i]
+            if bal[i] < 0.005:
+                bal[i] = 0
+            if bal[i] == 0 and months[i] is None:
+                months[i] = month
+    return np.array([np.nan if m is None else m for m in months]), np.array(interest)
+
+
+def main(argv):
+    n = int(argv[1]) if len(argv) > 1 else 5_000
+    rng = np.random.default_rng(14)
+
+    small = make_debts(rng, 200)
+    for strategy in payoff.STRATEGIES:
+        order = [3, 1, 4] if strategy == 'Custom' else None
+        result = payoff.simulate(*small, extra=500, strategy=strategy, order=order)
+        rank = payoff.priority(small[0], small[1], strategy, order)
+        months, interest = reference(*small, 500, rank)
+        assert np.array_equal(result.months, months, equal_nan=True), strategy
+        assert np.allclose(result.interest, interest), strategy
+
+    big = make_debts(rng, n)
+    for strategy in payoff.STRATEGIES:
+        start = time.perf_counter()
+        result = payoff.simulate(*big, extra=1000, strategy=strategy, order=[0, 1, 2])
+        elapsed = time.perf_counter() - start
+        print(f"{strategy:10s} {n:,} accounts: {elapsed * 1000:7.1f} ms, "
+              f"debt-free in {result.debt_free_months} months, interest ${result.total_interest:,.0f}")
+
+    start = time.perf_counter()
+    reference(*big, 1000, payoff.priority(big[0], big[1]))
+    print(f"python loop {n:,} accounts: {(time.perf_counter() - start) * 1000:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
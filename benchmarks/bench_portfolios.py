@@ -0,0 +1,86 @@
+"""
+Multi-portfolio cache: hit rate, memory-capped eviction and copy-on-write.
+
+Builds many client portfolios of the demo book's shape, then replays a skewed
+stream of session requests (a few clients are far busier than the rest)
+against a PortfolioCache capped at a fraction of the total size. Reports the
+hit rate and cache size, and checks that an edit made through a shared
+AccountTable never changes the frame other sessions hold.
+
+Run: python benchmarks/bench_portfolios.py [portfolios] [accounts] [requests] [cap_mb]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import core, portfolios, storage, table
+
+
+def make_portfolio(demo, accounts, seed):
+    rng = np.random.default_rng(seed)
+    frame = demo.sample(accounts, replace=True, random_state=seed).reset_index(drop=True)
+    frame['Current Balance'] = np.round(rng.uniform(0, 1, accounts) * frame['Credit Limit'], 2)
+    return frame
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 200
+    accounts = int(argv[2]) if len(argv) > 2 else 2_000
+    requests = int(argv[3]) if len(argv) > 3 else 20_000
+    cap_mb = float(argv[4]) if len(argv) > 4 else 64
+    demo = core.load_demo_data()
+    loads = []
+
+    def loader(portfolio_id):
+        loads.append(portfolio_id)
+        return make_portfolio(demo, accounts, int(portfolio_id.split('-')[1]))
+
+    cache = portfolios.PortfolioCache(loader, max_portfolios=count, max_bytes=int(cap_mb * 2**20))
+    one = portfolios.frame_bytes(loader('client-0'))
+    loads.clear()
+    # Zipf-like traffic: client k is requested in proportion to 1 / (k + 1)
+    weights = 1 / np.arange(1, count + 1)
+    ids = np.random.default_rng(3).choice(count, requests, p=weights / weights.sum())
+
+    start = time.perf_counter()
+    for k in ids.tolist():
+        cache.get(f'client-{k}')
+    elapsed = time.perf_counter() - start
+    stats = cache.stats()
+    assert stats['bytes'] <= cache.max_bytes or stats['portfolios'] == 1, "cache over its memory cap"
+
+    frame, version = cache.get('client-0')
+    before = frame.copy()
+    session = table.AccountTable(frame, shared=True)
+    session.update(0, {'Current Balance': -1.0})
+    assert frame.equals(before), "shared frame changed by a session edit"
+    assert session.frame.at[0, 'Current Balance'] == -1.0
+    new_version = cache.publish('client-0', session.frame, version)
+    session.mark_shared()
+    published, current = cache.get('client-0')
+    assert published is session.frame and current == new_version == version + 1
+    try:
+        cache.publish('client-0', frame, version)
+    except storage.ConflictError:
+        pass
+    else:
+        raise AssertionError("publish from a stale version replaced the newer frame")
+    assert cache.get('client-0')[0] is session.frame
+
+    print(f"{count:,} portfolios x {accounts:,} accounts ({one / 2**20:.1f} MB each), cap {cap_mb:g} MB")
+    print(f"  requests               : {requests:,} in {elapsed * 1000:,.0f} ms")
+    print(f"  hit rate               : {stats['hits'] / requests:10.1%}")
+    print(f"  loads / evictions      : {stats['misses']:,} / {stats['evictions']:,}")
+    print(f"  cached                 : {stats['portfolios']:,} portfolios, {stats['bytes'] / 2**20:,.1f} MB")
+    print("  copy-on-write          : shared frame unchanged after edit")
+    print("  stale publish          : rejected")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,51 @@
+"""
+Profiler overhead: cost of a mark, a span and a summary.
+
+Times many reruns' worth of ``mark``/``span`` calls with nothing inside
+them, so the numbers are the instrumentation's own cost per call, then
+times building the p50/p95 summary and the JSON dump from full sample
+buffers.
+
+Run: python benchmarks/bench_profiling.py [reruns] [sections]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker.profiling import Profiler
+
+
+def main(argv):
+    reruns = int(argv[1]) if len(argv) > 1 else 2_000
+    sections = int(argv[2]) if len(argv) > 2 else 20
+    names = [f'section_{i}' for i in range(sections)]
+    profiler = Profiler()
+
+    start = time.perf_counter()
+    for _ in range(reruns):
+        profiler.start_run()
+        for name in names:
+            profiler.mark(name)
+            with profiler.span('inner'):
+                pass
+        profiler.end_run()
+    per_call = (time.perf_counter() - start) / (reruns * sections * 2)
+
+    start = time.perf_counter()
+    summary = profiler.summary()
+    summary_s = time.perf_counter() - start
+    start = time.perf_counter()
+    doc = profiler.dump()
+    dump_s = time.perf_counter() - start
+
+    print(f"{reruns:,} reruns x {sections} sections (+1 nested span each)")
+    print(f"  mark/span overhead     : {per_call * 1e6:10.2f} us per call")
+    print(f"  summary, {len(summary)} spans      : {summary_s * 1000:10.1f} ms")
+    print(f"  JSON dump              : {dump_s * 1000:10.1f} ms ({len(doc):,} bytes)")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,59 @@
+"""
+Payment calendar: projecting recurring dates and range queries.
+
+Tiles the demo book up to a large number of accounts, projects their due,
+statement and reporting dates a year ahead, then times "what falls between
+A and B" queries against the sorted calendar and a boolean-mask scan of the
+same events, plus the iCalendar export of one month.
+
+Run: python benchmarks/bench_schedule.py [accounts] [months]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import core, schedule
+
+
+def main(argv):
+    n = int(argv[1]) if len(argv) > 1 else 100_000
+    months = int(argv[2]) if len(argv) > 2 else 12
+    demo = core.load_demo_data()
+    accounts = demo.iloc[np.arange(n) % len(demo)].reset_index(drop=True)
+    start = pd.Timestamp.now().normalize().replace(day=1)
+
+    t0 = time.perf_counter()
+    calendar = schedule.PaymentCalendar.from_accounts(accounts, start, months)
+    project_s = time.perf_counter() - t0
+
+    rng = np.random.default_rng(5)
+    windows = [(start + pd.Timedelta(days=int(d)), start + pd.Timedelta(days=int(d) + 14))
+               for d in rng.integers(0, 28 * months, 50)]
+    t0 = time.perf_counter()
+    found = sum(len(calendar.between(a, b, details=False)) for a, b in windows)
+    query_s = (time.perf_counter() - t0) / len(windows)
+    events = calendar.events
+    t0 = time.perf_counter()
+    scanned = sum(len(events[(events['date'] >= a) & (events['date'] <= b)]) for a, b in windows)
+    scan_s = (time.perf_counter() - t0) / len(windows)
+    assert found == scanned, "range query disagrees with a full scan"
+
+    t0 = time.perf_counter()
+    ics = calendar.to_ical(calendar.month(start.year, start.month, kinds=['due']))
+    ical_s = time.perf_counter() - t0
+
+    print(f"{n:,} accounts, {months} months -> {len(calendar):,} dated events")
+    print(f"  project                : {project_s * 1000:10.1f} ms")
+    print(f"  2-week query, sorted   : {query_s * 1000:10.3f} ms")
+    print(f"  2-week query, scan     : {scan_s * 1000:10.3f} ms")
+    print(f"  .ics for one month     : {ical_s * 1000:10.1f} ms ({len(ics) / 2**20:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
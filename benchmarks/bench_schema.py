@@ -0,0 +1,56 @@
+"""
+Compact column types: memory per column and the cost of the tab filters.
+
+Tiles the demo book up to a large frame, once with the label, flag and
+percentage columns as plain text and once typed by ``schema.compact``, then
+prints the memory report and times the All Accounts filters (type and
+status multiselects plus the autopay selector) on both.
+
+Run: python benchmarks/bench_schema.py [rows]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import core, schema
+
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv):
+    n = int(argv[1]) if len(argv) > 1 else 1_000_000
+    demo = core.load_demo_data()
+    compacted = demo.iloc[np.arange(n) % len(demo)].reset_index(drop=True)
+    plain = schema.for_export(compacted)
+    for col in schema.CATEGORY_COLUMNS:
+        plain[col] = plain[col].astype(str)
+
+    report = schema.memory_report(compacted)
+    typed = schema.CATEGORY_COLUMNS + schema.BOOL_COLUMNS + schema.PERCENT_COLUMNS
+    print(f"{n:,} accounts")
+    print(report.loc[typed + ['Total']].to_string())
+
+    types, statuses = ['Credit Card', 'Mortgage'], ['Active']
+    plain_s = best_of(lambda: plain[plain['Account Type'].isin(types) & plain['Status'].isin(statuses)
+                                    & (plain['Autopay Enabled'] == 'Yes')])
+    typed_s = best_of(lambda: compacted[compacted['Account Type'].isin(types) & compacted['Status'].isin(statuses)
+                                        & compacted['Autopay Enabled']])
+    print(f"  filter, plain text     : {plain_s * 1000:10.1f} ms")
+    print(f"  filter, compact types  : {typed_s * 1000:10.1f} ms ({plain_s / typed_s:.1f}x)")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
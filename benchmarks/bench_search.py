@@ -0,0 +1,60 @@
+"""
+All Accounts search: prebuilt index vs. ``str.contains`` on every rerun.
+
+Builds a synthetic book, times building the search index once, then times
+a handful of queries (substring, short prefix, several terms, a field
+prefix and a misspelling) against the index and against the regex scan
+over the searched columns that App.py used to run on each keystroke.
+
+Run: python benchmarks/bench_search.py [rows]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import search, synthetic
+
+QUERIES = ['chase', 'ch', 'travel card', 'inst:ally auto', 'promo apr', 'amercan', '1234']
+
+
+def best_of(fn, repeat=20):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def scan(accounts, query):
+    mask = np.ones(len(accounts), dtype=bool)
+    for term in query.split():
+        term = term.partition(':')[2] or term
+        hit = np.zeros(len(accounts), dtype=bool)
+        for column in search.SEARCH_FIELDS.values():
+            hit |= accounts[column].astype(str).str.contains(term, case=False, na=False).to_numpy()
+        mask &= hit
+    return mask
+
+
+def main(argv):
+    n = int(argv[1]) if len(argv) > 1 else 100_000
+    accounts = synthetic.generate_portfolio(n, seed=0, today='2025-10-15')
+    start = time.perf_counter()
+    index = search.SearchIndex.from_frame(accounts)
+    print(f"{n:,} accounts, index built in {(time.perf_counter() - start) * 1000:,.1f} ms")
+    for query in QUERIES:
+        hits = len(index.search(query))
+        index_s = best_of(lambda: index.matches(query, accounts.index))
+        scan_s = best_of(lambda: scan(accounts, query), repeat=3)
+        print(f"  {query:<21}: {index_s * 1000:8.3f} ms index, {scan_s * 1000:8.1f} ms scan "
+              f"({scan_s / index_s:,.0f}x), {hits:,} hits")
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,172 @@
+"""
+Reproducible benchmark suite over synthetic books.
+
+Generates App.py-layout books with ``credittracker.synthetic`` (fixed seed
+and reference date, so every run times the same data) and times the work a
+rerun does on them: derived columns, dashboard totals, the All Accounts
+filters and search index, the alert rules, CSV import and export, and
+chart building. Each case runs ``--repeat`` times per size and the best and
+median times are kept. Results can be written as JSON and compared with an
+earlier run:
+
+Run: python benchmarks/suite.py [--sizes 1k,100k,1M] [--repeat 3] [-o results.json]
+                                [--compare baseline.json] [--tolerance 0.25]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import aggregates, alerts, derived, export, figures, importer, schema, search, synthetic
+
+SEED = 0
+TODAY = '2025-10-15'
+# Plotly figures with one mark per account are not built past this size
+CHART_MAX_ROWS = 100_000
+
+
+def case_derived_columns(accounts, _):
+    derived.utilization(accounts['Current Balance'], accounts['Credit Limit'])
+    derived.points_dollar_value(accounts['Rewards Points'], accounts['Points Value'])
+    derived.account_age_months(accounts['Open Date'], TODAY)
+
+
+def case_dashboard_totals(accounts, _):
+    aggregates.PortfolioTotals.from_frame(accounts)
+
+
+def case_filters(accounts, _):
+    mask = (accounts['Account Type'].isin(['Credit Card', 'Line of Credit'])
+            & accounts['Status'].isin(['Active']) & accounts['Autopay Enabled'])
+    accounts[mask].sort_values('Utilization %', kind='stable')
+
+
+def case_search(accounts, _):
+    index = search.SearchIndex.from_frame(accounts)
+    for query in ('chase', 'travel card', 'amercan'):
+        index.matches(query, accounts.index)
+
+
+def case_alerts(accounts, _):
+    alerts.evaluate(accounts, now=TODAY)
+
+
+def case_export_csv(accounts, _):
+    export.to_bytes(accounts, 'csv')
+
+
+def case_export_parquet(accounts, _):
+    export.to_bytes(accounts, 'parquet')
+
+
+def case_import_csv(_, csv_text):
+    chunks = []
+    importer.stream_csv(io.StringIO(csv_text), chunks.append)
+
+
+def case_charts(accounts, _):
+    figures.utilization_bar(accounts)
+    figures.balance_pie(accounts)
+    figures.top_balances_bar(accounts)
+    figures.payment_timeline(accounts[['Account Name', 'Account Type', 'Due Date', 'Minimum Payment',
+                                       'Current Balance']], 'Auto')
+
+
+# name -> (function, largest book it runs on)
+CASES = {
+    'derived_columns': (case_derived_columns, None),
+    'dashboard_totals': (case_dashboard_totals, None),
+    'filters': (case_filters, None),
+    'search': (case_search, None),
+    'alerts': (case_alerts, None),
+    'export_csv': (case_export_csv, None),
+    'export_parquet': (case_export_parquet, None),
+    'import_csv': (case_import_csv, None),
+    'charts': (case_charts, CHART_MAX_ROWS),
+}
+
+
+def run(sizes, repeat, cases=None):
+    results = []
+    for label in sizes:
+        rows = synthetic.parse_size(label)
+        accounts = synthetic.generate_portfolio(rows, seed=SEED, today=TODAY)
+        csv_text = schema.for_export(accounts).to_csv(index=False, date_format=schema.DATE_FORMAT)
+        for name, (fn, max_rows) in CASES.items():
+            if cases and name not in cases:
+                continue
+            if max_rows is not None and rows > max_rows:
+                continue
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                fn(accounts, csv_text)
+                times.append(time.perf_counter() - start)
+            results.append({'case': name, 'size': label, 'rows': rows, 'repeat': repeat,
+                            'min_s': min(times), 'median_s': statistics.median(times)})
+            print(f"  {label:>5} {name:<18}: {min(times) * 1000:10.1f} ms", file=sys.stderr)
+    return results
+
+
+def compare(baseline, results, tolerance):
+    """Rows of (case, size, baseline ms, current ms, ratio); ratio > 1 + tolerance is a regression."""
+    before = {(r['case'], r['size']): r['min_s'] for r in baseline['results']}
+    table = pd.DataFrame([
+        {'case': r['case'], 'size': r['size'], 'baseline ms': before[(r['case'], r['size'])] * 1000,
+         'current ms': r['min_s'] * 1000, 'ratio': r['min_s'] / before[(r['case'], r['size'])]}
+        for r in results if (r['case'], r['size']) in before
+    ])
+    if len(table):
+        table['regression'] = table['ratio'] > 1 + tolerance
+    return table.round(3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the main App.py workloads on synthetic books.')
+    parser.add_argument('--sizes', default='1k,100k', help="comma-separated sizes, e.g. 1k,100k,1M")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--cases', default=None, help='comma-separated subset of: ' + ', '.join(CASES))
+    parser.add_argument('-o', '--output', default=None, help='write results as JSON')
+    parser.add_argument('--compare', default=None, help='JSON results from an earlier run')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='slowdown ratio counted as a regression')
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip() for s in args.sizes.split(',') if s.strip()]
+    cases = [c.strip() for c in args.cases.split(',')] if args.cases else None
+    results = run(sizes, args.repeat, cases)
+    doc = {
+        'meta': {'python': platform.python_version(), 'pandas': pd.__version__, 'numpy': np.__version__,
+                 'machine': platform.machine(), 'cpus': os.cpu_count(), 'seed': SEED, 'today': TODAY,
+                 'recorded': pd.Timestamp.now().isoformat(timespec='seconds')},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(doc, f, indent=2)
+    table = pd.DataFrame(results)
+    table['min ms'] = (table['min_s'] * 1000).round(1)
+    table['median ms'] = (table['median_s'] * 1000).round(1)
+    print(table[['case', 'size', 'rows', 'min ms', 'median ms']].to_string(index=False))
+
+    if args.compare:
+        with open(args.compare) as f:
+            diff = compare(json.load(f), results, args.tolerance)
+        print()
+        print(diff.to_string(index=False))
+        if len(diff) and diff['regression'].any():
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
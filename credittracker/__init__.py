@@ -0,0 +1,6 @@
+"""
+Shared, Streamlit-free building blocks for the Credit & Tradeline apps.
+
+App.py and 5App.py import from here so the heavy per-row work lives in one
+place and can be reused by batch jobs and benchmarks.
+"""
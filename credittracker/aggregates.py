@@ -0,0 +1,118 @@
+"""
+Running portfolio totals for the dashboard and sidebar.
+
+``PortfolioTotals`` keeps the sums behind every dashboard metric. It is built
+once from the full frame and then adjusted by the rows that change (add,
+edit, payment, delete, import), so reading the metrics on a rerun costs
+O(1) instead of rescanning the whole book.
+"""
+
+import numpy as np
+import pandas as pd
+
+LOAN_TYPES = ['Installment Loan', 'Mortgage', 'Personal Loan']
+
+FIELDS = [
+    'count', 'total_limit', 'total_balance', 'total_points', 'total_points_value',
+    'total_min_payments', 'total_annual_fees', 'cc_limit', 'cc_balance',
+    'total_loan_balance', 'apr_with_balance_sum', 'with_balance_count',
+    'active_count', 'autopay_count', 'age_months_sum', 'age_months_count',
+]
+
+
+def _col(df, name):
+    if name not in df.columns:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[name], errors='coerce').fillna(0).to_numpy(dtype='float64')
+
+
+def _contributions(df):
+    """Sum of each field over the rows of ``df``."""
+    is_cc = (df['Account Type'] == 'Credit Card').to_numpy()
+    is_loan = df['Account Type'].isin(LOAN_TYPES).to_numpy()
+    limit = _col(df, 'Credit Limit')
+    balance = _col(df, 'Current Balance')
+    apr = _col(df, 'APR')
+    has_balance = balance > 0
+    age = pd.to_numeric(df['Account Age (Months)'], errors='coerce')
+    return {
+        'count': len(df),
+        'total_limit': limit.sum(),
+        'total_balance': balance.sum(),
+        'total_points': _col(df, 'Rewards Points').sum(),
+        'total_points_value': _col(df, 'Points Dollar Value').sum(),
+        'total_min_payments': _col(df, 'Minimum Payment').sum(),
+        'total_annual_fees': _col(df, 'Annual Fee').sum(),
+        'cc_limit': limit[is_cc].sum(),
+        'cc_balance': balance[is_cc].sum(),
+        'total_loan_balance': balance[is_loan].sum(),
+        'apr_with_balance_sum': apr[has_balance].sum(),
+        'with_balance_count': int(has_balance.sum()),
+        'active_count': int((df['Status'] == 'Active').sum()),
+        'autopay_count': int(df['Autopay Enabled'].to_numpy(dtype=bool).sum()),
+        'age_months_sum': age.sum(),
+        'age_months_count': int(age.notna().sum()),
+    }
+
+
+def _as_frame(rows):
+    return rows.to_frame().T if isinstance(rows, pd.Series) else rows
+
+
+class PortfolioTotals:
+    """Incrementally maintained sums over an account frame."""
+
+    def __init__(self):
+        for name in FIELDS:
+            setattr(self, name, 0)
+
+    @classmethod
+    def from_frame(cls, df):
+        totals = cls()
+        totals.add(df)
+        return totals
+
+    def _apply(self, rows, sign):
+        for name, value in _contributions(_as_frame(rows)).items():
+            setattr(self, name, getattr(self, name) + sign * value)
+
+    def add(self, rows):
+        """Account for new rows (a DataFrame or a single row Series)."""
+        self._apply(rows, 1)
+
+    def remove(self, rows):
+        """Drop rows that are being deleted."""
+        self._apply(rows, -1)
+
+    def replace(self, old_row, new_row):
+        """Swap one row's contribution after an edit or payment."""
+        self.remove(old_row)
+        self.add(new_row)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def matches(self, df, rtol=1e-9):
+        """True if the running sums agree with a full recompute over ``df``."""
+        fresh = PortfolioTotals.from_frame(df).as_dict()
+        return all(np.isclose(fresh[name], value, rtol=rtol, atol=1e-6) for name, value in self.as_dict().items())
+
+    @staticmethod
+    def _utilization(balance, limit):
+        return round((balance / limit) * 100, 2) if limit > 0 else 0
+
+    @property
+    def utilization(self):
+        return self._utilization(self.total_balance, self.total_limit)
+
+    @property
+    def cc_utilization(self):
+        return self._utilization(self.cc_balance, self.cc_limit)
+
+    @property
+    def avg_apr(self):
+        return self.apr_with_balance_sum / self.with_balance_count if self.with_balance_count else float('nan')
+
+    @property
+    def avg_age_months(self):
+        return self.age_months_sum / self.age_months_count if self.age_months_count else float('nan')
@@ -0,0 +1,206 @@
+"""
+Streamlit-free core shared by App.py, 5App.py and batch jobs.
+
+Holds the demo portfolios and the scalar helpers the form handlers use.
+Nothing here imports Streamlit, Plotly or Altair, so importing it is cheap;
+the plotting libraries are only loaded when a figure is first built (see
+``credittracker.figures``).
+"""
+
+import numpy as np
+import pandas as pd
+
+from credittracker import schema
+
+
+def load_demo_data():
+    """The App.py demo portfolio, with dates parsed."""
+    return schema.compact(schema.parse_dates(pd.DataFrame({
+        'Account Name': [
+            'Chase Sapphire Reserve',
+            'American Express Gold',
+            'Capital One Venture X',
+            'Citi Double Cash',
+            'Discover It Cash Back',
+            'Bank of America Premium Rewards',
+            'Wells Fargo Active Cash',
+            'Auto Loan - Toyota Camry',
+            'Home Mortgage - Primary',
+            'Personal Loan - Consolidation',
+            'Chase Freedom Unlimited',
+            'Apple Card',
+            'Amazon Prime Visa',
+            'Target RedCard',
+            'Best Buy Credit Card'
+        ],
+        'Account Type': [
+            'Credit Card', 'Credit Card', 'Credit Card', 'Credit Card', 'Credit Card',
+            'Credit Card', 'Credit Card', 'Installment Loan', 'Mortgage', 'Personal Loan',
+            'Credit Card', 'Credit Card', 'Credit Card', 'Credit Card', 'Credit Card'
+        ],
+        'Institution': [
+            'Chase Bank', 'American Express', 'Capital One', 'Citibank', 'Discover',
+            'Bank of America', 'Wells Fargo', 'Toyota Financial', 'Quicken Loans', 'SoFi',
+            'Chase Bank', 'Goldman Sachs', 'Chase Bank', 'TD Bank', 'Citibank'
+        ],
+        'Credit Limit': [10000, 15000, 10000, 8000, 5000, 12000, 7500, 28000, 350000, 25000, 6000, 4000, 8500, 3000, 5000],
+        'Current Balance': [2500, 4200, 3500, 1200, 800, 5500, 1100, 15600, 287000, 18500, 1800, 650, 2100, 450, 1200],
+        'Statement Balance': [2800, 4500, 3800, 1350, 950, 5800, 1250, 15600, 287000, 18500, 2000, 750, 2300, 500, 1350],
+        'Minimum Payment': [84, 135, 105, 40, 29, 165, 35, 485, 1847, 567, 60, 25, 69, 25, 38],
+        'Due Date': [
+            '2025-11-05', '2025-11-10', '2025-11-08', '2025-11-15', '2025-11-12',
+            '2025-11-07', '2025-11-20', '2025-11-01', '2025-11-01', '2025-11-05',
+            '2025-11-18', '2025-11-22', '2025-11-14', '2025-11-25', '2025-11-28'
+        ],
+        'Statement Date': [
+            '2025-10-15', '2025-10-20', '2025-10-18', '2025-10-25', '2025-10-22',
+            '2025-10-17', '2025-10-30', '2025-10-01', '2025-10-01', '2025-10-05',
+            '2025-10-28', '2025-11-01', '2025-10-24', '2025-11-05', '2025-11-08'
+        ],
+        'Reporting Date': [
+            '2025-10-20', '2025-10-25', '2025-10-23', '2025-10-28', '2025-10-27',
+            '2025-10-22', '2025-11-02', '2025-10-05', '2025-10-05', '2025-10-08',
+            '2025-11-01', '2025-11-04', '2025-10-28', '2025-11-08', '2025-11-11'
+        ],
+        'Last Payment Date': [
+            '2025-09-28', '2025-10-05', '2025-10-02', '2025-09-20', '2025-09-25',
+            '2025-09-30', '2025-10-10', '2025-10-01', '2025-10-01', '2025-10-01',
+            '2025-10-08', '2025-10-15', '2025-10-05', '2025-10-12', '2025-10-18'
+        ],
+        'Last Payment Amount': [3200, 4100, 3900, 1500, 1100, 6000, 1400, 485, 1847, 567, 2200, 800, 2500, 600, 1400],
+        'APR': [19.99, 21.24, 18.99, 15.99, 14.99, 17.49, 16.99, 4.29, 3.75, 9.99, 18.24, 13.99, 16.49, 24.99, 22.49],
+        'Rewards Points': [45000, 82000, 38000, 0, 12500, 28000, 0, 0, 0, 0, 18000, 4200, 15000, 2800, 6500],
+        'Points Value': [0.015, 0.012, 0.020, 0.0, 0.010, 0.010, 0.0, 0.0, 0.0, 0.0, 0.015, 0.010, 0.010, 0.010, 0.010],
+        'Annual Fee': [550, 250, 395, 0, 0, 95, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        'Status': ['Active'] * 15,
+        'Open Date': [
+            '2020-03-15', '2019-06-22', '2021-08-05', '2018-11-10', '2017-05-18',
+            '2022-01-20', '2023-03-12', '2023-02-10', '2018-07-15', '2022-09-01',
+            '2019-12-03', '2021-09-20', '2020-06-08', '2016-04-25', '2019-10-30'
+        ],
+        'Account Number': [
+            '****1234', '****5678', '****9012', '****3456', '****7890',
+            '****2345', '****6789', '****0123', '****4567', '****8901',
+            '****2468', '****1357', '****9753', '****1593', '****7531'
+        ],
+        'Credit Bureau': [
+            'All 3', 'All 3', 'All 3', 'All 3', 'All 3',
+            'All 3', 'All 3', 'All 3', 'All 3', 'All 3',
+            'All 3', 'All 3', 'All 3', 'All 3', 'All 3'
+        ],
+        'Payment History': [
+            '100%', '100%', '100%', '98%', '100%',
+            '100%', '100%', '100%', '100%', '100%',
+            '100%', '97%', '100%', '95%', '100%'
+        ],
+        'Account Age (Months)': [
+            68, 76, 50, 84, 101,
+            46, 31, 32, 87, 37,
+            70, 49, 64, 114, 72
+        ],
+        'Autopay Enabled': [
+            'Yes', 'Yes', 'Yes', 'No', 'Yes',
+            'Yes', 'No', 'Yes', 'Yes', 'Yes',
+            'No', 'Yes', 'Yes', 'No', 'No'
+        ],
+        'Cashback Rate': [
+            '0%', '0%', '0%', '2%', '5% rotating',
+            '1.5-2.5%', '2%', '0%', '0%', '0%',
+            '1.5%', '2% Apple/3% Apple', '3% Amazon', '5% Target', '5-6% Best Buy'
+        ],
+        'Notes': [
+            'Primary travel card, TSA PreCheck credit',
+            'Excellent for dining, 4x at restaurants',
+            'New travel card with lounge access',
+            'Simple cashback, no annual fee',
+            'Rotating categories, good for groceries',
+            'Premium banking rewards card',
+            'Simple 2% cashback on everything',
+            '60-month loan, excellent rate',
+            '30-year fixed, refinanced 2021',
+            'Debt consolidation, 5-year term',
+            'Everyday spending card',
+            'Apple purchases and Apple Pay bonus',
+            'Amazon Prime benefits included',
+            'Store card, occasional promotions',
+            'Store card for electronics'
+        ]
+    })))
+
+
+def load_simple_demo_data():
+    """The 5App.py demo portfolio, with dates parsed."""
+    today = pd.Timestamp.now().normalize()
+    demo = pd.DataFrame([
+        {
+            "id": 1,
+            "account_name": "Chase Sapphire Preferred",
+            "type": "Credit Card",
+            "balance": 450.00,
+            "credit_limit": 5000.00,
+            "payment_date": (today + pd.Timedelta(days=7)).strftime('%Y-%m-%d'),
+            "reporting_date": (today - pd.Timedelta(days=8)).strftime('%Y-%m-%d'),
+            "points": 12000,
+            "interest_rate": 20.24,
+            "status": "Open",
+            "notes": "Rotating travel card"
+        },
+        {
+            "id": 2,
+            "account_name": "Citi Double Cash",
+            "type": "Credit Card",
+            "balance": 1200.50,
+            "credit_limit": 6000.00,
+            "payment_date": (today + pd.Timedelta(days=20)).strftime('%Y-%m-%d'),
+            "reporting_date": (today - pd.Timedelta(days=22)).strftime('%Y-%m-%d'),
+            "points": 2400,
+            "interest_rate": 18.99,
+            "status": "Open",
+            "notes": "Cashback card"
+        },
+        {
+            "id": 3,
+            "account_name": "Auto Loan - Wells Fargo",
+            "type": "Installment",
+            "balance": 9500.00,
+            "credit_limit": 9500.00,
+            "payment_date": (today + pd.Timedelta(days=15)).strftime('%Y-%m-%d'),
+            "reporting_date": (today - pd.Timedelta(days=30)).strftime('%Y-%m-%d'),
+            "points": 0,
+            "interest_rate": 6.5,
+            "status": "Open",
+            "notes": "60-month loan"
+        },
+    ])
+    return schema.parse_dates(demo, schema.SIMPLE_DATE_COLUMNS)
+
+
+def calculate_utilization(balance, limit, empty=0):
+    """Balance / limit as a percentage, or ``empty`` when there is no limit.
+
+    App.py uses 0 for accounts without a limit, 5App.py NaN.
+    """
+    try:
+        return round((float(balance) / float(limit)) * 100, 2) if float(limit) > 0 else empty
+    except (TypeError, ValueError):
+        return empty
+
+
+def calculate_age_years(open_date):
+    """Years since ``open_date`` to one decimal, or 0 if it is not a date."""
+    opened = schema.to_date(open_date)
+    if pd.isna(opened):
+        return 0
+    return round((pd.Timestamp.now() - opened).days / 365.25, 1)
+
+
+def days_until(date):
+    """Whole days from today to ``date`` (negative if past), or None."""
+    d = schema.to_date(date)
+    return None if pd.isna(d) else (d - pd.Timestamp.now().normalize()).days
+
+
+def days_since(date):
+    """Whole days from ``date`` to today, or None."""
+    d = schema.to_date(date)
+    return None if pd.isna(d) else (pd.Timestamp.now().normalize() - d).days
@@ -0,0 +1,113 @@
+"""
+Derived account metrics computed a whole column at a time.
+
+Every function takes pandas Series (or array-likes) and returns a Series
+aligned with the input, so callers can assign the result straight back onto
+the account frame instead of looping with ``DataFrame.apply(axis=1)``.
+"""
+
+import numpy as np
+import pandas as pd
+
+DAYS_PER_MONTH = 30.44
+DAYS_PER_YEAR = 365.25
+
+
+def _series(values):
+    return values if isinstance(values, pd.Series) else pd.Series(values)
+
+
+def _numeric(values):
+    return pd.to_numeric(_series(values), errors='coerce').to_numpy(dtype='float64')
+
+
+def _index(*values):
+    for v in values:
+        if isinstance(v, pd.Series):
+            return v.index
+    return None
+
+
+def _dates(values):
+    return pd.to_datetime(_series(values), errors='coerce').dt.normalize()
+
+
+def _today(today):
+    return pd.Timestamp(today).normalize() if today is not None else pd.Timestamp.now().normalize()
+
+
+def utilization(balance, limit, empty=0.0, decimals=2):
+    """Balance / limit as a percentage, rounded to ``decimals``.
+
+    Rows whose limit is zero, negative or missing get ``empty`` — 0 in App.py,
+    NaN in 5App.py — matching the scalar ``calculate_utilization`` helpers.
+    """
+    bal = _numeric(balance)
+    lim = _numeric(limit)
+    valid = lim > 0  # NaN compares False, same as the scalar path
+    out = np.full(lim.shape, empty, dtype='float64')
+    np.divide(bal, lim, out=out, where=valid)
+    out[valid] = np.round(out[valid] * 100, decimals)
+    return pd.Series(out, index=_index(balance, limit))
+
+
+def days_until(dates, today=None):
+    """Whole days from today until each date (NaN where unparseable)."""
+    dates = _dates(dates)
+    return (dates - _today(today)).dt.days
+
+
+def days_since(dates, today=None):
+    """Whole days from each date until today (NaN where unparseable)."""
+    dates = _dates(dates)
+    return (_today(today) - dates).dt.days
+
+
+def account_age_months(open_dates, today=None):
+    """Account age in months, rounded the way the Add Account form does."""
+    days = days_since(open_dates, today)
+    return (days / DAYS_PER_MONTH).round(0)
+
+
+def account_age_years(open_dates, today=None):
+    """Account age in years to one decimal; unparseable dates give 0."""
+    days = days_since(open_dates, today)
+    return (days / DAYS_PER_YEAR).round(1).fillna(0)
+
+
+def points_dollar_value(points, value_per_point):
+    """Rewards points times their per-point cash value."""
+    out = _numeric(points) * _numeric(value_per_point)
+    return pd.Series(out, index=_index(points, value_per_point))
+
+
+def add_months(dates, months):
+    """Shift each date by a whole number of months, clamping to month end.
+
+    Jan 31 + 1 month is Feb 28/29, as with ``pd.DateOffset(months=1)``, but
+    computed for the whole column at once. NaT/NaN stay NaT.
+    """
+    dates = _dates(dates)
+    months = np.broadcast_to(np.nan_to_num(np.asarray(months, dtype='float64')), dates.shape).astype('int64')
+    values = dates.to_numpy(dtype='datetime64[ns]')
+    missing = np.isnat(values)
+    month = values.astype('datetime64[M]') + months.astype('timedelta64[M]')
+    month_len = ((month + 1).astype('datetime64[D]') - month.astype('datetime64[D]')).astype('int64')
+    day = np.minimum(dates.dt.day.fillna(1).to_numpy(dtype='int64'), month_len)
+    out = (month.astype('datetime64[D]') + (day - 1).astype('timedelta64[D]')).astype('datetime64[ns]')
+    out[missing] = np.datetime64('NaT')
+    return pd.Series(out, index=dates.index)
+
+
+def next_monthly(dates, today=None):
+    """The first monthly recurrence of each date that falls on or after today.
+
+    Due and reporting dates repeat every month; a date already in the past is
+    rolled forward to its next occurrence, future dates are unchanged.
+    """
+    dates = _dates(dates)
+    today = _today(today)
+    behind = ((today.year - dates.dt.year) * 12 + (today.month - dates.dt.month)).clip(lower=0)
+    rolled = add_months(dates, behind)
+    rolled = rolled.where(~(rolled < today), add_months(dates, behind + 1))
+    return rolled
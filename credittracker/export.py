@@ -0,0 +1,208 @@
+"""
+Account exports as CSV, gzip-compressed CSV, Parquet and Excel.
+
+Each writer walks the frame in ``chunk_rows`` slices and writes every slice
+to a binary stream as it goes: CSV text is encoded (and gzip-compressed)
+chunk by chunk, Parquet gets one row group per chunk, and Excel rows are
+written with xlsxwriter's constant-memory mode. So the full export never
+exists as one Python string next to its encoded bytes.
+
+CSV and Excel use the import layout (``schema.for_export``: 'Yes'/'No'
+flags, '98%' percentages) so a file can be edited and re-imported; Parquet
+keeps the typed columns.
+
+``ExportCache`` holds the latest file per export and format, keyed on the
+caller's data version, and hands out zero-argument callables for
+``st.download_button(data=...)`` so nothing is generated until someone
+clicks download. Cached files past ``spool_bytes`` are spilled to a
+temporary file on disk rather than held in the session, and files of an
+older data version are dropped as soon as the version moves on. Parquet needs pyarrow and Excel needs xlsxwriter; both
+are imported only when used, and ``available_formats()`` leaves out a
+format whose library is missing.
+"""
+
+import gzip
+import importlib.util
+import io
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from credittracker import schema
+
+# format -> (label, file extension, MIME type)
+FORMATS = {
+    'csv': ('CSV', '.csv', 'text/csv'),
+    'csv.gz': ('CSV (gzip)', '.csv.gz', 'application/gzip'),
+    'parquet': ('Parquet', '.parquet', 'application/vnd.apache.parquet'),
+    'xlsx': ('Excel', '.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+REQUIRES = {'parquet': 'pyarrow', 'xlsx': 'xlsxwriter'}
+CHUNK_ROWS = 50_000
+EXCEL_MAX_ROWS = 1_048_576
+DEFAULT_MAX_BYTES = 128 * 2**20
+# Cached exports larger than this live in a temporary file instead of memory
+SPOOL_BYTES = 4 * 2**20
+
+
+def available_formats():
+    """Formats whose writer library is installed."""
+    return [fmt for fmt in FORMATS if fmt not in REQUIRES or importlib.util.find_spec(REQUIRES[fmt]) is not None]
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield start, df.iloc[start:start + chunk_rows]
+
+
+def write_csv(df, out, chunk_rows=CHUNK_ROWS, compress=False):
+    """CSV to the binary stream ``out``, gzip-compressed if ``compress``."""
+    # mtime=0 keeps the compressed bytes identical for identical data
+    stream = gzip.GzipFile(fileobj=out, mode='wb', compresslevel=6, mtime=0) if compress else out
+    for start, chunk in _chunks(df, chunk_rows):
+        text = schema.for_export(chunk).to_csv(index=False, header=start == 0, date_format=schema.DATE_FORMAT)
+        stream.write(text.encode('utf-8'))
+    if compress:
+        stream.close()
+
+
+def write_parquet(df, out, chunk_rows=CHUNK_ROWS):
+    """Parquet with one row group per chunk and the frame's own column types."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    for _, chunk in _chunks(df, chunk_rows):
+        batch = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(out, batch.schema)
+        writer.write_table(batch.cast(writer.schema))
+    writer.close()
+
+
+def write_excel(df, out, chunk_rows=CHUNK_ROWS, sheet_name='Accounts'):
+    """One worksheet, written row by row without holding the sheet in memory."""
+    import xlsxwriter
+
+    if len(df) >= EXCEL_MAX_ROWS:
+        raise ValueError(f"Excel sheets hold at most {EXCEL_MAX_ROWS - 1:,} data rows; export CSV or Parquet instead")
+    # Cells are written as plain values: no URL or formula detection on text
+    workbook = xlsxwriter.Workbook(out, {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd',
+                                         'remove_timezone': True, 'strings_to_urls': False,
+                                         'strings_to_formulas': False})
+    sheet = workbook.add_worksheet(sheet_name)
+    sheet.write_row(0, 0, [str(col) for col in df.columns])
+    for start, chunk in _chunks(df, chunk_rows):
+        chunk = schema.for_export(chunk)
+        columns = []
+        for col in chunk.columns:
+            values = chunk[col]
+            if pd.api.types.is_datetime64_any_dtype(values.dtype):
+                values = pd.Series(values.dt.to_pydatetime(), dtype=object)
+            # Missing values become blank cells
+            columns.append([None if pd.isna(v) else v for v in values.astype(object).tolist()])
+        for offset, row in enumerate(zip(*columns)):
+            sheet.write_row(start + offset + 1, 0, row)
+    workbook.close()
+
+
+def write(df, fmt, out, chunk_rows=CHUNK_ROWS):
+    """Write ``df`` in ``fmt`` (a key of ``FORMATS``) to the binary stream or path ``out``."""
+    if fmt == 'csv':
+        write_csv(df, out, chunk_rows)
+    elif fmt == 'csv.gz':
+        write_csv(df, out, chunk_rows, compress=True)
+    elif fmt == 'parquet':
+        write_parquet(df, out, chunk_rows)
+    elif fmt == 'xlsx':
+        write_excel(df, out, chunk_rows)
+    else:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(FORMATS)}")
+
+
+def to_bytes(df, fmt, chunk_rows=CHUNK_ROWS):
+    out = io.BytesIO()
+    write(df, fmt, out, chunk_rows)
+    return out.getvalue()
+
+
+def file_name(stem, fmt):
+    return stem + FORMATS[fmt][1]
+
+
+def mime(fmt):
+    return FORMATS[fmt][2]
+
+
+class ExportCache:
+    """Latest export file per (name, format), rebuilt when the data version changes.
+
+    Only one version is kept: exports of any other version are dropped when
+    a new one is built or ``retain`` is called. Each file stays in memory up
+    to ``spool_bytes`` and is spilled to a temporary file past that, and the
+    least recently used exports are dropped once the cached files pass
+    ``max_bytes``. Download callables run on a Streamlit worker thread, so
+    lookups are locked.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, chunk_rows=CHUNK_ROWS, spool_bytes=SPOOL_BYTES):
+        self.max_bytes = max_bytes
+        self.chunk_rows = chunk_rows
+        self.spool_bytes = spool_bytes
+        self._exports = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _drop(self, key):
+        _, out, size = self._exports.pop(key)
+        out.close()
+        self._bytes -= size
+
+    def _retain(self, version):
+        for key in [k for k, entry in self._exports.items() if entry[0] != version]:
+            self._drop(key)
+
+    def retain(self, version):
+        """Drop every cached export that is not of ``version``."""
+        with self._lock:
+            self._retain(version)
+
+    def get(self, name, fmt, version, frame):
+        """Bytes of ``frame`` in ``fmt``, reused while ``version`` is unchanged."""
+        key = (name, fmt)
+        with self._lock:
+            cached = self._exports.get(key)
+            if cached is not None and cached[0] == version:
+                self.hits += 1
+                self._exports.move_to_end(key)
+                out = cached[1]
+            else:
+                self.misses += 1
+                self._retain(version)
+                out = tempfile.SpooledTemporaryFile(max_size=self.spool_bytes)
+                write(frame, fmt, out, self.chunk_rows)
+                size = out.seek(0, io.SEEK_END)
+                self._exports[key] = (version, out, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes and len(self._exports) > 1:
+                    self._drop(next(iter(self._exports)))
+            out.seek(0)
+            return out.read()
+
+    def deferred(self, name, fmt, version, frame):
+        """A callable for ``st.download_button(data=...)`` that exports only when clicked."""
+        return lambda: self.get(name, fmt, version, frame)
+
+    def size(self, name, fmt, version):
+        """Size in bytes of a cached export of ``version``, or None if it has not been built."""
+        cached = self._exports.get((name, fmt))
+        return cached[2] if cached is not None and cached[0] == version else None
+
+    @property
+    def total_bytes(self):
+        return self._bytes
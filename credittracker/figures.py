@@ -0,0 +1,257 @@
+"""
+Plotly figure builders for the Analytics & Insights tabs, plus a small LRU
+cache so a rerun that did not change the data reuses the figures it already
+built.
+
+Builders take the full account frame and do their own filtering and sorting,
+so a cache hit skips that work as well as the Plotly Express construction.
+
+Plotly is imported on first use rather than with this module, so code that
+only needs the cache or ``bucket_payments`` (batch jobs, benchmarks) does not
+pay for it.
+"""
+
+import importlib
+from collections import OrderedDict
+
+
+class _LazyModule:
+    """Stand-in that imports ``name`` on first attribute access."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+px = _LazyModule('plotly.express')
+go = _LazyModule('plotly.graph_objects')
+
+
+class FigureCache:
+    """Bounded LRU of built figures.
+
+    Entries are keyed on the figure name, the caller's data-version counter
+    and any filter/parameter values that affect the figure. The frame itself
+    is not hashed: bump the version whenever the data changes.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._figures = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name, version, builder, *args, params=()):
+        key = (name, version, tuple(params))
+        if key in self._figures:
+            self.hits += 1
+            self._figures.move_to_end(key)
+            return self._figures[key]
+        self.misses += 1
+        figure = builder(*args, *params)
+        self._figures[key] = figure
+        while len(self._figures) > self.maxsize:
+            self._figures.popitem(last=False)
+        return figure
+
+    def __len__(self):
+        return len(self._figures)
+
+
+def utilization_bar(accounts):
+    util_df = accounts[accounts['Account Type'] == 'Credit Card'].sort_values('Utilization %', ascending=True)
+    fig = px.bar(util_df,
+                 x='Utilization %',
+                 y='Account Name',
+                 title='Credit Card Utilization by Account',
+                 color='Utilization %',
+                 color_continuous_scale=['green', 'yellow', 'red'],
+                 range_color=[0, 100])
+    fig.add_vline(x=30, line_dash="dash", line_color="orange", annotation_text="30% Threshold")
+    return fig
+
+
+def utilization_gauge(avg_utilization):
+    return go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=avg_utilization,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Overall Credit Utilization"},
+        delta={'reference': 30},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [0, 30], 'color': "lightgreen"},
+                {'range': [30, 70], 'color': "lightyellow"},
+                {'range': [70, 100], 'color': "lightcoral"}],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 70}}))
+
+
+def balance_pie(accounts):
+    type_summary = accounts.groupby('Account Type').agg({
+        'Current Balance': 'sum',
+        'Account Name': 'count'
+    }).reset_index()
+    type_summary.columns = ['Account Type', 'Total Balance', 'Count']
+    return px.pie(type_summary,
+                  values='Total Balance',
+                  names='Account Type',
+                  title='Balance Distribution by Account Type',
+                  hole=0.4)
+
+
+def top_balances_bar(accounts, n=10):
+    return px.bar(accounts.nlargest(n, 'Current Balance'),
+                  x='Current Balance',
+                  y='Account Name',
+                  title=f'Top {n} Accounts by Balance',
+                  orientation='h',
+                  color='Account Type')
+
+
+# Payment timeline: one trace per account is fine for a personal portfolio but
+# not for thousands of accounts, so larger books are bucketed by due date
+TIMELINE_MODES = ['Auto', 'Per account', 'Daily', 'Weekly']
+TIMELINE_DETAIL_LIMIT = 200
+# 'Per account' draws one trace per account; above this it falls back to bucketed totals
+TIMELINE_PER_ACCOUNT_MAX = 1_000
+TIMELINE_MAX_TRACES = 12
+
+
+def bucket_payments(timeline_df, freq='D', group='Account Type', max_groups=TIMELINE_MAX_TRACES):
+    """Sum payments and balances per due-date bucket and ``group``.
+
+    ``freq`` is 'D' or 'W' (weeks start on Monday). Only the ``max_groups - 1``
+    largest groups by balance keep their own trace; the rest become 'Other'.
+    """
+    df = timeline_df.dropna(subset=['Due Date'])
+    groups = df[group].astype(str)
+    top = df.groupby(groups)['Current Balance'].sum().nlargest(max_groups - 1).index
+    groups = groups.where(groups.isin(top), 'Other')
+    buckets = df['Due Date'].dt.to_period(freq).dt.start_time
+    return (df.groupby([buckets, groups])
+              .agg(**{'Minimum Payment': ('Minimum Payment', 'sum'),
+                      'Current Balance': ('Current Balance', 'sum'),
+                      'Accounts': ('Account Name', 'count')})
+              .rename_axis(['Due Date', group])
+              .reset_index())
+
+
+def timeline_mode(timeline_df, mode='Auto'):
+    """The mode ``payment_timeline`` actually draws for ``mode``.
+
+    'Auto' picks per-account points for small books and daily or weekly
+    totals otherwise. 'Per account' is honoured only up to
+    TIMELINE_PER_ACCOUNT_MAX accounts; beyond that it is treated as 'Auto'.
+    """
+    if mode == 'Per account' and len(timeline_df) > TIMELINE_PER_ACCOUNT_MAX:
+        mode = 'Auto'
+    if mode == 'Auto':
+        if len(timeline_df) <= TIMELINE_DETAIL_LIMIT:
+            return 'Per account'
+        span = timeline_df['Due Date'].max() - timeline_df['Due Date'].min()
+        return 'Weekly' if span.days > 90 else 'Daily'
+    return mode
+
+
+def payment_timeline(timeline_df, mode='Auto'):
+    mode = timeline_mode(timeline_df, mode)
+    if mode == 'Per account':
+        return px.scatter(timeline_df,
+                          x='Due Date',
+                          y='Minimum Payment',
+                          size='Current Balance',
+                          color='Account Name',
+                          title='Payment Timeline (size = current balance)',
+                          hover_data=['Account Name', 'Minimum Payment', 'Current Balance'],
+                          render_mode='webgl' if len(timeline_df) > TIMELINE_DETAIL_LIMIT else 'auto')
+    buckets = bucket_payments(timeline_df, 'D' if mode == 'Daily' else 'W')
+    return px.scatter(buckets,
+                      x='Due Date',
+                      y='Minimum Payment',
+                      size='Current Balance',
+                      color='Account Type',
+                      title=f'Payment Timeline - {mode.lower()} totals (size = current balance)',
+                      hover_data=['Accounts', 'Minimum Payment', 'Current Balance'],
+                      render_mode='webgl')
+
+
+def rewards_points_bar(rewards_df):
+    fig = px.bar(rewards_df,
+                 x='Account Name',
+                 y='Rewards Points',
+                 title='Rewards Points by Account',
+                 color='Points Dollar Value',
+                 color_continuous_scale='Blues')
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+
+def rewards_value_bar(rewards_df):
+    fig = px.bar(rewards_df,
+                 x='Account Name',
+                 y='Points Dollar Value',
+                 title='Estimated Cash Value of Points',
+                 color='Points Value',
+                 color_continuous_scale='Greens')
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+
+def credit_mix_pie(credit_mix):
+    return px.pie(values=credit_mix.values, names=credit_mix.index,
+                  title='Account Type Distribution',
+                  hole=0.4)
+
+
+def payoff_curve(curve_df):
+    fig = px.area(curve_df,
+                  x='Month',
+                  y='Remaining Balance',
+                  title='Projected Total Balance')
+    fig.update_layout(yaxis_tickprefix='$')
+    return fig
+
+
+def utilization_bands(per_account):
+    """Forecast reported utilization per card: P5-P95 whiskers, P25-P75 box, median marker."""
+    df = per_account.sort_values('P50')
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=df['P50'], y=df['Account Name'], mode='markers', name='Median (P50)',
+                             marker={'color': 'darkblue', 'size': 9},
+                             error_x={'type': 'data', 'symmetric': False,
+                                      'array': df['P95'] - df['P50'], 'arrayminus': df['P50'] - df['P5'],
+                                      'color': 'lightgray', 'thickness': 6, 'width': 0}))
+    fig.add_trace(go.Scatter(x=df['Current Utilization %'], y=df['Account Name'], mode='markers', name='Today',
+                             marker={'color': 'orange', 'symbol': 'diamond-open', 'size': 9}))
+    fig.add_vline(x=30, line_dash="dash", line_color="orange", annotation_text="30% Threshold")
+    fig.update_layout(title='Forecast Utilization at Next Reporting Date (P5-P95)',
+                      xaxis_title='Reported Utilization %', yaxis_title=None)
+    return fig
+
+
+def portfolio_trend(totals):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=totals.index, y=totals['balance'], name='Total Balance', mode='lines'))
+    fig.add_trace(go.Scatter(x=totals.index, y=totals['card_utilization'], name='Card Utilization %',
+                             mode='lines', yaxis='y2'))
+    fig.update_layout(title='Portfolio Balance and Credit Card Utilization',
+                      yaxis={'title': 'Balance', 'tickprefix': '$'},
+                      yaxis2={'title': 'Utilization %', 'overlaying': 'y', 'side': 'right', 'range': [0, 100]},
+                      legend={'orientation': 'h', 'y': -0.2})
+    return fig
+
+
+def account_trend(series, value='Balance'):
+    long_df = series.rename_axis('Date').reset_index().melt(id_vars='Date', var_name='Account', value_name=value)
+    return px.line(long_df, x='Date', y=value, color='Account', title=f'{value} by Account',
+                   render_mode='webgl' if len(long_df) > 5_000 else 'auto')
@@ -0,0 +1,243 @@
+"""
+Daily balance/limit/utilization history, partitioned by month.
+
+Each snapshot is one row per account (date, account id, balance, limit,
+utilization, card flag) held as compact float32/int columns. Rows are
+grouped into one partition per calendar month, and alongside them every
+month keeps a small rollup of portfolio totals per day. Trend charts read
+the rollups, which are a few dozen rows per month whatever the size of the
+book; per-account trends only load the months a query covers. Weekly and
+monthly views are resampled from the daily rows with pandas, not in loops.
+
+Backends mirror ``credittracker.storage``:
+
+    (unset) / memory://        per-process, nothing persisted
+    parquet:///path/to/dir     <dir>/<YYYY-MM>/<name>.parquet row files plus
+                               <dir>/<YYYY-MM>/rollup.parquet
+"""
+
+import glob
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+FREQUENCIES = {'Daily': 'D', 'Weekly': 'W', 'Monthly': 'MS'}
+ROLLUP_FILE = 'rollup.parquet'
+
+
+def _months(start, end):
+    return [p.strftime('%Y-%m') for p in pd.period_range(pd.Timestamp(start), pd.Timestamp(end), freq='M')]
+
+
+def snapshot_rows(accounts, date):
+    """Compact per-account rows for one day from an App.py account frame."""
+    limit = accounts['Credit Limit'].to_numpy(dtype='float64')
+    balance = accounts['Current Balance'].to_numpy(dtype='float64')
+    utilization = np.divide(balance, limit, out=np.zeros_like(balance), where=limit > 0) * 100
+    return pd.DataFrame({
+        'date': np.full(len(accounts), pd.Timestamp(date).normalize().to_datetime64()).astype('datetime64[ns]'),
+        'account_id': accounts.index.to_numpy(dtype='int64'),
+        'balance': balance.astype('float32'),
+        'limit': limit.astype('float32'),
+        'utilization': utilization.astype('float32'),
+        'is_card': (accounts['Account Type'] == 'Credit Card').to_numpy(),
+    })
+
+
+def daily_rollup(rows):
+    """Portfolio totals per day from snapshot rows."""
+    cards = rows['is_card']
+    out = rows.assign(card_balance=rows['balance'].where(cards, 0), card_limit=rows['limit'].where(cards, 0))
+    return (out.groupby('date')
+               .agg(accounts=('account_id', 'size'), balance=('balance', 'sum'), limit=('limit', 'sum'),
+                    card_balance=('card_balance', 'sum'), card_limit=('card_limit', 'sum'))
+               .astype({'balance': 'float64', 'limit': 'float64', 'card_balance': 'float64', 'card_limit': 'float64'}))
+
+
+def _with_utilization(totals):
+    totals = totals.copy()
+    totals['utilization'] = np.where(totals['limit'] > 0, totals['balance'] / totals['limit'] * 100, 0.0)
+    totals['card_utilization'] = np.where(totals['card_limit'] > 0,
+                                          totals['card_balance'] / totals['card_limit'] * 100, 0.0)
+    return totals
+
+
+class _HistoryBase:
+    """Query and rollup logic shared by the backends."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def record_snapshot(self, accounts, date=None):
+        """Store today's (or ``date``'s) state, replacing any earlier snapshot that day."""
+        date = pd.Timestamp(date if date is not None else pd.Timestamp.now()).normalize()
+        self.record_rows(snapshot_rows(accounts, date), name=date.strftime('%Y-%m-%d'))
+
+    def record_rows(self, rows, name):
+        """Write snapshot rows (any number of days) under ``name`` in each month they cover.
+
+        Each month's rollup is updated from ``rows`` alone: the days they
+        cover are dropped from it and re-totalled, so a write does not read
+        back the rest of the month.
+        """
+        with self._lock:
+            months = rows['date'].to_numpy(dtype='datetime64[ns]').astype('datetime64[M]')
+            for month, part in rows.groupby(months, sort=True):
+                month = str(month)[:7]
+                part = part.reset_index(drop=True)
+                self._write_rows(month, name, part)
+                fresh = daily_rollup(part)
+                rollup = self._read_rollups([month])
+                self._write_rollup(month, pd.concat([rollup[~rollup.index.isin(fresh.index)], fresh]).sort_index())
+
+    def months(self):
+        return sorted(self._list_months())
+
+    def span(self):
+        """``(first, last)`` dates with history, or None if there is none."""
+        months = self.months()
+        if not months:
+            return None
+        first = self._read_rollups(months[:1]).index.min()
+        last = self._read_rollups(months[-1:]).index.max()
+        return first, last
+
+    def totals(self, start, end, freq='D'):
+        """Portfolio totals from the rollups, resampled to ``freq`` (last day of each period)."""
+        months = [m for m in _months(start, end) if m in set(self._list_months())]
+        daily = self._read_rollups(months)
+        daily = daily[(daily.index >= pd.Timestamp(start)) & (daily.index <= pd.Timestamp(end))]
+        if freq != 'D' and len(daily):
+            daily = daily.resample(freq).last().dropna(how='all')
+        return _with_utilization(daily)
+
+    def query(self, start, end, account_ids=None):
+        """Per-account rows between ``start`` and ``end``, loading only those months."""
+        months = [m for m in _months(start, end) if m in set(self._list_months())]
+        rows = self._read_rows(months)
+        mask = (rows['date'] >= pd.Timestamp(start)) & (rows['date'] <= pd.Timestamp(end))
+        if account_ids is not None:
+            mask &= rows['account_id'].isin(list(account_ids))
+        return rows[mask]
+
+    def account_series(self, start, end, account_ids, value='balance', freq='D'):
+        """A ``date x account_id`` table of ``value``, resampled to ``freq``."""
+        rows = self.query(start, end, account_ids)
+        wide = rows.pivot(index='date', columns='account_id', values=value)
+        if freq != 'D' and len(wide):
+            wide = wide.resample(freq).last()
+        return wide
+
+
+class MemoryHistory(_HistoryBase):
+    """History kept in this process only."""
+
+    description = 'In-Memory'
+
+    def __init__(self):
+        super().__init__()
+        self._rows = {}
+        self._rollups = {}
+
+    def _list_months(self):
+        return list(self._rollups)
+
+    def _write_rows(self, month, name, rows):
+        self._rows.setdefault(month, {})[name] = rows
+
+    def _read_rows(self, months):
+        parts = [p for m in months for p in self._rows.get(m, {}).values()]
+        return _concat_rows(parts)
+
+    def _write_rollup(self, month, rollup):
+        self._rollups[month] = rollup
+
+    def _read_rollups(self, months):
+        return _concat_rollups([self._rollups[m] for m in months if m in self._rollups])
+
+
+class ParquetHistory(_HistoryBase):
+    """One directory per month of Parquet row files plus a rollup file."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.description = f'Parquet ({os.path.basename(os.path.normpath(path))})'
+
+    def _list_months(self):
+        return [os.path.basename(os.path.dirname(p)) for p in glob.glob(os.path.join(self.path, '*', ROLLUP_FILE))]
+
+    def _write_rows(self, month, name, rows):
+        directory = os.path.join(self.path, month)
+        os.makedirs(directory, exist_ok=True)
+        rows.to_parquet(os.path.join(directory, f'{name}.parquet'), index=False)
+
+    def _read_rows(self, months):
+        files = [p for m in months for p in sorted(glob.glob(os.path.join(self.path, m, '*.parquet')))
+                 if os.path.basename(p) != ROLLUP_FILE]
+        return _concat_rows([pd.read_parquet(p) for p in files])
+
+    def _write_rollup(self, month, rollup):
+        rollup.to_parquet(os.path.join(self.path, month, ROLLUP_FILE))
+
+    def _read_rollups(self, months):
+        files = [os.path.join(self.path, m, ROLLUP_FILE) for m in months]
+        return _concat_rollups([pd.read_parquet(p) for p in files if os.path.exists(p)])
+
+
+def _concat_rows(parts):
+    if not parts:
+        return snapshot_rows(pd.DataFrame({'Credit Limit': [], 'Current Balance': [], 'Account Type': []}),
+                             pd.Timestamp(0))
+    if len(parts) == 1:
+        return parts[0]
+    rows = pd.concat(parts, ignore_index=True)
+    # A later snapshot of the same day replaces the earlier one
+    return rows.drop_duplicates(['date', 'account_id'], keep='last')
+
+
+def _concat_rollups(parts):
+    if not parts:
+        return daily_rollup(_concat_rows([]))
+    rollup = pd.concat(parts)
+    return rollup[~rollup.index.duplicated(keep='last')].sort_index()
+
+
+def simulate_history(accounts, days=730, end=None, seed=0):
+    """Plausible daily rows for the ``days`` before ``end``, ending at today's balances.
+
+    Balances follow a random walk backwards from the current value (so the
+    series meets the live data); limits stay fixed. Used to seed the demo.
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end if end is not None else pd.Timestamp.now()).normalize()
+    dates = pd.date_range(end=end - pd.Timedelta(days=1), periods=days, freq='D')
+    balance = accounts['Current Balance'].to_numpy(dtype='float64')
+    limit = accounts['Credit Limit'].to_numpy(dtype='float64')
+    steps = rng.normal(0, 0.03, size=(days, len(accounts)))
+    # Walk backwards from today: the last simulated day is one step from the live balance
+    walk = np.exp(np.cumsum(steps[::-1], axis=0))[::-1]
+    balances = np.minimum(balance * walk, np.where(limit > 0, limit, np.inf))
+    rows = pd.DataFrame({
+        'date': np.repeat(dates.to_numpy(), len(accounts)),
+        'account_id': np.tile(accounts.index.to_numpy(dtype='int64'), days),
+        'balance': balances.ravel().astype('float32'),
+        'limit': np.tile(limit, days).astype('float32'),
+        'is_card': np.tile((accounts['Account Type'] == 'Credit Card').to_numpy(), days),
+    })
+    lim = rows['limit'].to_numpy()
+    util = np.divide(rows['balance'].to_numpy(), lim, out=np.zeros(len(rows), dtype='float32'), where=lim > 0) * 100
+    rows.insert(4, 'utilization', util.astype('float32'))
+    return rows
+
+
+def open_history(url=None):
+    """Build a history store from a ``scheme://path`` URL (see module docstring)."""
+    if not url or url.startswith('memory://'):
+        return MemoryHistory()
+    scheme, _, path = url.partition('://')
+    if scheme == 'parquet':
+        return ParquetHistory(path)
+    raise ValueError(f"Unsupported history store URL: {url!r}")
@@ -0,0 +1,188 @@
+"""
+Chunked CSV import with per-chunk validation.
+
+Bureau and bank exports can be far larger than memory, so the file is read
+``chunksize`` rows at a time with every column as a string. Each chunk is
+coerced to the target types, rows that fail validation are set aside with a
+reason, defaults are filled in, and the clean chunk is handed to a callback
+that appends it to the store. Only one raw chunk is in memory at a time.
+"""
+
+import numpy as np
+import pandas as pd
+
+from credittracker import schema
+
+DEFAULT_CHUNKSIZE = 100_000
+MAX_REJECTS_KEPT = 1_000
+
+
+class CsvSchema:
+    """Which columns an import needs, how to type them and what to fill in.
+
+    ``compact`` also applies ``schema.compact`` (categorical, boolean and
+    percentage columns) to each clean chunk.
+    """
+
+    def __init__(self, required, numeric=(), dates=(), defaults=None, compact=False):
+        self.required = list(required)
+        self.numeric = list(numeric)
+        self.dates = list(dates)
+        self.defaults = defaults or (lambda: {})
+        self.compact = compact
+
+
+def _app_defaults():
+    today = pd.Timestamp.now().normalize()
+    return {
+        'Statement Balance': 0,
+        'Minimum Payment': 0,
+        'Due Date': today + pd.Timedelta(days=30),
+        'Statement Date': today,
+        'Reporting Date': today + pd.Timedelta(days=5),
+        'Last Payment Date': today,
+        'Last Payment Amount': 0,
+        'APR': 0,
+        'Rewards Points': 0,
+        'Points Value': 0,
+        'Annual Fee': 0,
+        'Status': 'Active',
+        'Open Date': today,
+        'Account Number': '****0000',
+        'Credit Bureau': 'Unknown',
+        'Payment History': '100%',
+        'Account Age (Months)': 0,
+        'Autopay Enabled': 'No',
+        'Cashback Rate': '0%',
+        'Notes': '',
+    }
+
+
+# App.py account layout
+APP_SCHEMA = CsvSchema(
+    required=['Account Name', 'Account Type', 'Institution', 'Credit Limit', 'Current Balance'],
+    numeric=['Credit Limit', 'Current Balance', 'Statement Balance', 'Minimum Payment',
+             'Last Payment Amount', 'APR', 'Rewards Points', 'Points Value', 'Annual Fee',
+             'Account Age (Months)', 'Points Dollar Value', 'Utilization %'],
+    dates=schema.DATE_COLUMNS,
+    defaults=_app_defaults,
+    compact=True,
+)
+
+# 5App.py account layout
+SIMPLE_SCHEMA = CsvSchema(
+    required=['account_name', 'type', 'balance', 'credit_limit'],
+    numeric=['id', 'balance', 'credit_limit', 'points', 'interest_rate'],
+    dates=schema.SIMPLE_DATE_COLUMNS,
+)
+
+
+class ImportResult:
+    """Running tally of an import: accepted rows, rejects and chunks seen."""
+
+    def __init__(self):
+        self.accepted = 0
+        self.rejected = 0
+        self.chunks = 0
+        self.rejects = []
+
+    @property
+    def rejected_rows(self):
+        """Up to MAX_REJECTS_KEPT rejected rows with line number and reason."""
+        return pd.concat(self.rejects, ignore_index=True) if self.rejects else pd.DataFrame()
+
+
+def missing_columns(columns, csv_schema=APP_SCHEMA):
+    return [col for col in csv_schema.required if col not in columns]
+
+
+def coerce_chunk(chunk, csv_schema=APP_SCHEMA):
+    """Type one raw (all-string) chunk; return ``(clean, rejected)`` frames.
+
+    A row is rejected when a required field is blank, a numeric field holds
+    something that is not a number or a date field something that is not a
+    date. Empty cells and optional columns missing from the file are filled
+    from the schema defaults.
+    """
+    reasons = pd.Series('', index=chunk.index, dtype=object)
+    for col in csv_schema.required:
+        blank = chunk[col].isna() | (chunk[col].astype(str).str.strip() == '')
+        reasons[blank] += f'missing {col}; '
+    for col in csv_schema.numeric:
+        if col not in chunk.columns:
+            continue
+        raw = chunk[col]
+        values = pd.to_numeric(raw.str.replace(r'[$,%\s]', '', regex=True), errors='coerce')
+        bad = values.isna() & raw.notna() & (raw.str.strip() != '')
+        reasons[bad] += f'bad number in {col}; '
+        chunk[col] = values
+    for col in csv_schema.dates:
+        if col not in chunk.columns:
+            continue
+        raw = chunk[col]
+        filled = raw.notna() & (raw.astype(str).str.strip() != '')
+        # The fast path infers one format from the chunk's first value; dates written
+        # another way are retried one by one before they count as bad
+        values = pd.to_datetime(raw, errors='coerce').astype('datetime64[ns]')
+        retry = values.isna() & filled
+        if retry.any():
+            values[retry] = pd.to_datetime(raw[retry], errors='coerce', format='mixed').astype('datetime64[ns]')
+        bad = values.isna() & filled
+        reasons[bad] += f'bad date in {col}; '
+        chunk[col] = values
+    bad_rows = (reasons != '').to_numpy()
+    rejected = chunk[bad_rows].assign(_reason=reasons[bad_rows].str.rstrip('; '))
+    clean = chunk[~bad_rows].copy()
+    for col, default in csv_schema.defaults().items():
+        if col not in clean.columns:
+            clean[col] = default
+        else:
+            clean[col] = clean[col].fillna(default)
+    clean = schema.parse_dates(clean, csv_schema.dates)
+    if csv_schema.compact:
+        schema.compact(clean)
+    return clean, rejected
+
+
+def stream_csv(source, on_chunk, csv_schema=APP_SCHEMA, chunksize=DEFAULT_CHUNKSIZE, total_bytes=None,
+               progress=None):
+    """Read ``source`` in chunks, validate each, and pass clean chunks to ``on_chunk``.
+
+    ``progress(fraction, result)`` is called after every chunk; ``fraction``
+    is based on the file position when ``total_bytes`` is known and is None
+    otherwise. Raises ValueError if required columns are missing from the
+    header.
+    """
+    result = ImportResult()
+    reader = pd.read_csv(source, dtype=str, chunksize=chunksize, keep_default_na=True)
+    line = 2  # header is line 1
+    for chunk in reader:
+        if result.chunks == 0:
+            missing = missing_columns(chunk.columns, csv_schema)
+            if missing:
+                raise ValueError(f"Missing required columns: {', '.join(missing)}")
+        chunk.index = np.arange(line, line + len(chunk))
+        line += len(chunk)
+        clean, rejected = coerce_chunk(chunk, csv_schema)
+        result.chunks += 1
+        result.accepted += len(clean)
+        result.rejected += len(rejected)
+        kept = sum(len(r) for r in result.rejects)
+        if len(rejected) and kept < MAX_REJECTS_KEPT:
+            result.rejects.append(rejected.head(MAX_REJECTS_KEPT - kept).rename_axis('line').reset_index())
+        if len(clean):
+            on_chunk(clean.reset_index(drop=True))
+        if progress is not None:
+            fraction = None
+            if total_bytes and hasattr(source, 'tell'):
+                fraction = min(1.0, source.tell() / total_bytes)
+            progress(fraction, result)
+    return result
+
+
+def preview_csv(source, nrows=10):
+    """First ``nrows`` rows for display, rewinding ``source`` afterwards."""
+    head = pd.read_csv(source, nrows=nrows)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return head
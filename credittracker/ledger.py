@@ -0,0 +1,225 @@
+"""
+Append-only ledger of balance-changing events.
+
+Payments, charges, balance adjustments, new accounts and deletions are
+recorded as events instead of overwriting ``Current Balance`` in place, so
+every change can be audited and charted. Events are stored column-wise:
+new events collect in small Python lists and are sealed into NumPy arrays
+every ``chunk_size`` events.
+
+Current balances are a materialized view that is updated as each event is
+recorded, so reading them costs nothing. The view can always be rebuilt from
+the events; a snapshot of it is taken every ``snapshot_every`` events, so a
+rebuild only replays the events since the last snapshot rather than the
+whole history.
+
+Events outlive the session through the account store (``store``): ``save``
+appends the events recorded since the last save, and ``load`` starts from
+the store's latest balance snapshot and replays only the events after it,
+saving a new snapshot once that tail reaches ``snapshot_every`` events. A
+ledger loaded that way holds just the tail in memory; ``history`` fetches
+an account's earlier events from the store.
+"""
+
+import bisect
+
+import numpy as np
+import pandas as pd
+
+EVENT_KINDS = ['open', 'payment', 'charge', 'adjustment', 'close']
+COLUMNS = ['seq', 'account_id', 'kind', 'amount', 'date']
+
+
+class Ledger:
+    """Events plus a per-account index and a materialized balance view.
+
+    ``amount`` is the signed change to the balance: payments are negative.
+    """
+
+    def __init__(self, chunk_size=4096, snapshot_every=10_000, store=None):
+        self.chunk_size = chunk_size
+        self.snapshot_every = snapshot_every
+        self.store = store
+        # Events before this seq are summarized by the first snapshot, not held in memory
+        self._base = 0
+        self._chunks = []
+        self._pending = {col: [] for col in COLUMNS}
+        self._frame = None
+        self._by_account = {}
+        self._snapshots = []
+        self._count = 0
+        self.balances = {}
+        self._saved = 0
+
+    @classmethod
+    def from_frame(cls, accounts, date=None, **kwargs):
+        """A ledger whose only events open each account at its current balance."""
+        ledger = cls(**kwargs)
+        ledger.record_many(accounts.index, 'open', accounts['Current Balance'], date)
+        return ledger
+
+    @classmethod
+    def from_events(cls, events, **kwargs):
+        """A ledger replaying saved events (``account_id``, ``kind``, ``amount``, ``date``) in order."""
+        ledger = cls(**kwargs)
+        if events is not None and len(events):
+            unknown = set(events['kind'].unique()) - set(EVENT_KINDS)
+            if unknown:
+                raise ValueError(f"Unknown ledger event kind: {sorted(unknown)[0]!r}")
+            ledger._append(events['account_id'], events['kind'], events['amount'], events['date'])
+        ledger._saved = len(ledger)
+        return ledger
+
+    @classmethod
+    def load(cls, store, **kwargs):
+        """A ledger over ``store``'s events, replayed from its latest snapshot."""
+        ledger = cls(store=store, **kwargs)
+        snapshot = store.load_snapshot()
+        if snapshot is not None:
+            seq, balances = snapshot
+            ledger._base = ledger._count = seq
+            ledger.balances = {int(k): float(v) for k, v in balances.items()}
+            ledger._snapshots.append((seq, dict(ledger.balances)))
+        events = store.load_events(after=ledger._base)
+        if events is not None and len(events):
+            ledger._append(events['account_id'], events['kind'], events['amount'], events['date'])
+            if len(events) >= ledger.snapshot_every:
+                store.save_snapshot(len(ledger), pd.Series(ledger.balances, dtype='float64'))
+        ledger._saved = len(ledger)
+        return ledger
+
+    def __len__(self):
+        return self._count
+
+    def _seal(self):
+        if self._pending['seq']:
+            self._chunks.append(self._as_arrays(self._pending))
+            self._pending = {col: [] for col in COLUMNS}
+
+    @staticmethod
+    def _as_arrays(columns):
+        return {
+            'seq': np.asarray(columns['seq'], dtype='int64'),
+            'account_id': np.asarray(columns['account_id'], dtype='int64'),
+            'kind': np.asarray(columns['kind'], dtype=object),
+            'amount': np.asarray(columns['amount'], dtype='float64'),
+            'date': np.asarray(columns['date'], dtype='datetime64[ns]'),
+        }
+
+    def _apply(self, seq, account_id, amount):
+        self._count += 1
+        self.balances[account_id] = self.balances.get(account_id, 0.0) + amount
+        self._by_account.setdefault(account_id, []).append(seq)
+        if (seq + 1) % self.snapshot_every == 0:
+            self._snapshots.append((seq + 1, dict(self.balances)))
+
+    def record(self, account_id, kind, amount, date=None):
+        """Append one event, update the view and return the event's sequence number."""
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown ledger event kind: {kind!r}")
+        seq = len(self)
+        date = pd.Timestamp(date if date is not None else pd.Timestamp.now()).normalize()
+        for col, value in zip(COLUMNS, (seq, int(account_id), kind, float(amount), date)):
+            self._pending[col].append(value)
+        self._frame = None
+        self._apply(seq, int(account_id), float(amount))
+        if len(self._pending['seq']) >= self.chunk_size:
+            self._seal()
+        return seq
+
+    def record_many(self, account_ids, kind, amounts, date=None):
+        """Append one ``kind`` event per account in one chunk (bulk imports)."""
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown ledger event kind: {kind!r}")
+        n = len(account_ids)
+        date = pd.Timestamp(date if date is not None else pd.Timestamp.now()).normalize()
+        self._append(account_ids, np.full(n, kind, dtype=object), amounts, np.full(n, date.to_datetime64()))
+
+    def _append(self, account_ids, kinds, amounts, dates):
+        if not len(account_ids):
+            return
+        self._seal()
+        start = len(self)
+        ids = np.asarray(account_ids, dtype='int64')
+        amounts = np.nan_to_num(np.asarray(amounts, dtype='float64'))
+        chunk = self._as_arrays({'seq': np.arange(start, start + len(ids)), 'account_id': ids,
+                                 'kind': np.asarray(kinds, dtype=object), 'amount': amounts,
+                                 'date': np.asarray(dates, dtype='datetime64[ns]')})
+        self._chunks.append(chunk)
+        self._frame = None
+        for seq, account_id, amount in zip(chunk['seq'].tolist(), ids.tolist(), amounts.tolist()):
+            self._apply(seq, account_id, amount)
+
+    def reconcile(self, accounts, date=None):
+        """Open the accounts the ledger has never seen; return the balances that disagree.
+
+        Accounts without events (a book saved before its events were) are
+        opened at their stored balance. A known account whose stored balance
+        differs from the replayed events is not adjusted to match, since that
+        would hide whatever write went missing; it is returned instead, as
+        rows of ``stored``, ``events`` and ``difference`` by account id.
+        """
+        current = np.nan_to_num(accounts['Current Balance'].to_numpy(dtype='float64'))
+        known = accounts.index.isin(list(self.balances))
+        self.record_many(accounts.index[~known], 'open', current[~known], date)
+        ids = accounts.index[known]
+        replayed = np.array([self.balances[key] for key in ids.tolist()], dtype='float64')
+        drift = pd.DataFrame({'stored': current[known], 'events': replayed,
+                              'difference': current[known] - replayed}, index=ids)
+        return drift[~np.isclose(drift['difference'].to_numpy(), 0.0)]
+
+    def save(self):
+        """Append the events recorded since the last save to the store (if there is one)."""
+        if self.store is not None and self._saved < len(self):
+            unsaved = self.events().iloc[self._saved - self._base:]
+            self.store.append_events(unsaved[COLUMNS[1:]].reset_index(drop=True))
+        self._saved = len(self)
+
+    def events(self):
+        """The events held in memory (all of them, unless loaded from a snapshot) ordered by ``seq``."""
+        if self._frame is None:
+            self._seal()
+            if self._chunks:
+                columns = {col: np.concatenate([c[col] for c in self._chunks]) for col in COLUMNS}
+            else:
+                columns = self._as_arrays({col: [] for col in COLUMNS})
+            self._frame = pd.DataFrame(columns)
+        return self._frame
+
+    def balance(self, account_id):
+        return self.balances.get(int(account_id), 0.0)
+
+    def history(self, account_id):
+        """One account's events, oldest first, with the running balance."""
+        positions = np.asarray(self._by_account.get(int(account_id), []), dtype='int64') - self._base
+        rows = self.events().iloc[positions].drop(columns='account_id')
+        if self._base and self.store is not None:
+            earlier = self.store.load_events(before=self._base, account_id=account_id)
+            if earlier is not None and len(earlier):
+                rows = pd.concat([earlier.drop(columns='account_id'), rows], ignore_index=True)
+        return rows.assign(balance=rows['amount'].cumsum())
+
+    def rebuild(self, upto=None, use_snapshots=True):
+        """Balances replayed from events ``[0, upto)``, starting at the latest snapshot.
+
+        Only the events after that snapshot are aggregated, so the cost is
+        O(events since snapshot), not O(all events). ``use_snapshots=False``
+        replays everything held in memory (for auditing the snapshots
+        themselves), from the loaded snapshot if there was one.
+        """
+        upto = len(self) if upto is None else upto
+        if upto < self._base:
+            raise ValueError(f"Events before {self._base} were loaded as a snapshot and cannot be replayed")
+        snapshots = self._snapshots if use_snapshots else self._snapshots[:1] if self._base else []
+        i = bisect.bisect_right([s[0] for s in snapshots], upto) - 1
+        start, base = snapshots[i] if i >= 0 else (0, {})
+        tail = self.events().iloc[start - self._base:upto - self._base]
+        balances = pd.Series(base, dtype='float64')
+        delta = tail.groupby('account_id')['amount'].sum()
+        return balances.add(delta, fill_value=0.0).sort_index()
+
+    def verify(self):
+        """True if the materialized view matches a full replay of the events."""
+        view = pd.Series(self.balances, dtype='float64').sort_index()
+        rebuilt = self.rebuild(use_snapshots=False)
+        return view.index.equals(rebuilt.index) and np.allclose(view.to_numpy(), rebuilt.to_numpy())
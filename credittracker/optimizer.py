@@ -0,0 +1,122 @@
+"""
+Split a cash budget across credit cards to lower what they report.
+
+Every card first gets its minimum payment, since missing a due date costs
+far more than high utilization; if the budget cannot cover all minimums,
+they are paid in due-date order. Each extra dollar lowers aggregate
+utilization by the same amount wherever it goes, so the rest of the budget
+is used to minimise the highest per-card utilization instead: cards are
+"water-filled" down to a common utilization level, the highest first. The
+level is found with one sort and a cumulative sum, so hundreds or thousands
+of cards take milliseconds.
+
+Payments that lower utilization only help if they post before the card's
+reporting date, so each card gets a pay-by date: the earlier of its due date
+and a few days before it reports.
+"""
+
+import numpy as np
+import pandas as pd
+
+from credittracker import alerts, derived
+
+POSTING_DAYS = 2
+
+
+def water_fill(balances, limits, budget):
+    """Payments that bring the highest ``balance / limit`` ratios down to a common level.
+
+    Returns ``(payments, level)``; ``level`` is the resulting utilization
+    ratio of every card that received money (0 if the budget clears them all).
+    """
+    bal = np.clip(np.asarray(balances, dtype='float64'), 0, None)
+    lim = np.asarray(limits, dtype='float64')
+    budget = max(float(budget), 0.0)
+    if budget <= 0 or not len(bal):
+        ratio = bal / lim if len(bal) else np.array([])
+        return np.zeros_like(bal), float(ratio.max(initial=0))
+    if budget >= bal.sum():
+        return bal.copy(), 0.0
+    ratio = bal / lim
+    order = np.argsort(-ratio, kind='stable')
+    r = ratio[order]
+    # Paying the top k cards down to level u costs sum(bal) - u * sum(lim) over those k
+    cum_bal = np.cumsum(bal[order])
+    cum_lim = np.cumsum(lim[order])
+    next_level = np.append(r[1:], 0.0)
+    cost_to_next = cum_bal - next_level * cum_lim
+    k = int(np.searchsorted(cost_to_next, budget))
+    level = (cum_bal[k] - budget) / cum_lim[k]
+    payments = np.clip(bal - level * lim, 0, None)
+    payments[ratio <= level] = 0
+    return payments, float(level)
+
+
+def allocate(balances, limits, minimums, due_days, budget):
+    """Minimums first (earliest due first if short), then water-fill the rest.
+
+    Returns ``(minimum_paid, extra_paid, level)`` as arrays and a ratio.
+    """
+    bal = np.clip(np.asarray(balances, dtype='float64'), 0, None)
+    lim = np.asarray(limits, dtype='float64')
+    minimum = np.minimum(np.clip(np.nan_to_num(np.asarray(minimums, dtype='float64')), 0, None), bal)
+    budget = max(float(budget), 0.0)
+    if minimum.sum() > budget:
+        order = np.argsort(np.nan_to_num(np.asarray(due_days, dtype='float64'), nan=np.inf), kind='stable')
+        owed = minimum[order]
+        before = np.cumsum(owed) - owed
+        paid = np.zeros_like(bal)
+        paid[order] = np.clip(budget - before, 0, owed)
+        return paid, np.zeros_like(bal), float(((bal - paid) / lim).max(initial=0))
+    extra, level = water_fill(bal - minimum, lim, budget - minimum.sum())
+    return minimum, extra, level
+
+
+def plan(accounts, budget, today=None, posting_days=POSTING_DAYS):
+    """Payment plan for the active cards in an App.py account frame.
+
+    Returns ``(table, summary)``: one row per card with the payment, pay-by
+    date and utilization before/after, and a dict of totals.
+    """
+    today = pd.Timestamp(today).normalize() if today is not None else pd.Timestamp.now().normalize()
+    cards = accounts[(accounts['Account Type'] == 'Credit Card') & (accounts['Status'] == 'Active')
+                     & (accounts['Credit Limit'] > 0)]
+    balance = cards['Current Balance'].to_numpy(dtype='float64')
+    limit = cards['Credit Limit'].to_numpy(dtype='float64')
+    reporting = derived.next_monthly(cards['Reporting Date'], today)
+    due = derived.next_monthly(cards['Due Date'], today)
+    due_days = derived.days_until(due, today).to_numpy(dtype='float64')
+    report_days = derived.days_until(reporting, today).to_numpy(dtype='float64')
+
+    minimum_paid, extra_paid, _ = allocate(balance, limit, cards['Minimum Payment'], due_days, budget)
+    payment = minimum_paid + extra_paid
+    after = balance - payment
+    pay_by = due.where(extra_paid == 0,
+                       np.minimum(due, reporting - pd.Timedelta(days=posting_days)).where(reporting.notna(), due))
+
+    table = pd.DataFrame({
+        'Account Name': cards['Account Name'],
+        'Current Balance': balance,
+        'Minimum Payment': np.round(minimum_paid, 2),
+        'Extra Payment': np.round(extra_paid, 2),
+        'Total Payment': np.round(payment, 2),
+        'Pay By': pay_by.clip(lower=today),
+        'Reports In (days)': report_days,
+        'Utilization Before %': derived.utilization(balance, limit).to_numpy(),
+        'Utilization After %': derived.utilization(after, limit).to_numpy(),
+    }, index=cards.index)
+    table['Reporting Soon'] = table['Reports In (days)'] <= alerts.DEFAULT_THRESHOLDS['reporting_soon_days']
+
+    total_limit = limit.sum()
+    summary = {
+        'budget': float(budget),
+        'allocated': round(float(payment.sum()), 2),
+        'unused': round(float(max(budget - payment.sum(), 0)), 2),
+        'minimums_short': float(max(np.minimum(np.nan_to_num(cards['Minimum Payment'].to_numpy(dtype='float64')),
+                                               balance).sum() - budget, 0)),
+        'aggregate_before': round(float(balance.sum() / total_limit * 100), 2) if total_limit else 0.0,
+        'aggregate_after': round(float(after.sum() / total_limit * 100), 2) if total_limit else 0.0,
+        'max_before': float(table['Utilization Before %'].max()) if len(table) else 0.0,
+        'max_after': float(table['Utilization After %'].max()) if len(table) else 0.0,
+    }
+    return table, summary
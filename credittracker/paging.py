@@ -0,0 +1,24 @@
+"""
+Helpers for showing a large account frame one page at a time.
+"""
+
+import math
+
+PAGE_SIZES = [10, 25, 50, 100]
+
+
+def page_count(n_rows, page_size):
+    """Number of pages needed for ``n_rows`` (at least 1)."""
+    return max(1, math.ceil(n_rows / page_size))
+
+
+def clamp_page(page, n_rows, page_size):
+    """Keep a 1-based page number inside the valid range."""
+    return min(max(1, int(page)), page_count(n_rows, page_size))
+
+
+def page_slice(df, page, page_size):
+    """Rows of ``df`` on 1-based ``page``; only these get widgets built."""
+    page = clamp_page(page, len(df), page_size)
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size]
@@ -0,0 +1,139 @@
+"""
+Debt payoff projection across all accounts at once.
+
+Balances, APRs and minimum payments are NumPy arrays and every month is one
+round of array operations over all accounts: interest accrues, each account
+gets its minimum, and whatever is left of the monthly budget goes to the
+open accounts in strategy order (a cumulative sum over the sorted balances
+does that allocation without a per-account loop). Minimums freed up by
+paid-off accounts stay in the budget, so they roll to the next target.
+"""
+
+import numpy as np
+import pandas as pd
+
+STRATEGIES = ['Avalanche', 'Snowball', 'Custom']
+MAX_MONTHS = 360
+
+
+def priority(balances, aprs, strategy='Avalanche', order=None):
+    """Account positions in the order extra payments should go to them.
+
+    Avalanche: highest APR first (smaller balance breaks ties). Snowball:
+    smallest balance first (higher APR breaks ties). Custom: ``order`` lists
+    positions first to last; accounts it leaves out follow in avalanche order.
+    """
+    balances = np.asarray(balances, dtype='float64')
+    aprs = np.asarray(aprs, dtype='float64')
+    if strategy == 'Snowball':
+        return np.lexsort((-aprs, balances))
+    avalanche = np.lexsort((balances, -aprs))
+    if strategy == 'Custom':
+        first = np.asarray(order if order is not None else [], dtype='int64')
+        rest = avalanche[~np.isin(avalanche, first)]
+        return np.concatenate([first, rest])
+    if strategy != 'Avalanche':
+        raise ValueError(f"Unknown payoff strategy: {strategy!r}")
+    return avalanche
+
+
+class PayoffResult:
+    """Outcome of one simulation.
+
+    ``months`` is the number of payments until each account hits zero (NaN if
+    it is not paid off within the horizon); ``interest`` and ``paid`` are per
+    account totals; ``remaining`` is the total balance after each month.
+    """
+
+    def __init__(self, months, interest, paid, remaining, start):
+        self.months = months
+        self.interest = interest
+        self.paid = paid
+        self.remaining = remaining
+        self.start = start
+
+    @property
+    def debt_free_months(self):
+        """Months until every account is paid off, or None if that is past the horizon."""
+        return None if np.isnan(self.months).any() else int(np.nanmax(self.months, initial=0))
+
+    @property
+    def total_interest(self):
+        return float(self.interest.sum())
+
+    def payoff_dates(self):
+        """Month in which each account is paid off (NaT if never)."""
+        base = np.datetime64(self.start.to_period('M').start_time, 'M')
+        months = np.where(np.isnan(self.months), 0, self.months).astype('int64')
+        dates = (base + months.astype('timedelta64[M]')).astype('datetime64[ns]')
+        dates[np.isnan(self.months)] = np.datetime64('NaT')
+        return dates
+
+    def balance_curve(self):
+        """Total remaining balance by month, starting with today's balance."""
+        months = pd.period_range(self.start.to_period('M'), periods=len(self.remaining), freq='M')
+        return pd.DataFrame({'Month': months.to_timestamp(), 'Remaining Balance': self.remaining})
+
+
+def simulate(balances, aprs, minimums, extra=0.0, strategy='Avalanche', order=None, max_months=MAX_MONTHS,
+             start=None):
+    """Project payoff for every account under one strategy.
+
+    The monthly budget is the sum of today's minimums plus ``extra``; it stays
+    fixed as accounts are paid off. Interest is APR / 12 on the balance at the
+    start of each month.
+    """
+    bal = np.clip(np.asarray(balances, dtype='float64'), 0, None)
+    rate = np.nan_to_num(np.asarray(aprs, dtype='float64')) / 1200
+    minimum = np.clip(np.nan_to_num(np.asarray(minimums, dtype='float64')), 0, None)
+    n = len(bal)
+    budget = minimum[bal > 0].sum() + max(float(extra), 0.0)
+    rank = priority(bal, rate, strategy, order)
+
+    months = np.full(n, np.nan)
+    months[bal <= 0] = 0
+    interest = np.zeros(n)
+    paid = np.zeros(n)
+    remaining = [bal.sum()]
+    for month in range(1, max_months + 1):
+        if not (bal > 0).any():
+            break
+        accrued = bal * rate
+        interest += accrued
+        bal = bal + accrued
+        pay = np.minimum(minimum, bal)
+        left = budget - pay.sum()
+        if left > 0:
+            # Fill accounts in priority order until the leftover budget runs out
+            owed = (bal - pay)[rank]
+            before = np.cumsum(owed) - owed
+            pay[rank] += np.clip(left - before, 0, owed)
+        bal = bal - pay
+        paid += pay
+        bal[bal < 0.005] = 0
+        newly_paid = (bal == 0) & np.isnan(months)
+        months[newly_paid] = month
+        remaining.append(bal.sum())
+    return PayoffResult(months, interest, paid, np.array(remaining), start or pd.Timestamp.now().normalize())
+
+
+def simulate_frame(accounts, extra=0.0, strategy='Avalanche', order=None, max_months=MAX_MONTHS):
+    """Run :func:`simulate` on App.py accounts; return ``(result, per-account table)``.
+
+    ``order`` is a list of account ids for the Custom strategy.
+    """
+    positions = accounts.index.get_indexer(order) if order is not None else None
+    if positions is not None:
+        positions = positions[positions >= 0]
+    result = simulate(accounts['Current Balance'], accounts['APR'], accounts['Minimum Payment'],
+                      extra=extra, strategy=strategy, order=positions, max_months=max_months)
+    table = pd.DataFrame({
+        'Account Name': accounts['Account Name'],
+        'APR': accounts['APR'],
+        'Current Balance': accounts['Current Balance'],
+        'Months to Payoff': result.months,
+        'Payoff Month': result.payoff_dates(),
+        'Total Interest': np.round(result.interest, 2),
+        'Total Paid': np.round(result.paid, 2),
+    }, index=accounts.index)
+    return result, table
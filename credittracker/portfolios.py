@@ -0,0 +1,146 @@
+"""
+Process-wide cache of client portfolios for multi-portfolio mode.
+
+Each portfolio is loaded from its store once and the resulting frame is
+shared by every session that opens it; sessions keep a reference, not a
+copy, and their AccountTable copies on first write (``shared=True``). After
+a write the session publishes its frame back as the portfolio's new version,
+and other sessions pick it up on their next rerun by comparing versions.
+
+Publishing is a compare-and-swap on the version the session started from:
+if another session published (or the portfolio was reloaded) in between,
+``publish`` raises ``ConflictError`` instead of replacing that session's
+frame, and the caller reloads from the store, which already holds both
+sessions' row writes.
+
+The cache is an LRU bounded both by the number of portfolios and by their
+total memory footprint, so one server can hold many clients' books without
+growing without limit. Evicted portfolios are simply reloaded from their
+store on next use.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+from credittracker.storage import ConflictError
+
+DEFAULT_MAX_PORTFOLIOS = 32
+DEFAULT_MAX_BYTES = 512 * 2**20
+PORTFOLIO_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def store_url(template, portfolio_id):
+    """Fill ``{portfolio}`` in a store URL template, e.g. ``sqlite:///books/{portfolio}.db``.
+
+    Ids are restricted to letters, digits, '-' and '_' so they are safe in paths.
+    """
+    if not PORTFOLIO_ID.match(portfolio_id or ''):
+        raise ValueError(f"Invalid portfolio id: {portfolio_id!r}")
+    return template.replace('{portfolio}', portfolio_id)
+
+
+def frame_bytes(frame):
+    """Approximate memory held by ``frame``, strings included."""
+    return int(frame.memory_usage(deep=True, index=True).sum())
+
+
+class PortfolioCache:
+    """LRU of ``portfolio id -> frame`` with a per-portfolio version counter.
+
+    ``loader(portfolio_id)`` returns the frame for a portfolio that is not
+    cached. The entry just loaded or published is never evicted, even if it
+    alone is over ``max_bytes``.
+    """
+
+    def __init__(self, loader, max_portfolios=DEFAULT_MAX_PORTFOLIOS, max_bytes=DEFAULT_MAX_BYTES):
+        self.loader = loader
+        self.max_portfolios = max_portfolios
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.RLock()
+        self._loading = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, portfolio_id):
+        """The shared frame for ``portfolio_id`` and its version; treat it as read-only."""
+        with self._lock:
+            if portfolio_id in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(portfolio_id)
+                frame, _ = self._entries[portfolio_id]
+                return frame, self._versions[portfolio_id]
+            # One load per portfolio even if several sessions ask at once
+            load_lock = self._loading.setdefault(portfolio_id, threading.Lock())
+        with load_lock:
+            with self._lock:
+                if portfolio_id in self._entries:
+                    return self.get(portfolio_id)
+            frame = self.loader(portfolio_id)
+            with self._lock:
+                self.misses += 1
+                # A reload is a new version, so sessions holding the old frame pick it up
+                self._versions[portfolio_id] = self._versions.get(portfolio_id, 0) + 1
+                self._store(portfolio_id, frame)
+                self._loading.pop(portfolio_id, None)
+                return frame, self._versions[portfolio_id]
+
+    def publish(self, portfolio_id, frame, base_version):
+        """Make ``frame`` the new shared version of a portfolio; return the version.
+
+        ``base_version`` is the version the frame was built from. If the
+        portfolio has moved on since, nothing is replaced and
+        ``ConflictError`` is raised.
+        """
+        with self._lock:
+            current = self._versions.get(portfolio_id, 0)
+            if current != base_version:
+                raise ConflictError(f"Portfolio {portfolio_id!r} is at version {current}, "
+                                    f"not {base_version}")
+            self._versions[portfolio_id] = current + 1
+            self._store(portfolio_id, frame)
+            return self._versions[portfolio_id]
+
+    def version(self, portfolio_id):
+        """Current version, or None if the portfolio is not cached."""
+        with self._lock:
+            return self._versions[portfolio_id] if portfolio_id in self._entries else None
+
+    def _store(self, portfolio_id, frame):
+        self._versions.setdefault(portfolio_id, 0)
+        self._drop(portfolio_id)
+        size = frame_bytes(frame)
+        self._entries[portfolio_id] = (frame, size)
+        self._bytes += size
+        while len(self._entries) > 1 and (len(self._entries) > self.max_portfolios
+                                          or self._bytes > self.max_bytes):
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, portfolio_id):
+        entry = self._entries.pop(portfolio_id, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def evict(self, portfolio_id):
+        with self._lock:
+            self._drop(portfolio_id)
+
+    @property
+    def total_bytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, portfolio_id):
+        return portfolio_id in self._entries
+
+    def stats(self):
+        with self._lock:
+            return {'portfolios': len(self._entries), 'bytes': self.total_bytes, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions}
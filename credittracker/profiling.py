@@ -0,0 +1,182 @@
+"""
+Timing spans for App.py reruns.
+
+A ``Profiler`` lives in session state and times named sections of each
+rerun. Top-level sections are delimited with ``mark(name)``, which ends the
+running section and starts the next, so the script does not need
+re-indenting; smaller blocks can use ``with profiler.span(name):``. Every
+span's recent durations are kept, so the debug panel can show p50/p95 per
+span across the session.
+
+A rerun can optionally be captured with cProfile (top functions by
+cumulative time) or tracemalloc (peak memory and top allocating lines).
+``dump()`` writes the per-span statistics as JSON, and two dumps can be
+compared from the command line:
+
+    python -m credittracker.profiling before.json after.json
+"""
+
+import argparse
+import cProfile
+import io
+import json
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+CAPTURE_MODES = ['cProfile', 'tracemalloc']
+MAX_SAMPLES = 500
+PERCENTILES = [50, 95]
+
+
+class Profiler:
+    """Per-session span timings plus an optional per-rerun capture."""
+
+    def __init__(self, max_samples=MAX_SAMPLES):
+        self.max_samples = max_samples
+        self.samples = {}
+        self.runs = 0
+        self.last_run = {}
+        self.capture_next = None
+        self.last_capture = None
+        self._current = None
+        self._started = None
+        self._section = None
+        self._stack = []
+        self._capture = None
+
+    def start_run(self, started=None):
+        """Begin timing a rerun; ``started`` is a ``perf_counter`` taken earlier in the script."""
+        # A rerun cut short by st.rerun()/st.stop() never called end_run; its spans are
+        # dropped, but a capture it started is still finished and kept
+        if self._capture is not None:
+            self.last_capture = self._finish_capture(*self._capture)
+        now = time.perf_counter()
+        self._current = {}
+        self._stack = []
+        self._started = started if started is not None else now
+        self._section = None
+        self._capture = None
+        if self.capture_next == 'cProfile':
+            self._capture = ('cProfile', cProfile.Profile())
+            self._capture[1].enable()
+        elif self.capture_next == 'tracemalloc':
+            tracemalloc.start()
+            self._capture = ('tracemalloc', None)
+        self.capture_next = None
+
+    def _record(self, name, seconds):
+        if self._current is not None:
+            self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def mark(self, name):
+        """End the running top-level section and start ``name``."""
+        now = time.perf_counter()
+        if self._section is not None:
+            self._record(self._section[0], now - self._section[1])
+        self._section = (name, now)
+
+    @contextmanager
+    def span(self, name):
+        """Time a block; nested spans are named ``outer/inner``."""
+        self._stack.append(name)
+        full = '/'.join(self._stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(full, time.perf_counter() - start)
+            self._stack.pop()
+
+    def end_run(self):
+        """Close the rerun and fold its spans into the session samples."""
+        if self._current is None:
+            return
+        self.mark(None)
+        self._current['total'] = time.perf_counter() - self._started
+        for name, seconds in self._current.items():
+            self.samples.setdefault(name, deque(maxlen=self.max_samples)).append(seconds)
+        self.last_run = self._current
+        self._current = None
+        self.runs += 1
+        if self._capture is not None:
+            self.last_capture = self._finish_capture(*self._capture)
+            self._capture = None
+
+    @staticmethod
+    def _finish_capture(mode, profile):
+        if mode == 'cProfile':
+            profile.disable()
+            out = io.StringIO()
+            pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(30)
+            return mode, out.getvalue()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        lines = [f'current {current / 2**20:,.1f} MiB, peak {peak / 2**20:,.1f} MiB', '']
+        lines += [str(stat) for stat in snapshot.statistics('lineno')[:25]]
+        return mode, '\n'.join(lines)
+
+    def summary(self):
+        """One row per span: calls, p50/p95/mean/last in milliseconds, slowest first."""
+        rows = []
+        for name, values in self.samples.items():
+            ms = np.asarray(values) * 1000
+            p50, p95 = np.percentile(ms, PERCENTILES)
+            rows.append({'Span': name, 'Runs': len(ms), 'p50 ms': p50, 'p95 ms': p95, 'Mean ms': ms.mean(),
+                         'Last ms': self.last_run.get(name, np.nan) * 1000})
+        table = pd.DataFrame(rows, columns=['Span', 'Runs', 'p50 ms', 'p95 ms', 'Mean ms', 'Last ms'])
+        return table.sort_values('p50 ms', ascending=False, ignore_index=True).round(2)
+
+    def dump(self, meta=None):
+        """Per-span statistics as a JSON string, for comparing releases."""
+        summary = self.summary()
+        doc = {
+            'meta': {'python': platform.python_version(), 'pandas': pd.__version__, 'numpy': np.__version__,
+                     'recorded': pd.Timestamp.now().isoformat(timespec='seconds'), **(meta or {})},
+            'runs': self.runs,
+            'spans': {row['Span']: {'runs': int(row['Runs']), 'p50_ms': row['p50 ms'], 'p95_ms': row['p95 ms'],
+                                    'mean_ms': row['Mean ms']}
+                      for row in summary.to_dict('records')},
+        }
+        return json.dumps(doc, indent=2, sort_keys=True)
+
+
+def diff(before, after):
+    """Compare two ``dump()`` documents (dicts or JSON strings) span by span."""
+    before, after = (json.loads(d) if isinstance(d, str) else d for d in (before, after))
+    spans = sorted(set(before['spans']) | set(after['spans']))
+    rows = []
+    for name in spans:
+        old, new = before['spans'].get(name, {}), after['spans'].get(name, {})
+        row = {'span': name}
+        for stat in ('p50_ms', 'p95_ms'):
+            row[f'{stat} before'] = old.get(stat, np.nan)
+            row[f'{stat} after'] = new.get(stat, np.nan)
+        row['p50 change %'] = (row['p50_ms after'] / row['p50_ms before'] - 1) * 100 if old and new else np.nan
+        rows.append(row)
+    return pd.DataFrame(rows).set_index('span').round(2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m credittracker.profiling',
+                                     description='Compare two profiling dumps span by span.')
+    parser.add_argument('before', help='JSON dump from the earlier release')
+    parser.add_argument('after', help='JSON dump from the later release')
+    args = parser.parse_args(argv)
+    with open(args.before) as f_before, open(args.after) as f_after:
+        table = diff(json.load(f_before), json.load(f_after))
+    with pd.option_context('display.width', 200, 'display.max_rows', None):
+        print(table.sort_values('p50 change %', ascending=False, na_position='last').to_string())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Headless alert scan over many portfolio files.
+
+Runs the same rules as the Alerts & Reminders tab (``credittracker.alerts``)
+without Streamlit, so it can be scheduled nightly:
+
+    python -m credittracker.scan portfolios/ -o alerts.jsonl
+    python -m credittracker.scan a.csv b.parquet -o alerts.parquet --workers 8
+
+Inputs are App.py-layout CSV or Parquet files, or directories containing
+them. Each file is one portfolio; files are evaluated in a process pool and
+every alert is written with the portfolio name and account id. JSONL output
+is written as results come in; Parquet output is written once at the end.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from credittracker import alerts, derived, importer, schema
+
+PORTFOLIO_EXTENSIONS = ('.csv', '.parquet')
+
+
+def portfolio_files(paths):
+    """Expand directories to the portfolio files inside them, sorted."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for ext in PORTFOLIO_EXTENSIONS:
+                files.extend(glob.glob(os.path.join(path, '*' + ext)))
+        else:
+            files.append(path)
+    return sorted(set(files))
+
+
+def load_portfolio(path):
+    """Read one portfolio file and type it like the app's account frame."""
+    if path.endswith('.parquet'):
+        df = schema.compact(schema.parse_dates(pd.read_parquet(path)))
+    else:
+        chunks = []
+        importer.stream_csv(path, chunks.append)
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    if len(df) and 'Utilization %' not in df.columns:
+        df['Utilization %'] = derived.utilization(df['Current Balance'], df['Credit Limit'])
+    return df
+
+
+def scan_file(path, now=None, thresholds=None):
+    """Alerts for one portfolio, or an error message.
+
+    Returns ``(path, accounts, alerts_frame, error)``; errors are reported
+    rather than raised so one bad file does not stop the batch.
+    """
+    try:
+        accounts = load_portfolio(path)
+        if not len(accounts):
+            return path, 0, None, None
+        found = alerts.evaluate(accounts, now=now, thresholds=thresholds)
+    except Exception as e:
+        return path, 0, None, f'{type(e).__name__}: {e}'
+    found = found.rename_axis('account_id').reset_index()
+    found.insert(0, 'portfolio', os.path.splitext(os.path.basename(path))[0])
+    return path, len(accounts), found, None
+
+
+def _scan_args(args):
+    return scan_file(*args)
+
+
+class JsonlWriter:
+    def __init__(self, path):
+        self._out = open(path, 'w')
+
+    def write(self, frame):
+        frame.to_json(self._out, orient='records', lines=True, date_format='iso')
+
+    def close(self):
+        self._out.close()
+
+
+class ParquetWriter:
+    def __init__(self, path):
+        self.path = path
+        self._frames = []
+
+    def write(self, frame):
+        self._frames.append(frame)
+
+    def close(self):
+        frames = [f for f in self._frames if len(f)]
+        out = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['portfolio', 'account_id'])
+        out.to_parquet(self.path, index=False)
+
+
+def open_writer(path):
+    return ParquetWriter(path) if path.endswith('.parquet') else JsonlWriter(path)
+
+
+def run(files, output, workers=None, thresholds=None, now=None):
+    """Scan ``files`` into ``output``; return a summary dict."""
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    summary = {'files': len(files), 'accounts': 0, 'alerts': 0, 'errors': []}
+    start = time.perf_counter()
+    writer = open_writer(output)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = ((path, now, thresholds) for path in files)
+            for path, accounts, found, error in pool.map(_scan_args, jobs, chunksize=4):
+                if error:
+                    summary['errors'].append((path, error))
+                    continue
+                summary['accounts'] += accounts
+                if found is not None and len(found):
+                    summary['alerts'] += len(found)
+                    writer.write(found)
+    finally:
+        writer.close()
+    summary['seconds'] = time.perf_counter() - start
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m credittracker.scan', description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('inputs', nargs='+', help='portfolio .csv/.parquet files or directories')
+    parser.add_argument('-o', '--output', required=True, help='alerts file (.jsonl or .parquet)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    for name, default in alerts.DEFAULT_THRESHOLDS.items():
+        parser.add_argument('--' + name.replace('_', '-'), type=float, default=default)
+    args = parser.parse_args(argv)
+
+    files = portfolio_files(args.inputs)
+    if not files:
+        parser.error('no portfolio files found')
+    thresholds = {name: getattr(args, name) for name in alerts.DEFAULT_THRESHOLDS}
+    summary = run(files, args.output, workers=args.workers, thresholds=thresholds)
+
+    for path, error in summary['errors']:
+        print(f'error: {path}: {error}', file=sys.stderr)
+    seconds = summary['seconds']
+    print(f"{summary['files']:,} files, {summary['accounts']:,} accounts, {summary['alerts']:,} alerts "
+          f"in {seconds:.2f}s ({summary['files'] / seconds:,.1f} files/sec) -> {args.output}", file=sys.stderr)
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Recurring payment calendar for the Payment Calendar tab.
+
+Due, statement and reporting dates repeat monthly on the same day of the
+month as the account's stored date, clamped to the month end (a bill due on
+the 31st falls on Feb 28/29). ``project`` expands every account's dates
+into their occurrences over a window for all accounts at once: the number
+of months each account needs is worked out from the dates, the rows are
+repeated with ``np.repeat`` and shifted with ``derived.add_months``. Nothing
+loops over accounts or months.
+
+``PaymentCalendar`` keeps the occurrences sorted by date, so "what falls
+between A and B" is two binary searches, and writes them out as an
+iCalendar (.ics) file that calendar apps can import.
+"""
+
+import numpy as np
+import pandas as pd
+
+from credittracker import derived
+
+# Account column -> event kind
+EVENT_COLUMNS = {'Due Date': 'due', 'Statement Date': 'statement', 'Reporting Date': 'reporting'}
+EVENT_LABELS = {'due': 'Payment due', 'statement': 'Statement closes', 'reporting': 'Reports to bureaus'}
+DEFAULT_MONTHS = 12
+
+
+def month_bounds(year, month):
+    """First and last day of a calendar month, as Timestamps."""
+    start = pd.Timestamp(year=year, month=month, day=1)
+    return start, start + pd.offsets.MonthEnd(0)
+
+
+def _months_between(dates, when):
+    return (when.year - dates.dt.year) * 12 + (when.month - dates.dt.month)
+
+
+def project(accounts, start, end, kinds=None):
+    """Every monthly occurrence of each account's dates in ``[start, end]``.
+
+    A date recurs from its stored value onwards, never before it. Returns
+    one row per occurrence (account_id, kind, date) sorted by date.
+    """
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    kinds = list(kinds) if kinds is not None else list(EVENT_COLUMNS.values())
+    ids, codes, dates = [], [], []
+    for code, (column, kind) in enumerate(EVENT_COLUMNS.items()):
+        if kind not in kinds or column not in accounts.columns:
+            continue
+        anchor = pd.to_datetime(accounts[column], errors='coerce')
+        valid = anchor.notna().to_numpy()
+        anchor = anchor[valid]
+        # One month earlier than the first candidate, since clamping can pull a date back a few days
+        first = np.clip(_months_between(anchor, start).to_numpy(dtype='int64') - 1, 0, None)
+        last = _months_between(anchor, end).to_numpy(dtype='int64')
+        counts = np.clip(last - first + 1, 0, None)
+        rows = np.repeat(np.arange(len(anchor)), counts)
+        group_start = np.repeat(np.cumsum(counts) - counts, counts)
+        offsets = first[rows] + (np.arange(len(rows)) - group_start)
+        occurrences = derived.add_months(anchor.iloc[rows].reset_index(drop=True), offsets).to_numpy()
+        keep = (occurrences >= start.to_datetime64()) & (occurrences <= end.to_datetime64())
+        ids.append(accounts.index.to_numpy()[valid][rows[keep]])
+        codes.append(np.full(int(keep.sum()), code, dtype='int8'))
+        dates.append(occurrences[keep])
+    ids = np.concatenate(ids) if ids else np.array([], dtype='int64')
+    codes = np.concatenate(codes) if codes else np.array([], dtype='int8')
+    dates = np.concatenate(dates) if dates else np.array([], dtype='datetime64[ns]')
+    # Stable, so same-day events stay in kind order and then account order
+    order = np.argsort(dates, kind='stable')
+    return pd.DataFrame({
+        'account_id': ids[order],
+        'kind': pd.Categorical.from_codes(codes[order], categories=list(EVENT_COLUMNS.values())),
+        'date': dates[order],
+    })
+
+
+class PaymentCalendar:
+    """Projected occurrences sorted by date, with range queries and .ics export.
+
+    Query results carry each account's name and minimum payment, looked up
+    from ``accounts`` for the matching rows only.
+    """
+
+    def __init__(self, events, accounts, start=None, end=None):
+        if not events['date'].is_monotonic_increasing:
+            events = events.sort_values('date', kind='stable', ignore_index=True)
+        self.events = events
+        self.accounts = accounts[['Account Name', 'Minimum Payment']]
+        self._dates = events['date'].to_numpy(dtype='datetime64[ns]')
+        first, last = (self._dates[0], self._dates[-1]) if len(events) else (pd.Timestamp.now(), pd.Timestamp.now())
+        self.start = pd.Timestamp(start if start is not None else first).normalize()
+        self.end = pd.Timestamp(end if end is not None else last).normalize()
+
+    @classmethod
+    def from_accounts(cls, accounts, start=None, months=DEFAULT_MONTHS, kinds=None):
+        """Occurrences from ``start`` (default: the first of this month) for ``months`` months."""
+        start = pd.Timestamp(start).normalize() if start is not None else pd.Timestamp.now().normalize().replace(day=1)
+        end = derived.add_months(pd.Series([start]), months).iloc[0] - pd.Timedelta(days=1)
+        return cls(project(accounts, start, end, kinds), accounts, start, end)
+
+    def __len__(self):
+        return len(self.events)
+
+    def between(self, start, end, kinds=None, details=True):
+        """Occurrences with ``start <= date <= end``, optionally of the given kinds only.
+
+        ``details=False`` skips looking up account names and minimum payments.
+        """
+        lo = np.searchsorted(self._dates, pd.Timestamp(start).normalize().to_datetime64(), side='left')
+        hi = np.searchsorted(self._dates, pd.Timestamp(end).normalize().to_datetime64(), side='right')
+        events = self.events.iloc[lo:hi]
+        if kinds is not None:
+            events = events[events['kind'].isin(list(kinds))]
+        if not details:
+            return events
+        looked_up = self.accounts.loc[events['account_id']]
+        return events.assign(**{col: looked_up[col].to_numpy() for col in looked_up.columns})
+
+    def month(self, year, month, kinds=None, details=True):
+        """Occurrences in one calendar month (the year matters)."""
+        return self.between(*month_bounds(year, month), kinds=kinds, details=details)
+
+    def to_ical(self, events=None, name='Credit Payments', stamp=None):
+        """An iCalendar document with one all-day event per occurrence.
+
+        ``events`` is a query result (default: the whole calendar).
+        """
+        events = self.between(self.start, self.end) if events is None else events
+        stamp = pd.Timestamp(stamp if stamp is not None else pd.Timestamp.now(tz='UTC')).strftime('%Y%m%dT%H%M%SZ')
+        dates = pd.to_datetime(events['date'])
+        day = dates.dt.strftime('%Y%m%d').tolist()
+        next_day = (dates + pd.Timedelta(days=1)).dt.strftime('%Y%m%d').tolist()
+        kinds = events['kind'].astype(str).tolist()
+        summary = [f'{EVENT_LABELS[kind]}: {account}' + (f' (${amount:,.2f})' if kind == 'due' else '')
+                   for kind, account, amount in zip(kinds, events['Account Name'], events['Minimum Payment'])]
+        uid = [f'{account_id}-{kind}-{d}@credittracker' for account_id, kind, d in zip(events['account_id'], kinds, day)]
+        lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//Credittracker//Payment Calendar//EN',
+                 'CALSCALE:GREGORIAN', f'X-WR-CALNAME:{_escape(name)}']
+        for uid_, day_, next_, summary_ in zip(uid, day, next_day, summary):
+            lines += ['BEGIN:VEVENT', f'UID:{uid_}', f'DTSTAMP:{stamp}', f'DTSTART;VALUE=DATE:{day_}',
+                      f'DTEND;VALUE=DATE:{next_}', f'SUMMARY:{_escape(summary_)}', 'TRANSP:TRANSPARENT',
+                      'END:VEVENT']
+        lines.append('END:VCALENDAR')
+        return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
+
+
+def _escape(text):
+    return (str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _fold(line, limit=75):
+    """Split a content line into 75-octet pieces, continued with a leading space (RFC 5545)."""
+    data = line.encode('utf-8')
+    if len(data) <= limit:
+        return line
+    pieces, start, width = [], 0, limit
+    while start < len(data):
+        end = min(start + width, len(data))
+        # Do not cut a multi-byte character in half
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        pieces.append(data[start:end].decode('utf-8'))
+        start, width = end, limit - 1
+    return '\r\n '.join(pieces)
@@ -0,0 +1,137 @@
+"""
+Column typing for the account frames.
+
+Date columns are parsed once, when data enters the store (demo seed, CSV
+import, add/edit forms), and held as ``datetime64[ns]``. They are only turned
+back into 'YYYY-MM-DD' strings when exporting.
+
+The same goes for the other text columns of App.py's frame that are not
+really free text: low-cardinality labels (account type, institution, status,
+bureau, cashback offer) are held as categoricals, 'Yes'/'No' flags as
+booleans and '98%'-style percentages as float32. Filters then compare small
+integer codes or booleans instead of Python strings, and a large book takes
+a fraction of the memory. ``for_export`` turns them back into the CSV text.
+"""
+
+import numpy as np
+import pandas as pd
+
+DATE_FORMAT = '%Y-%m-%d'
+
+# App.py columns
+DATE_COLUMNS = ['Due Date', 'Statement Date', 'Reporting Date', 'Last Payment Date', 'Open Date']
+
+# Low-cardinality labels held as categoricals
+CATEGORY_COLUMNS = ['Account Type', 'Institution', 'Status', 'Credit Bureau', 'Cashback Rate']
+
+# 'Yes'/'No' flags held as booleans
+BOOL_COLUMNS = ['Autopay Enabled']
+
+# '98%'-style text held as float32 percentages
+PERCENT_COLUMNS = ['Payment History']
+
+TRUE_STRINGS = {'yes', 'y', 'true', 't', '1', 'enabled'}
+
+# 5App.py columns
+SIMPLE_DATE_COLUMNS = ['payment_date', 'reporting_date']
+
+
+def to_date(value):
+    """Parse a single form value (date, datetime or string) to a Timestamp."""
+    parsed = pd.to_datetime(value, errors='coerce') if value is not None else pd.NaT
+    return pd.NaT if pd.isna(parsed) else parsed.normalize()
+
+
+def parse_dates(df, columns=DATE_COLUMNS):
+    """Return ``df`` with ``columns`` converted to ``datetime64[ns]`` in place.
+
+    Columns that are already datetimes are left alone, missing columns are
+    skipped and unparseable values become NaT.
+    """
+    for col in columns:
+        if col in df.columns and df[col].dtype != 'datetime64[ns]':
+            df[col] = pd.to_datetime(df[col], errors='coerce').astype('datetime64[ns]')
+    return df
+
+
+def format_date(value):
+    """'YYYY-MM-DD' for display, or an empty string for NaT/None."""
+    return '' if pd.isna(value) else pd.Timestamp(value).strftime(DATE_FORMAT)
+
+
+def parse_bool(values):
+    """'Yes'/'No' (or true/false, 1/0) to a bool array; anything else is False."""
+    values = pd.Series(values)
+    if values.dtype == bool:
+        return values.to_numpy()
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return values.fillna(0).to_numpy() != 0
+    # Few distinct values: parse each once, then map the codes
+    codes, uniques = pd.factorize(values)
+    parsed = pd.Series(uniques, dtype='string').str.strip().str.lower().isin(TRUE_STRINGS).fillna(False)
+    return np.append(parsed.to_numpy(dtype=bool), False)[codes]
+
+
+def parse_percent(values):
+    """The leading number of '98%'-style text as float32; NaN if there is none."""
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return values.to_numpy(dtype='float32')
+    codes, uniques = pd.factorize(values)
+    number = pd.Series(uniques, dtype='string').str.extract(r'(-?\d+(?:\.\d+)?)', expand=False)
+    parsed = pd.to_numeric(number, errors='coerce').to_numpy(dtype='float32')
+    return np.append(parsed, np.float32('nan'))[codes]
+
+
+def compact(df, categories=CATEGORY_COLUMNS, booleans=BOOL_COLUMNS, percents=PERCENT_COLUMNS):
+    """Return ``df`` with the label, flag and percentage columns typed compactly, in place.
+
+    Like ``parse_dates`` this skips missing columns and leaves columns that
+    already have the right type alone, so it is safe to call on every load.
+    """
+    for col in categories:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    for col in booleans:
+        if col in df.columns and df[col].dtype != bool:
+            df[col] = parse_bool(df[col])
+    for col in percents:
+        if col in df.columns and df[col].dtype != 'float32':
+            df[col] = parse_percent(df[col])
+    return df
+
+
+def format_percent(value):
+    """'98%' for display, or an empty string for NaN/None."""
+    return '' if pd.isna(value) else f'{float(value):g}%'
+
+
+def format_bool(value):
+    return 'Yes' if value else 'No'
+
+
+def for_export(df):
+    """A copy of ``df`` with flags and percentages written back as 'Yes'/'No' and '98%'."""
+    out = df.copy()
+    for col in BOOL_COLUMNS:
+        if col in out.columns:
+            out[col] = np.where(parse_bool(out[col]), 'Yes', 'No')
+    for col in PERCENT_COLUMNS:
+        if col in out.columns and pd.api.types.is_numeric_dtype(out[col].dtype):
+            out[col] = [format_percent(v) for v in out[col].tolist()]
+    return out
+
+
+def memory_report(df):
+    """Bytes per column held as plain text (before) and as typed by ``compact`` (after)."""
+    compacted = compact(df.copy())
+    plain = for_export(compacted)
+    for col in CATEGORY_COLUMNS:
+        if col in plain.columns:
+            plain[col] = plain[col].astype(str)
+    before = plain.memory_usage(deep=True, index=False)
+    after = compacted.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({'Before (bytes)': before, 'After (bytes)': after})
+    report.loc['Total'] = report.sum()
+    report['Reduction'] = (report['Before (bytes)'] / report['After (bytes)']).round(1)
+    return report
@@ -0,0 +1,254 @@
+"""
+Account search index for the All Accounts search box.
+
+The text fields (name, institution, account number, notes) are split into
+lower-case word tokens. Tokens are indexed three ways:
+
+* field -> token -> the distinct field values containing it, and each
+  distinct value -> the ids of the accounts holding it, so a value shared
+  by thousands of rows ("Chase Bank") is tokenized once;
+* a sorted token list, for prefix lookups of one- and two-letter terms;
+* padded trigrams -> tokens, which find tokens containing a longer term
+  (the old ``str.contains`` behaviour, within a word) and, when nothing
+  contains it, tokens within a small edit distance of it (typos).
+
+Lookups work on the token vocabulary, which is far smaller than the book,
+and then mark the matching ids in a boolean array, so their cost grows with
+the number of hits rather than the number of accounts.
+
+Queries are whitespace-separated terms that must all match; ``field:term``
+restricts a term to one field (``name:``, ``inst:``, ``number:``,
+``notes:``, see ``FIELD_ALIASES``). Like ``PortfolioTotals`` the index is
+built once and then kept current with ``add``/``remove``/``replace`` as
+rows are inserted, deleted and edited.
+"""
+
+import bisect
+import re
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+# query prefix -> column
+SEARCH_FIELDS = {'name': 'Account Name', 'institution': 'Institution', 'number': 'Account Number', 'notes': 'Notes'}
+SIMPLE_SEARCH_FIELDS = {'name': 'account_name', 'notes': 'notes'}
+FIELD_ALIASES = {'inst': 'institution', 'bank': 'institution', 'acct': 'number', 'account': 'number',
+                 'note': 'notes'}
+
+TOKEN = re.compile(r'\w+')
+# Terms shorter than this match token prefixes; longer ones match anywhere in a token
+GRAM = 3
+
+
+def tokenize(text):
+    return TOKEN.findall(str(text).casefold())
+
+
+def _grams(token):
+    padded = f'  {token}  '
+    return {padded[i:i + GRAM] for i in range(len(padded) - GRAM + 1)}
+
+
+def max_edits(term):
+    """Typos tolerated for a term: none below 4 letters, 1 up to 5, then 2."""
+    return 0 if len(term) < 4 else 1 if len(term) <= 5 else 2
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance (a swap of neighbours is one edit), or ``limit + 1`` once exceeded."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+def parse_query(query, fields):
+    """``[(fields, term), ...]`` for a query string; unknown ``x:`` prefixes are searched as text."""
+    terms = []
+    for chunk in str(query).split():
+        scope = list(fields)
+        prefix, sep, rest = chunk.partition(':')
+        key = FIELD_ALIASES.get(prefix.casefold(), prefix.casefold())
+        if sep and key in fields:
+            scope, chunk = [key], rest
+        terms += [(scope, token) for token in tokenize(chunk)]
+    return terms
+
+
+class SearchIndex:
+    """Token and trigram index over the text columns of an account frame.
+
+    Ids are the frame's index (``AccountTable`` ids), which must be
+    non-negative integers.
+    """
+
+    def __init__(self, fields=None):
+        self.fields = dict(fields or SEARCH_FIELDS)
+        self._rows = {field: {} for field in self.fields}      # value -> ids
+        self._postings = {field: {} for field in self.fields}  # token -> values
+        self._grams = {}                                       # trigram -> tokens
+        self._sorted = []
+        self._size = 0
+        self.count = 0
+
+    @classmethod
+    def from_frame(cls, df, fields=None):
+        index = cls(fields)
+        index.add(df)
+        return index
+
+    def __len__(self):
+        return self.count
+
+    def _groups(self, df, column):
+        """(value, ids) for each distinct non-empty value of ``column``, case-folded."""
+        codes, uniques = pd.factorize(df[column], use_na_sentinel=True)
+        keep = codes >= 0
+        codes, ids = codes[keep], df.index.to_numpy(dtype='int64')[keep]
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        groups = {}
+        for i, value in enumerate(uniques):
+            key = str(value).casefold().strip()
+            if key:
+                part = ids[order[bounds[i]:bounds[i + 1]]]
+                groups[key] = np.concatenate([groups[key], part]) if key in groups else part
+        return groups
+
+    def _index_value(self, field, value):
+        for token in set(tokenize(value)):
+            values = self._postings[field].get(token)
+            if values is None:
+                values = self._postings[field][token] = set()
+                if not any(token in self._postings[f] for f in self.fields if f != field):
+                    bisect.insort(self._sorted, token)
+                    for gram in _grams(token):
+                        self._grams.setdefault(gram, set()).add(token)
+            values.add(value)
+
+    def _unindex_value(self, field, value):
+        for token in set(tokenize(value)):
+            values = self._postings[field][token]
+            values.discard(value)
+            if not values:
+                del self._postings[field][token]
+                if not any(token in self._postings[f] for f in self.fields):
+                    del self._sorted[bisect.bisect_left(self._sorted, token)]
+                    for gram in _grams(token):
+                        self._grams[gram].discard(token)
+
+    def add(self, rows):
+        """Index new rows (a DataFrame or a single row Series named by its id)."""
+        rows = _as_frame(rows)
+        if not len(rows):
+            return
+        for field, column in self.fields.items():
+            if column not in rows.columns:
+                continue
+            for value, ids in self._groups(rows, column).items():
+                held = self._rows[field].get(value)
+                if held is None:
+                    self._index_value(field, value)
+                    self._rows[field][value] = ids
+                else:
+                    self._rows[field][value] = np.concatenate([held, ids])
+        self._size = max(self._size, int(rows.index.max()) + 1)
+        self.count += len(rows)
+
+    def remove(self, rows):
+        """Drop rows that are being deleted (as they were when indexed)."""
+        rows = _as_frame(rows)
+        for field, column in self.fields.items():
+            if column not in rows.columns:
+                continue
+            for value, ids in self._groups(rows, column).items():
+                held = self._rows[field].get(value)
+                if held is None:
+                    continue
+                held = held[~np.isin(held, ids)]
+                if len(held):
+                    self._rows[field][value] = held
+                else:
+                    del self._rows[field][value]
+                    self._unindex_value(field, value)
+        self.count -= len(rows)
+
+    def replace(self, old_row, new_row):
+        """Re-index one row after an edit; a no-op unless a searched field changed."""
+        if all(old_row.get(column) == new_row.get(column) for column in self.fields.values()):
+            return
+        self.remove(old_row)
+        self.add(new_row)
+
+    def tokens(self, term, fuzzy=True):
+        """Indexed tokens a query term matches.
+
+        Short terms match as prefixes; longer ones anywhere in a token. If a
+        term matches nothing and ``fuzzy`` is set, tokens within
+        ``max_edits(term)`` edits of it are returned instead.
+        """
+        if len(term) < GRAM:
+            start = bisect.bisect_left(self._sorted, term)
+            stop = bisect.bisect_left(self._sorted, term + '\U0010ffff')
+            return self._sorted[start:stop]
+        inner = [term[i:i + GRAM] for i in range(len(term) - GRAM + 1)]
+        candidates = sorted((self._grams.get(gram, set()) for gram in inner), key=len)
+        found = set.intersection(*candidates) if candidates[0] else set()
+        found = [token for token in found if term in token]
+        limit = max_edits(term)
+        if found or not fuzzy or not limit:
+            return found
+        # Each edit changes at most GRAM + 1 padded trigrams, so a close token shares the rest
+        grams = _grams(term)
+        shared = Counter(token for gram in grams for token in self._grams.get(gram, ()))
+        least = max(1, len(grams) - (GRAM + 1) * limit)
+        return [token for token, n in shared.items()
+                if n >= least and edit_distance(term, token, limit) <= limit]
+
+    def _term_mask(self, fields, term, fuzzy):
+        mask = np.zeros(self._size, dtype=bool)
+        for token in self.tokens(term, fuzzy):
+            for field in fields:
+                for value in self._postings[field].get(token, ()):
+                    mask[self._rows[field][value]] = True
+        return mask
+
+    def mask(self, query, fuzzy=True):
+        """Boolean array over ids (``mask[id]``) of the accounts matching every term, or None for an empty query."""
+        result = None
+        for fields, term in parse_query(query, self.fields):
+            term_mask = self._term_mask(fields, term, fuzzy)
+            result = term_mask if result is None else result & term_mask
+            if not result.any():
+                break
+        return result
+
+    def search(self, query, fuzzy=True):
+        """Sorted ids of the accounts matching every term of ``query``."""
+        mask = self.mask(query, fuzzy)
+        return np.flatnonzero(mask) if mask is not None else np.array([], dtype='int64')
+
+    def matches(self, query, index, fuzzy=True):
+        """Boolean array aligned with ``index`` (ids) marking the matching accounts; all True for an empty query."""
+        ids = np.asarray(index, dtype='int64')
+        mask = self.mask(query, fuzzy)
+        if mask is None:
+            return np.ones(len(ids), dtype=bool)
+        inside = ids < len(mask)
+        out = np.zeros(len(ids), dtype=bool)
+        out[inside] = mask[ids[inside]]
+        return out
+
+
+def _as_frame(rows):
+    return rows.to_frame().T if isinstance(rows, pd.Series) else rows
@@ -0,0 +1,591 @@
+"""
+Pluggable persistence for the account frame.
+
+Rows are keyed by the frame's index label. The app loads the store once per
+session and then writes back only the rows it touches (insert, update,
+delete), so a large book is not re-uploaded or rewritten on every change.
+
+A store is shared by every session in the process, so ids for new rows come
+from the store (``next_ids``, allocated under its lock) rather than from
+each session's copy of the frame. The SQLite and Parquet stores also save a
+high-water mark next to the data (a ``<table>_meta`` table, a ``next_id``
+file) that covers every id ever stored or handed out, so an id freed by a
+delete is not given to a new account after a reload either; history and
+ledger events keyed on the old id stay with the old account. Writes that
+would clobber another session's work raise ``ConflictError``: inserting a
+key that already exists, or updating a row that has since been deleted.
+``update`` takes ``increments`` for columns such as the balance, which are
+added to the stored value instead of overwriting it, so two sessions paying
+the same account both count; it returns the stored results so the caller
+can tell whether another session's change landed too.
+
+The stores also keep the payment ledger's events next to the accounts
+(``append_events`` / ``load_events``), so balance history survives a
+reload: an events table, or ``events-*.parquet`` files whose small appends
+are merged into larger segments. Each event has a ``seq``, its position in
+the store. A snapshot of the balances after the first ``seq`` events
+(``save_snapshot`` / ``load_snapshot``) lets a load read only the events
+after it.
+
+Backends are chosen with a URL, usually from the CREDITTRACKER_STORE
+environment variable:
+
+    (unset) / memory://       per-session demo data, nothing persisted
+    sqlite:///path/to/book.db one table, row-level INSERT/UPDATE/DELETE
+    parquet:///path/to/dir    base.parquet plus small delta files that are
+                              folded into the base on load once they pile up
+"""
+
+import glob
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from credittracker import schema
+
+KEY_COLUMN = 'row_key'
+
+
+class ConflictError(Exception):
+    """A write the store refused because another session changed the same rows."""
+
+
+def _py(value):
+    """Convert a pandas/NumPy scalar to something sqlite3 can bind."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.strftime(schema.DATE_FORMAT)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class _IdCounter:
+    """Hands out increasing ids under a lock, never below ``floor``."""
+
+    def __init__(self):
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def seen(self, last_id):
+        with self._lock:
+            self._next = max(self._next, int(last_id) + 1)
+
+    @property
+    def next(self):
+        return self._next
+
+    def take(self, n, floor=0):
+        with self._lock:
+            start = max(self._next, int(floor))
+            self._next = start + n
+            return pd.RangeIndex(start, start + n)
+
+
+class MemoryStore:
+    """No persistence: every session starts from the demo data."""
+
+    description = 'Session State (In-Memory)'
+    persistent = False
+
+    def __init__(self):
+        self._ids = _IdCounter()
+
+    def load(self):
+        return None
+
+    def next_ids(self, n, floor=0):
+        """Reserve ``n`` new row keys, none below ``floor``."""
+        return self._ids.take(n, floor)
+
+    def replace(self, df):
+        if len(df):
+            self._ids.seen(df.index.max())
+
+    def insert(self, rows):
+        pass
+
+    def update(self, key, row, increments=None):
+        return {col: row[col] for col in increments or {}}
+
+    def delete(self, key):
+        pass
+
+    def load_events(self, after=0, before=None, account_id=None):
+        return None
+
+    def append_events(self, events):
+        pass
+
+    def load_snapshot(self):
+        return None
+
+    def save_snapshot(self, seq, balances):
+        pass
+
+
+class SQLiteStore:
+    """Accounts in a single SQLite table keyed by ``row_key``."""
+
+    persistent = True
+
+    def __init__(self, path, table='accounts'):
+        self.path = path
+        self.table = table
+        self.description = f'SQLite ({os.path.basename(path)})'
+        self._lock = threading.Lock()
+        self._con = None
+        self.meta_table = f'{table}_meta'
+        self.events_table = f'{table}_events'
+        self.snapshot_table = f'{table}_snapshot'
+
+    def _connect(self):
+        # Opened on first use so importing the app never touches the disk
+        if self._con is None:
+            self._con = sqlite3.connect(self.path, check_same_thread=False)
+        return self._con
+
+    def _columns(self):
+        rows = self._connect().execute(f'PRAGMA table_info({_quote(self.table)})').fetchall()
+        return [r[1] for r in rows]
+
+    def load(self):
+        with self._lock:
+            if not self._columns():
+                return None
+            df = pd.read_sql_query(f'SELECT * FROM {_quote(self.table)} ORDER BY {KEY_COLUMN}',
+                                   self._connect(), index_col=KEY_COLUMN)
+        df.index.name = None
+        return schema.compact(schema.parse_dates(df))
+
+    def _max_key(self):
+        if not self._columns():
+            return None
+        return self._connect().execute(f'SELECT MAX({KEY_COLUMN}) FROM {_quote(self.table)}').fetchone()[0]
+
+    def _high_water(self):
+        con = self._connect()
+        con.execute(f'CREATE TABLE IF NOT EXISTS {_quote(self.meta_table)} (key TEXT PRIMARY KEY, value INTEGER)')
+        row = con.execute(f"SELECT value FROM {_quote(self.meta_table)} WHERE key = 'next_id'").fetchone()
+        return row[0] if row else 0
+
+    def _remember(self, last_id):
+        """Raise the saved high-water mark past ``last_id`` (committed with the caller's write)."""
+        self._high_water()
+        self._connect().execute(f"INSERT INTO {_quote(self.meta_table)} (key, value) VALUES ('next_id', ?) "
+                                f"ON CONFLICT(key) DO UPDATE SET value = MAX(value, excluded.value)",
+                                [int(last_id) + 1])
+
+    def next_ids(self, n, floor=0):
+        """Reserve ``n`` new row keys, above every key stored or handed out before."""
+        with self._lock:
+            con = self._connect()
+            self._high_water()
+            con.commit()
+            # IMMEDIATE takes the write lock first, so other processes cannot read the same mark
+            con.execute('BEGIN IMMEDIATE')
+            last = self._max_key()
+            start = max(self._high_water(), int(floor), last + 1 if last is not None else 0)
+            self._remember(start + n - 1)
+            con.commit()
+            return pd.RangeIndex(start, start + n)
+
+    def _replace(self, df):
+        con = self._connect()
+        out = df.copy()
+        out.index.name = KEY_COLUMN
+        out.to_sql(self.table, con, if_exists='replace', index=True, dtype={KEY_COLUMN: 'INTEGER PRIMARY KEY'})
+        if len(df):
+            self._remember(df.index.max())
+        con.commit()
+
+    def replace(self, df):
+        with self._lock:
+            self._replace(df)
+
+    def _ensure_columns(self, columns):
+        existing = set(self._columns())
+        for col in columns:
+            if col not in existing:
+                self._connect().execute(f'ALTER TABLE {_quote(self.table)} ADD COLUMN {_quote(col)}')
+
+    def insert(self, rows):
+        with self._lock:
+            if not self._columns():
+                return self._replace(rows)
+            con = self._connect()
+            self._ensure_columns(rows.columns)
+            cols = [KEY_COLUMN] + list(rows.columns)
+            sql = (f'INSERT INTO {_quote(self.table)} ({", ".join(map(_quote, cols))}) '
+                   f'VALUES ({", ".join("?" * len(cols))})')
+            try:
+                con.executemany(sql, ([_py(key)] + [_py(v) for v in values]
+                                      for key, values in zip(rows.index, rows.itertuples(index=False, name=None))))
+            except sqlite3.IntegrityError as e:
+                con.rollback()
+                raise ConflictError(f"Account id already exists in the store: {e}") from e
+            self._remember(rows.index.max())
+            con.commit()
+
+    def update(self, key, row, increments=None):
+        """Write ``row`` over ``key``, adding ``increments`` (column -> change) to the stored values.
+
+        Returns the stored values of the incremented columns afterwards.
+        """
+        increments = increments or {}
+        values = row.drop(list(increments), errors='ignore')
+        with self._lock:
+            con = self._connect()
+            self._ensure_columns(row.index)
+            assignments = [f'{_quote(col)} = ?' for col in values.index]
+            assignments += [f'{_quote(col)} = COALESCE({_quote(col)}, 0) + ?' for col in increments]
+            cursor = con.execute(f'UPDATE {_quote(self.table)} SET {", ".join(assignments)} WHERE {KEY_COLUMN} = ?',
+                                 [_py(v) for v in values.tolist()] + [_py(v) for v in increments.values()] + [_py(key)])
+            stored = ()
+            if increments and cursor.rowcount:
+                stored = con.execute(f'SELECT {", ".join(map(_quote, increments))} FROM {_quote(self.table)} '
+                                     f'WHERE {KEY_COLUMN} = ?', [_py(key)]).fetchone()
+            con.commit()
+            if cursor.rowcount == 0:
+                raise ConflictError(f"Account {key} is no longer in the store")
+            return dict(zip(increments, stored))
+
+    def delete(self, key):
+        with self._lock:
+            con = self._connect()
+            con.execute(f'DELETE FROM {_quote(self.table)} WHERE {KEY_COLUMN} = ?', [_py(key)])
+            self._remember(key)
+            con.commit()
+
+    def _has_table(self, name):
+        return self._connect().execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                       [name]).fetchone() is not None
+
+    def load_events(self, after=0, before=None, account_id=None):
+        """Events with ``after <= seq < before``, optionally for one account, in order."""
+        # Events are only ever appended, so rowid - 1 is an event's position
+        where, params = ['rowid > ?'], [int(after)]
+        if before is not None:
+            where.append('rowid <= ?')
+            params.append(int(before))
+        if account_id is not None:
+            where.append('account_id = ?')
+            params.append(int(account_id))
+        with self._lock:
+            if not self._has_table(self.events_table):
+                return None
+            events = pd.read_sql(f'SELECT rowid - 1 AS seq, account_id, kind, amount, date '
+                                 f'FROM {_quote(self.events_table)} WHERE {" AND ".join(where)} ORDER BY rowid',
+                                 self._connect(), params=params)
+        events['date'] = pd.to_datetime(events['date']).astype('datetime64[ns]')
+        return events
+
+    def append_events(self, events):
+        with self._lock:
+            con = self._connect()
+            events.drop(columns='seq', errors='ignore').to_sql(self.events_table, con, if_exists='append', index=False)
+            con.execute(f'CREATE INDEX IF NOT EXISTS {_quote(self.events_table + "_account")} '
+                        f'ON {_quote(self.events_table)} (account_id)')
+            con.commit()
+
+    def load_snapshot(self):
+        """``(seq, balances)``: the balances after the first ``seq`` events, or None."""
+        with self._lock:
+            if not self._has_table(self.snapshot_table):
+                return None
+            con = self._connect()
+            row = con.execute(f"SELECT value FROM {_quote(self.meta_table)} WHERE key = 'snapshot_seq'").fetchone()
+            balances = pd.read_sql(f'SELECT account_id, balance FROM {_quote(self.snapshot_table)}', con)
+        return row[0], balances.set_index('account_id')['balance']
+
+    def save_snapshot(self, seq, balances):
+        """Keep ``balances`` as the snapshot after ``seq`` events, unless a later one is saved."""
+        with self._lock:
+            con = self._connect()
+            self._high_water()
+            con.commit()
+            con.execute('BEGIN IMMEDIATE')
+            row = con.execute(f"SELECT value FROM {_quote(self.meta_table)} WHERE key = 'snapshot_seq'").fetchone()
+            if row is not None and row[0] >= seq:
+                con.rollback()
+                return
+            con.execute(f'CREATE TABLE IF NOT EXISTS {_quote(self.snapshot_table)} '
+                        f'(account_id INTEGER PRIMARY KEY, balance REAL)')
+            con.execute(f'DELETE FROM {_quote(self.snapshot_table)}')
+            con.executemany(f'INSERT INTO {_quote(self.snapshot_table)} VALUES (?, ?)',
+                            zip(balances.index.tolist(), balances.tolist()))
+            con.execute(f"INSERT OR REPLACE INTO {_quote(self.meta_table)} (key, value) VALUES ('snapshot_seq', ?)",
+                        [int(seq)])
+            con.commit()
+
+
+class ParquetStore:
+    """Accounts in ``base.parquet`` plus append-only ``delta-*.parquet`` files.
+
+    Each write lands as a tiny delta (the changed rows and an ``_op`` column)
+    rather than rewriting the base file. Loading replays the deltas, and once
+    there are more than ``compact_after`` of them the result becomes the new
+    base.
+    """
+
+    OP_COLUMN = '_op'
+    persistent = True
+
+    def __init__(self, path, compact_after=50):
+        self.path = path
+        self.compact_after = compact_after
+        self.description = f'Parquet ({os.path.basename(os.path.normpath(path))})'
+        self._lock = threading.Lock()
+        self._seq = None
+        self._event_seq = None
+        # Keys currently stored, so inserts and updates can be checked without a replay
+        self._keys = None
+        # Stored values of incremented columns (column -> {key: value}), filled on first use
+        self._tracked = {}
+        self._ids = _IdCounter()
+
+    @property
+    def _base(self):
+        return os.path.join(self.path, 'base.parquet')
+
+    def _deltas(self):
+        return sorted(glob.glob(os.path.join(self.path, 'delta-*.parquet')))
+
+    def _write_delta(self, rows, op):
+        os.makedirs(self.path, exist_ok=True)
+        if self._seq is None:
+            deltas = self._deltas()
+            self._seq = int(os.path.basename(deltas[-1])[6:-8]) if deltas else 0
+        self._seq += 1
+        out = rows.copy()
+        out[self.OP_COLUMN] = op
+        out.index.name = KEY_COLUMN
+        out.to_parquet(os.path.join(self.path, f'delta-{self._seq:08d}.parquet'))
+
+    def _replay(self):
+        base = pd.read_parquet(self._base) if os.path.exists(self._base) else None
+        deltas = self._deltas()
+        if not deltas:
+            return base, deltas
+        frames = [pd.read_parquet(p) for p in deltas]
+        ops = pd.concat([f[self.OP_COLUMN] for f in frames])
+        # Last change per key wins
+        ops = ops[~ops.index.duplicated(keep='last')]
+        upserts = [f.drop(columns=self.OP_COLUMN) for f in frames if (f[self.OP_COLUMN] == 'upsert').any()]
+        upserts = pd.concat(upserts) if upserts else pd.DataFrame()
+        upserts = upserts[~upserts.index.duplicated(keep='last')]
+        upserts = upserts[upserts.index.isin(ops.index[ops == 'upsert'])]
+        parts = [upserts] if base is None else [base.drop(index=ops.index, errors='ignore'), upserts]
+        return pd.concat(parts).sort_index(), deltas
+
+    @property
+    def _high_water_path(self):
+        return os.path.join(self.path, 'next_id')
+
+    def _set_keys(self, keys):
+        self._keys = keys
+        if keys:
+            self._ids.seen(max(keys))
+        if os.path.exists(self._high_water_path):
+            with open(self._high_water_path) as f:
+                self._ids.seen(int(f.read().strip() or 0) - 1)
+
+    def _known_keys(self):
+        if self._keys is None:
+            df, _ = self._replay()
+            self._set_keys(set() if df is None else set(df.index.tolist()))
+        return self._keys
+
+    def _remember(self, last_id=None):
+        """Save the id counter (raised past ``last_id``) as the high-water mark."""
+        self._known_keys()
+        if last_id is not None:
+            self._ids.seen(last_id)
+        os.makedirs(self.path, exist_ok=True)
+        tmp = self._high_water_path + '.tmp'
+        with open(tmp, 'w') as f:
+            f.write(str(self._ids.next))
+        os.replace(tmp, self._high_water_path)
+
+    def next_ids(self, n, floor=0):
+        """Reserve ``n`` new row keys, above every key stored or handed out before."""
+        with self._lock:
+            self._known_keys()
+            ids = self._ids.take(n, floor)
+            self._remember()
+            return ids
+
+    def load(self):
+        with self._lock:
+            df, deltas = self._replay()
+            self._set_keys(set() if df is None else set(df.index.tolist()))
+            self._tracked = {}
+            if df is None:
+                return None
+            if len(deltas) > self.compact_after:
+                self._write_base(df, deltas)
+        df.index.name = None
+        return schema.compact(schema.parse_dates(df))
+
+    def _write_base(self, df, deltas=()):
+        os.makedirs(self.path, exist_ok=True)
+        out = df.copy()
+        out.index.name = KEY_COLUMN
+        tmp = self._base + '.tmp'
+        out.to_parquet(tmp)
+        os.replace(tmp, self._base)
+        for p in deltas:
+            os.remove(p)
+
+    def replace(self, df):
+        with self._lock:
+            self._write_base(df, self._deltas())
+            self._set_keys(set(df.index.tolist()))
+            self._tracked = {}
+            self._remember()
+
+    def insert(self, rows):
+        with self._lock:
+            keys = self._known_keys()
+            taken = keys.intersection(rows.index.tolist())
+            if taken:
+                raise ConflictError(f"Account ids already exist in the store: {sorted(taken)[:10]}")
+            self._write_delta(rows, 'upsert')
+            keys.update(rows.index.tolist())
+            for col, values in self._tracked.items():
+                if col in rows.columns:
+                    values.update(rows[col].items())
+            self._remember(rows.index.max())
+
+    def _tracked_column(self, col):
+        if col not in self._tracked:
+            df, _ = self._replay()
+            self._tracked[col] = {} if df is None or col not in df.columns else df[col].to_dict()
+        return self._tracked[col]
+
+    def update(self, key, row, increments=None):
+        """Write ``row`` over ``key``, adding ``increments`` (column -> change) to the stored values.
+
+        Each write is a whole-row delta, so the incremented values are worked
+        out here from the stored ones (kept per column after one replay).
+        Returns the stored values of the incremented columns afterwards.
+        """
+        increments = increments or {}
+        with self._lock:
+            if key not in self._known_keys():
+                raise ConflictError(f"Account {key} is no longer in the store")
+            row = row.copy()
+            for col, change in increments.items():
+                stored = self._tracked_column(col).get(key)
+                row[col] = (0.0 if stored is None or pd.isna(stored) else stored) + change
+            for col, values in self._tracked.items():
+                if col in row.index:
+                    values[key] = row[col]
+            self._write_delta(row.to_frame(key).T.infer_objects(), 'upsert')
+            return {col: row[col] for col in increments}
+
+    def delete(self, key):
+        with self._lock:
+            self._write_delta(pd.DataFrame(index=[key]), 'delete')
+            self._known_keys().discard(key)
+            for values in self._tracked.values():
+                values.pop(key, None)
+            self._remember(key)
+
+    def _event_files(self):
+        # events-<n>.parquet appends and events-<n>-seg.parquet merged runs, in event order
+        return sorted(glob.glob(os.path.join(self.path, 'events-*.parquet')))
+
+    def _event_count(self, files):
+        if not files:
+            return 0
+        return int(pd.read_parquet(files[-1], columns=['seq'])['seq'].max()) + 1
+
+    def load_events(self, after=0, before=None, account_id=None):
+        """Events with ``after <= seq < before``, optionally for one account, in order."""
+        filters = [('seq', '>=', int(after))]
+        if before is not None:
+            filters.append(('seq', '<', int(before)))
+        if account_id is not None:
+            filters.append(('account_id', '==', int(account_id)))
+        with self._lock:
+            files = self._event_files()
+            if not files:
+                return None
+            small = [p for p in files if not p.endswith('-seg.parquet')]
+            if len(small) > self.compact_after:
+                # Merge the appends since the last segment into one, named so it sorts in their place
+                tmp = small[0][:-8] + '-seg.parquet.tmp'
+                pd.concat([pd.read_parquet(p) for p in small], ignore_index=True).to_parquet(tmp, index=False)
+                os.replace(tmp, tmp[:-4])
+                for p in small:
+                    os.remove(p)
+                files = self._event_files()
+            parts = [pd.read_parquet(p, filters=filters) for p in files]
+        return pd.concat(parts, ignore_index=True)
+
+    def append_events(self, events):
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            files = self._event_files()
+            if self._event_seq is None:
+                self._event_seq = int(os.path.basename(files[-1])[7:15]) if files else 0
+            self._event_seq += 1
+            start = self._event_count(files)
+            out = events.drop(columns='seq', errors='ignore')
+            out.insert(0, 'seq', np.arange(start, start + len(out), dtype='int64'))
+            out.to_parquet(os.path.join(self.path, f'events-{self._event_seq:08d}.parquet'), index=False)
+
+    def _snapshot_files(self):
+        return sorted(glob.glob(os.path.join(self.path, 'snapshot-*.parquet')))
+
+    def load_snapshot(self):
+        """``(seq, balances)``: the balances after the first ``seq`` events, or None."""
+        with self._lock:
+            files = self._snapshot_files()
+            if not files:
+                return None
+            balances = pd.read_parquet(files[-1])
+        return int(os.path.basename(files[-1])[9:-8]), balances.set_index('account_id')['balance']
+
+    def save_snapshot(self, seq, balances):
+        """Keep ``balances`` as the snapshot after ``seq`` events, unless a later one is saved."""
+        with self._lock:
+            older = self._snapshot_files()
+            if older and int(os.path.basename(older[-1])[9:-8]) >= seq:
+                return
+            os.makedirs(self.path, exist_ok=True)
+            path = os.path.join(self.path, f'snapshot-{int(seq):012d}.parquet')
+            out = pd.DataFrame({'account_id': balances.index.to_numpy(dtype='int64'),
+                                'balance': balances.to_numpy(dtype='float64')})
+            out.to_parquet(path + '.tmp', index=False)
+            os.replace(path + '.tmp', path)
+            for p in older:
+                os.remove(p)
+
+    def compact(self):
+        """Fold all pending deltas into the base file."""
+        with self._lock:
+            df, deltas = self._replay()
+            if df is not None:
+                self._write_base(df, deltas)
+
+
+def open_store(url=None):
+    """Build a store from a ``scheme://path`` URL (see module docstring)."""
+    if not url or url.startswith('memory://'):
+        return MemoryStore()
+    scheme, _, path = url.partition('://')
+    if scheme == 'sqlite':
+        return SQLiteStore(path)
+    if scheme == 'parquet':
+        return ParquetStore(path)
+    raise ValueError(f"Unsupported account store URL: {url!r}")
@@ -0,0 +1,187 @@
+"""
+Synthetic account books for benchmarks and load testing.
+
+``generate_portfolio(n, seed)`` builds an App.py-layout frame of any size
+with plausible distributions: a card-heavy mix of account types, a few
+large issuers holding most accounts, log-normal limits per product,
+card utilization skewed low with a long tail, APRs by product, and due,
+statement and reporting dates spread over the month around ``today``. The
+frame is typed like the app's (parsed dates, ``schema.compact`` columns,
+derived utilization and points value), so it can be fed straight to any
+module. The same seed and ``today`` always give the same book.
+
+    python -m credittracker.synthetic 100k -o book.parquet --seed 0
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from credittracker import derived, schema
+
+SIZES = {'1k': 1_000, '100k': 100_000, '1M': 1_000_000}
+
+# type: (share of accounts, median limit, limit spread, median APR, APR spread, term months)
+ACCOUNT_TYPES = {
+    'Credit Card': (0.66, 6_000, 0.8, 22.0, 4.0, None),
+    'Auto Loan': (0.08, 28_000, 0.4, 7.0, 2.5, 60),
+    'Personal Loan': (0.07, 15_000, 0.5, 12.0, 4.0, 48),
+    'Installment Loan': (0.06, 20_000, 0.6, 9.0, 3.0, 60),
+    'Line of Credit': (0.07, 10_000, 0.6, 13.0, 3.0, None),
+    'Mortgage': (0.06, 350_000, 0.5, 5.5, 1.2, 360),
+}
+
+INSTITUTIONS = [
+    'Chase Bank', 'American Express', 'Capital One', 'Citibank', 'Bank of America', 'Wells Fargo',
+    'Discover', 'U.S. Bank', 'Synchrony', 'Barclays', 'Goldman Sachs', 'PNC Bank', 'TD Bank',
+    'Navy Federal', 'USAA', 'SoFi', 'Ally Bank', 'Truist', 'Citizens Bank', 'Fifth Third Bank',
+    'Regions Bank', 'KeyBank', 'Toyota Financial', 'Honda Financial', 'Quicken Loans', 'LightStream',
+    'Marcus', 'Upstart', 'Huntington Bank', 'Santander',
+]
+
+CARD_PRODUCTS = ['Rewards Card', 'Cash Back', 'Travel Card', 'Platinum', 'Gold Card', 'Preferred',
+                 'Everyday Card', 'Secured Card', 'Student Card', 'Business Card']
+CASHBACK_RATES = ['0%', '1%', '1.5%', '2%', '3% dining', '5% rotating']
+NOTES = ['', '', '', 'Primary card', 'Autopay from checking', 'Promo APR ends soon',
+         'Refinanced', 'Keep open for history', 'Sock drawer card', 'Balance transfer']
+
+
+def _codes(rng, options, n, weights=None):
+    weights = None if weights is None else np.asarray(weights, dtype='float64') / np.sum(weights)
+    return rng.choice(len(options), size=n, p=weights)
+
+
+def _labels(rng, options, n, weights=None):
+    """Random labels as a categorical, so no per-row strings are built."""
+    return pd.Categorical.from_codes(_codes(rng, options, n, weights), categories=options)
+
+
+def generate_portfolio(n, seed=0, today=None):
+    """An App.py-layout account frame of ``n`` rows; deterministic for ``seed`` and ``today``."""
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp(today).normalize() if today is not None else pd.Timestamp.now().normalize()
+    types = list(ACCOUNT_TYPES)
+    params = np.array([ACCOUNT_TYPES[t][:5] for t in types], dtype='float64')
+    kind = rng.choice(len(types), size=n, p=params[:, 0] / params[:, 0].sum())
+    is_card = kind == types.index('Credit Card')
+    revolving = is_card | (kind == types.index('Line of Credit'))
+
+    # A few issuers hold most accounts (Zipf-like weights)
+    institution = _codes(rng, INSTITUTIONS, n, 1 / np.arange(1, len(INSTITUTIONS) + 1) ** 1.1)
+    # Cards get a product name, other accounts their type: "Chase Bank Travel Card", "Ally Bank Auto Loan"
+    products = CARD_PRODUCTS + types
+    product = np.where(is_card, _codes(rng, CARD_PRODUCTS, n), len(CARD_PRODUCTS) + kind)
+    names = np.array([f'{i} {p}' for i in INSTITUTIONS for p in products], dtype=object)
+    name = names[institution * len(products) + product]
+
+    limit = np.round(params[kind, 1] * rng.lognormal(0, params[kind, 2]), -2).clip(300, None)
+    # Revolving utilization is mostly low with a long tail; some cards carry nothing
+    used = np.where(revolving, rng.beta(0.9, 3.0, size=n) * (rng.random(n) > 0.15), rng.uniform(0.05, 1, size=n))
+    balance = np.round(limit * used, 2)
+    apr = np.round(np.clip(rng.normal(params[kind, 3], params[kind, 4]), 1.9, 35.99), 2)
+    term = np.array([ACCOUNT_TYPES[t][5] or 0 for t in types], dtype='float64')[kind]
+    installment = np.divide(limit * (1 + apr / 200), term, out=np.zeros(n), where=term > 0)
+    minimum = np.round(np.where(revolving, np.where(balance > 0, np.maximum(25, balance * 0.02), 0), installment), 2)
+    statement = np.round(np.where(revolving, balance * rng.uniform(0.7, 1.0, size=n), balance), 2)
+
+    day = np.timedelta64(1, 'D')
+    base = today.to_datetime64()
+    due = base + rng.integers(-10, 31, size=n) * day
+    statement_date = due - np.where(revolving, 25, 15) * day
+    reporting = statement_date + rng.integers(0, 4, size=n) * day
+    last_payment = due - 30 * day + rng.integers(-5, 3, size=n) * day
+    age_days = np.clip(rng.exponential(7 * 365, size=n), 30, 30 * 365).astype('int64')
+    open_date = base - age_days * day
+
+    has_points = is_card & (rng.random(n) < 0.6)
+    points = np.where(has_points, np.round(rng.lognormal(np.log(15_000), 1.0, size=n)), 0).astype('int64')
+    point_value = np.where(has_points, rng.choice([0.01, 0.012, 0.015, 0.02], size=n), 0.0)
+    annual_fee = np.where(is_card, rng.choice([0, 0, 0, 0, 95, 95, 250, 395, 550, 695], size=n), 0)
+
+    accounts = pd.DataFrame({
+        'Account Name': name,
+        'Account Type': pd.Categorical.from_codes(kind, categories=types),
+        'Institution': pd.Categorical.from_codes(institution, categories=INSTITUTIONS),
+        'Credit Limit': limit,
+        'Current Balance': balance,
+        'Statement Balance': statement,
+        'Minimum Payment': minimum,
+        'Due Date': due,
+        'Statement Date': statement_date,
+        'Reporting Date': reporting,
+        'Last Payment Date': last_payment,
+        'Last Payment Amount': np.round(np.where(revolving, minimum * rng.uniform(1, 3, size=n), minimum), 2),
+        'APR': apr,
+        'Rewards Points': points,
+        'Points Value': point_value,
+        'Annual Fee': annual_fee,
+        'Status': _labels(rng, ['Active', 'Closed', 'Frozen'], n, [0.92, 0.05, 0.03]),
+        'Open Date': open_date,
+        'Account Number': np.char.add('****', np.char.zfill(rng.integers(0, 10_000, size=n).astype(str), 4)),
+        'Credit Bureau': _labels(rng, ['All 3', 'Experian', 'Equifax', 'TransUnion'], n, [0.8, 0.07, 0.07, 0.06]),
+        'Payment History': rng.choice(np.array([100, 99, 98, 97, 95], dtype='float32'), size=n,
+                                      p=[0.8, 0.08, 0.05, 0.04, 0.03]),
+        'Account Age (Months)': np.round(age_days / derived.DAYS_PER_MONTH),
+        'Autopay Enabled': rng.random(n) < 0.7,
+        'Cashback Rate': pd.Categorical.from_codes(np.where(is_card, _codes(rng, CASHBACK_RATES, n), 0),
+                                                   categories=CASHBACK_RATES),
+        'Notes': np.asarray(NOTES, dtype=object)[_codes(rng, NOTES, n)],
+    })
+    accounts = schema.compact(schema.parse_dates(accounts))
+    accounts['Utilization %'] = derived.utilization(accounts['Current Balance'], accounts['Credit Limit'])
+    accounts['Points Dollar Value'] = derived.points_dollar_value(accounts['Rewards Points'], accounts['Points Value'])
+    return accounts
+
+
+def generate_simple_portfolio(n, seed=0, today=None):
+    """The same book in 5App.py's snake_case layout, with an ``id`` column."""
+    full = generate_portfolio(n, seed, today)
+    simple_type = np.where(full['Account Type'] == 'Credit Card', 'Credit Card', 'Installment')
+    status = full['Status'].astype(str).replace({'Active': 'Open'})
+    return pd.DataFrame({
+        'id': np.arange(1, n + 1),
+        'account_name': full['Account Name'].to_numpy(),
+        'type': simple_type,
+        'balance': full['Current Balance'].to_numpy(),
+        'credit_limit': full['Credit Limit'].to_numpy(),
+        'payment_date': full['Due Date'].to_numpy(),
+        'reporting_date': full['Reporting Date'].to_numpy(),
+        'points': full['Rewards Points'].to_numpy(),
+        'interest_rate': full['APR'].to_numpy(),
+        'status': status.to_numpy(),
+        'notes': full['Notes'].to_numpy(),
+    })
+
+
+def parse_size(size):
+    """'1k', '100k', '1M' or a plain row count."""
+    if size in SIZES:
+        return SIZES[size]
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(size[-1:].lower(), 1)
+    return int(float(size.rstrip('kKmM')) * multiplier)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m credittracker.synthetic',
+                                     description='Write a synthetic account book to CSV or Parquet.')
+    parser.add_argument('size', help="row count, or one of: " + ', '.join(SIZES))
+    parser.add_argument('-o', '--output', required=True, help='output file (.csv or .parquet)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--today', default=None, help='reference date (YYYY-MM-DD) for reproducible dates')
+    parser.add_argument('--layout', choices=['app', 'simple'], default='app', help='App.py or 5App.py columns')
+    args = parser.parse_args(argv)
+
+    generate = generate_portfolio if args.layout == 'app' else generate_simple_portfolio
+    accounts = generate(parse_size(args.size), seed=args.seed, today=args.today)
+    if args.output.endswith('.parquet'):
+        accounts.to_parquet(args.output, index=False)
+    else:
+        schema.for_export(accounts).to_csv(args.output, index=False, date_format=schema.DATE_FORMAT)
+    print(f"{len(accounts):,} accounts -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
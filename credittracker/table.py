@@ -0,0 +1,143 @@
+"""
+Account table keyed by a stable integer id.
+
+The id is the frame's index, so lookups and single-row updates go through
+pandas' hash index instead of a boolean scan, and ids never shift when other
+rows are deleted. New ids come from a counter that only moves forward, so
+within one table a deleted account's id (and any widget state keyed on it)
+is not handed out again. A table rebuilt from the frame alone starts its
+counter above the highest id left, so that guarantee ends at a reload
+unless ids come from the store (below).
+
+Inserted rows go to a pending buffer and are concatenated onto the frame in
+one go, either when the frame (or a row by id) is next read or when the
+buffer grows to the size of the frame (and at least ``compact_every`` rows).
+Because the buffer may grow with the frame, the copying done by sequential
+adds is amortized O(1) per row instead of a full copy of the frame each time.
+That only holds while nothing reads the frame between inserts, as in the
+chunked CSV import. App.py's Add Account form inserts one row and every view
+then reads the whole frame, so each such add still costs one concat of the
+frame, as a plain ``pd.concat`` would.
+
+Sessions that write to the same store pass its ``next_ids`` as
+``allocate_ids``, so two sessions adding accounts at once never pick the
+same id from their own copies of the frame. The SQLite and Parquet stores
+keep a saved high-water mark, so with them a deleted id is never reused,
+even after a reload; history and ledger events keyed on it stay with the
+old account.
+
+A table can wrap a frame that other sessions also hold (``shared=True``, see
+``credittracker.portfolios``). Its first in-place update then copies the
+frame, so edits never leak into the shared copy; inserts and deletes already
+build a new frame.
+
+Categorical columns (see ``schema.compact``) stay categorical: values a
+row brings that are not yet categories are added rather than turning the
+column back into text.
+"""
+
+import pandas as pd
+
+
+class AccountTable:
+    """A DataFrame of accounts indexed by id, with id-based read/write helpers.
+
+    If ``id_column`` is given, that column holds the id and is kept in sync
+    with the index (5App.py shows it in its tables); otherwise the index alone
+    is the id.
+    """
+
+    def __init__(self, frame, id_column=None, compact_every=1024, shared=False, allocate_ids=None):
+        self.id_column = id_column
+        self.compact_every = compact_every
+        self.shared = shared
+        self.allocate_ids = allocate_ids
+        self._pending = []
+        self._pending_rows = 0
+        if id_column is not None:
+            frame = frame.set_index(frame[id_column].astype('int64'), drop=False)
+            frame.index.name = None
+        if not frame.index.is_unique:
+            raise ValueError("Account ids must be unique")
+        self._frame = frame
+        self._next_id = int(frame.index.max()) + 1 if len(frame) else 0
+
+    def _compact(self):
+        if self._pending:
+            parts = ([self._frame] if len(self._frame) else []) + self._pending
+            frame = pd.concat(parts)
+            # New rows with unseen labels would turn a categorical column back into text
+            for col, dtype in parts[0].dtypes.items():
+                if isinstance(dtype, pd.CategoricalDtype) and not isinstance(frame[col].dtype, pd.CategoricalDtype):
+                    frame[col] = frame[col].astype('category')
+            self._frame = frame
+            self.shared = False
+            self._pending = []
+            self._pending_rows = 0
+
+    @property
+    def frame(self):
+        """All accounts, including any still in the append buffer."""
+        self._compact()
+        return self._frame
+
+    def __len__(self):
+        return len(self._frame) + self._pending_rows
+
+    def __contains__(self, account_id):
+        return account_id in self.frame.index
+
+    def get(self, account_id):
+        """The row for ``account_id`` (KeyError if there is none)."""
+        return self.frame.loc[account_id]
+
+    def next_ids(self, n):
+        """Reserve ``n`` new ids, from ``allocate_ids(n, floor=...)`` when the table has one."""
+        if self.allocate_ids is not None:
+            ids = self.allocate_ids(n, floor=self._next_id)
+        else:
+            ids = pd.RangeIndex(self._next_id, self._next_id + n)
+        self._next_id = ids.stop
+        return ids
+
+    def insert(self, rows):
+        """Append ``rows`` under freshly assigned ids and return them."""
+        rows = rows.copy()
+        rows.index = self.next_ids(len(rows))
+        if self.id_column is not None:
+            rows[self.id_column] = rows.index
+        self._pending.append(rows)
+        self._pending_rows += len(rows)
+        if self._pending_rows >= max(self.compact_every, len(self._frame)):
+            self._compact()
+        return rows
+
+    def update(self, account_id, values):
+        """Set ``values`` (column -> value) on one row; return ``(old, new)`` rows."""
+        old = self.frame.loc[account_id].copy()
+        if self.shared:
+            # Copy on first write so readers of the shared frame are unaffected
+            self._frame = self._frame.copy()
+            self.shared = False
+        for col, value in values.items():
+            dtype = self._frame.dtypes.get(col)
+            if isinstance(dtype, pd.CategoricalDtype) and not pd.isna(value) and value not in dtype.categories:
+                self._frame[col] = self._frame[col].cat.add_categories([value])
+            self._frame.at[account_id, col] = value
+        return old, self._frame.loc[account_id]
+
+    def delete(self, account_id):
+        """Remove one row by id and return it.
+
+        Later ids are left untouched, so there is no reindexing; the frame is
+        copied once without the row.
+        """
+        old = self.frame.loc[account_id].copy()
+        self._frame = self._frame.drop(account_id)
+        self.shared = False
+        return old
+
+    def mark_shared(self):
+        """Note that the current frame has been handed to other readers."""
+        self._compact()
+        self.shared = True
@@ -0,0 +1,67 @@
+"""
+Running portfolio totals stay equal to a full recompute.
+
+Applies a random sequence of adds, edits, payments and deletes to a small
+synthetic book and checks ``PortfolioTotals`` against ``from_frame`` on the
+result after every step.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import synthetic
+from credittracker.aggregates import PortfolioTotals
+
+TODAY = '2025-10-15'
+
+
+def new_rows(rng, n, start):
+    rows = synthetic.generate_portfolio(n, seed=int(rng.integers(1 << 31)), today=TODAY)
+    rows.index = pd.RangeIndex(start, start + n)
+    return rows
+
+
+def run_steps(df, steps, rng):
+    totals = PortfolioTotals.from_frame(df)
+    for step in range(steps):
+        op = rng.choice(['add', 'edit', 'pay', 'delete']) if len(df) else 'add'
+        if op == 'add':
+            rows = new_rows(rng, int(rng.integers(1, 5)), int(df.index.max()) + 1 if len(df) else 0)
+            df = pd.concat([df, rows])
+            totals.add(rows)
+        elif op == 'delete':
+            key = rng.choice(df.index)
+            totals.remove(df.loc[key])
+            df = df.drop(key)
+        else:
+            key = rng.choice(df.index)
+            old = df.loc[key].copy()
+            if op == 'pay':
+                df.loc[key, 'Current Balance'] = max(0.0, old['Current Balance'] - rng.random() * 1000)
+            else:
+                new = new_rows(rng, 1, key).iloc[0]
+                for col, value in new.items():
+                    df.at[key, col] = value
+            totals.replace(old, df.loc[key])
+        assert totals.matches(df), f"totals drifted at step {step} ({op})"
+    return df, totals
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_random_writes_match_recompute(seed):
+    rng = np.random.default_rng(seed)
+    df, totals = run_steps(synthetic.generate_portfolio(200, seed=seed, today=TODAY), 150, rng)
+    assert totals.count == len(df)
+
+
+def test_empty_book_then_adds():
+    rng = np.random.default_rng(3)
+    empty = synthetic.generate_portfolio(5, seed=3, today=TODAY).iloc[:0]
+    df, totals = run_steps(empty, 20, rng)
+    assert totals.matches(df)
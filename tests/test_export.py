@@ -0,0 +1,28 @@
+"""
+Export cache: one data version at a time, large files spilled to disk.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import export, synthetic
+
+
+def test_cache_keeps_one_version_and_spills_large_files():
+    accounts = synthetic.generate_portfolio(2_000, seed=0, today='2025-10-15')
+    cache = export.ExportCache(spool_bytes=50_000, chunk_rows=500)
+    data = cache.get('full', 'csv', 1, accounts)
+    assert data == export.to_bytes(accounts, 'csv', 500)
+    assert cache._exports[('full', 'csv')][1]._rolled
+    assert cache.get('full', 'csv', 1, accounts) == data and cache.hits == 1
+
+    cache.get('simple', 'csv', 1, accounts[['Account Name']])
+    assert cache.size('full', 'csv', 1) == len(data)
+    cache.retain(2)
+    assert cache.size('full', 'csv', 1) is None and cache.total_bytes == 0
+
+    cache.get('full', 'csv', 1, accounts)
+    cache.get('full', 'csv.gz', 2, accounts)
+    assert list(cache._exports) == [('full', 'csv.gz')]
@@ -0,0 +1,17 @@
+"""
+Payment timeline never draws one trace per account for large books.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import figures, synthetic
+
+
+def test_per_account_mode_is_capped():
+    accounts = synthetic.generate_portfolio(figures.TIMELINE_PER_ACCOUNT_MAX + 1, seed=0, today='2025-10-15')
+    assert figures.timeline_mode(accounts, 'Per account') in ('Daily', 'Weekly')
+    assert len(figures.payment_timeline(accounts, 'Per account').data) <= figures.TIMELINE_MAX_TRACES
+    assert figures.timeline_mode(accounts.iloc[:10], 'Per account') == 'Per account'
@@ -0,0 +1,34 @@
+"""
+Monthly rollups, updated from each write alone, match totals over the stored rows.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import history, synthetic
+
+TODAY = '2025-10-15'
+
+
+@pytest.mark.parametrize('scheme', ['memory', 'parquet'])
+def test_rollup_matches_rows_after_rewrites(tmp_path, scheme):
+    store = history.open_history(f'{scheme}://{tmp_path}')
+    accounts = synthetic.generate_portfolio(50, seed=0, today=TODAY)
+    store.record_rows(history.simulate_history(accounts, days=40, end=TODAY), 'sample')
+    store.record_snapshot(accounts, TODAY)
+    # Rewriting today's snapshot replaces its rollup row, it does not add to it
+    accounts['Current Balance'] *= 0.5
+    store.record_snapshot(accounts, TODAY)
+
+    start, end = store.span()
+    totals = store.totals(start, end)
+    expected = history.daily_rollup(store.query(start, end))
+    assert totals.index.equals(expected.index)
+    assert np.allclose(totals['balance'].to_numpy(), expected['balance'].to_numpy())
+    assert totals.loc[pd.Timestamp(TODAY), 'balance'] == pytest.approx(accounts['Current Balance'].sum(), rel=1e-5)
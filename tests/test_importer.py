@@ -0,0 +1,51 @@
+"""
+CSV import validation: bad values are rejected with a reason, blanks get defaults.
+"""
+
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import importer
+
+CSV = """Account Name,Account Type,Institution,Credit Limit,Current Balance,Due Date,Open Date
+Good,Credit Card,Bank,1000,10,2025-11-05,2020-01-01
+Bad date,Credit Card,Bank,1000,10,not a date,2020-01-01
+Blank date,Credit Card,Bank,1000,10,,2020-01-01
+Bad both,Credit Card,Bank,1000,abc,2025-11-05,someday
+"""
+
+
+def import_rows(text):
+    chunks = []
+    result = importer.stream_csv(io.StringIO(text), chunks.append)
+    return result, chunks[0]
+
+
+def test_unparseable_dates_are_rejected():
+    result, clean = import_rows(CSV)
+    assert result.accepted == 2 and result.rejected == 2
+    reasons = dict(zip(result.rejected_rows['Account Name'], result.rejected_rows['_reason']))
+    assert reasons['Bad date'] == 'bad date in Due Date'
+    assert reasons['Bad both'] == 'bad number in Current Balance; bad date in Open Date'
+    assert list(clean['Account Name']) == ['Good', 'Blank date']
+
+
+def test_blank_dates_get_the_default():
+    _, clean = import_rows(CSV)
+    assert clean['Due Date'].notna().all()
+    assert str(clean.loc[clean['Account Name'] == 'Good', 'Due Date'].iloc[0].date()) == '2025-11-05'
+
+
+def test_mixed_date_formats_are_accepted():
+    text = CSV.splitlines()[0] + """
+Iso,Credit Card,Bank,1000,10,2025-11-05,2020-01-01
+Us,Credit Card,Bank,1000,10,11/20/2025,01/15/2019
+Words,Credit Card,Bank,1000,10,"Nov 3, 2025",2018-06-30
+"""
+    result, clean = import_rows(text)
+    assert result.rejected == 0
+    assert [str(d.date()) for d in clean['Due Date']] == ['2025-11-05', '2025-11-20', '2025-11-03']
+    assert str(clean.loc[clean['Account Name'] == 'Us', 'Open Date'].iloc[0].date()) == '2019-01-15'
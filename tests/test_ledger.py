@@ -0,0 +1,70 @@
+"""
+Ledger events saved through an account store come back on the next load.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import storage, synthetic
+from credittracker.ledger import Ledger
+
+TODAY = '2025-10-15'
+
+
+@pytest.mark.parametrize('scheme', ['sqlite', 'parquet'])
+def test_events_survive_a_reload(tmp_path, scheme):
+    url = f'{scheme}:///{tmp_path}/book' + ('.db' if scheme == 'sqlite' else '')
+    accounts = synthetic.generate_portfolio(20, seed=0, today=TODAY)
+    store = storage.open_store(url)
+    store.replace(accounts)
+    first = Ledger.load(store)
+    assert first.reconcile(accounts, TODAY).empty and len(first) == len(accounts)
+    first.save()
+    first.record(3, 'payment', -25.0, TODAY)
+    first.record(5, 'charge', 40.0, TODAY)
+    first.save()
+
+    store = storage.open_store(url)
+    second = Ledger.load(store)
+    assert len(second) == len(first)
+    assert second.balances == pytest.approx(first.balances)
+    assert list(second.history(3)['kind']) == ['open', 'payment']
+
+
+@pytest.mark.parametrize('scheme', ['sqlite', 'parquet'])
+def test_load_starts_from_the_latest_snapshot(tmp_path, scheme):
+    url = f'{scheme}:///{tmp_path}/book' + ('.db' if scheme == 'sqlite' else '')
+    accounts = synthetic.generate_portfolio(30, seed=2, today=TODAY)
+    store = storage.open_store(url)
+    store.replace(accounts)
+    ledger = Ledger.load(store, snapshot_every=50)
+    ledger.reconcile(accounts, TODAY)
+    for i in range(40):
+        ledger.record(i % 5, 'charge', 10.0, TODAY)
+    ledger.save()
+
+    # 70 events saved: this load replays them all and saves a snapshot after them
+    full = Ledger.load(store, snapshot_every=50)
+    assert store.load_snapshot()[0] == 70
+    full.record(1, 'payment', -5.0, TODAY)
+    full.save()
+    tail = Ledger.load(store, snapshot_every=50)
+    assert len(tail.events()) == 1 and len(tail) == 71
+    assert tail.balances == pytest.approx(full.balances)
+    assert tail.verify()
+    # Earlier events come from the store
+    assert list(tail.history(1)['kind']) == ['open'] + ['charge'] * 8 + ['payment']
+    assert tail.history(1)['balance'].iloc[-1] == pytest.approx(tail.balance(1))
+
+
+def test_reconcile_reports_drift_without_adjusting():
+    accounts = synthetic.generate_portfolio(5, seed=1, today=TODAY)
+    ledger = Ledger.from_frame(accounts, TODAY)
+    accounts.loc[2, 'Current Balance'] += 100.0
+    drift = ledger.reconcile(accounts, TODAY)
+    assert list(drift.index) == [2] and drift.loc[2, 'difference'] == pytest.approx(100.0)
+    assert len(ledger) == len(accounts) and ledger.verify()
@@ -0,0 +1,37 @@
+"""
+Publishing a portfolio is a compare-and-swap on the session's base version.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import core, portfolios, storage, table
+
+
+def test_stale_publish_is_rejected():
+    cache = portfolios.PortfolioCache(lambda portfolio_id: core.load_demo_data())
+    frame, version = cache.get('client')
+    first = table.AccountTable(frame, shared=True)
+    second = table.AccountTable(frame, shared=True)
+    first.update(0, {'Current Balance': 1.0})
+    second.update(1, {'Current Balance': 2.0})
+
+    assert cache.publish('client', first.frame, version) == version + 1
+    with pytest.raises(storage.ConflictError):
+        cache.publish('client', second.frame, version)
+    shared, current = cache.get('client')
+    assert shared is first.frame and current == version + 1
+
+
+def test_reload_after_eviction_is_a_new_version():
+    cache = portfolios.PortfolioCache(lambda portfolio_id: core.load_demo_data())
+    _, version = cache.get('client')
+    cache.evict('client')
+    _, reloaded = cache.get('client')
+    assert reloaded == version + 1
+    with pytest.raises(storage.ConflictError):
+        cache.publish('client', core.load_demo_data(), version)
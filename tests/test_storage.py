@@ -0,0 +1,46 @@
+"""
+Store writes from concurrent sessions: increments add up, stale writes are refused.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credittracker import storage, synthetic
+
+TODAY = '2025-10-15'
+
+
+@pytest.fixture(params=['sqlite', 'parquet'])
+def store_url(request, tmp_path):
+    return f'{request.param}:///{tmp_path}/book' + ('.db' if request.param == 'sqlite' else '')
+
+
+def test_balance_increments_from_two_sessions_add_up(store_url):
+    store = storage.open_store(store_url)
+    store.replace(synthetic.generate_portfolio(10, seed=0, today=TODAY))
+    first, second = store.load(), store.load()
+    start = first.loc[3, 'Current Balance']
+
+    row = first.loc[3].copy()
+    row['Current Balance'] = start - 100
+    assert store.update(3, row, increments={'Current Balance': -100.0}) == {'Current Balance': start - 100}
+    row = second.loc[3].copy()
+    row['Current Balance'] = start - 50
+    assert store.update(3, row, increments={'Current Balance': -50.0})['Current Balance'] == start - 150
+
+    assert storage.open_store(store_url).load().loc[3, 'Current Balance'] == pytest.approx(start - 150)
+
+
+def test_update_of_a_deleted_row_conflicts(store_url):
+    store = storage.open_store(store_url)
+    store.replace(synthetic.generate_portfolio(10, seed=0, today=TODAY))
+    row = store.load().loc[4]
+    store.delete(4)
+    with pytest.raises(storage.ConflictError):
+        store.update(4, row, increments={'Current Balance': -1.0})
+    with pytest.raises(storage.ConflictError):
+        store.insert(store.load().loc[[5]])